@@ -1,9 +1,27 @@
 # Silencing pygame:
+import importlib
 import os
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
 
-# Exporting envs:
-from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+# Exporting envs. They are imported on first use, so that importing the package
+# only registers the environments and pygame is loaded when an environment is
+# created, which matters for short-lived worker processes:
+_LAZY_EXPORTS = {
+    "FlappyBirdEnv": "flappy_bird_gym.env.flappy_bird_env",
+    "FlappyBirdVectorEnv": "flappy_bird_gym.env.flappy_bird_vector_env",
+    "FlappyBirdAsyncVectorEnv": "flappy_bird_gym.env.process_vector_env",
+    "FlappyBirdThreadVectorEnv": "flappy_bird_gym.env.thread_vector_env",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 # Exporting gym.make:
 from gymnasium import make
@@ -14,11 +32,23 @@ from gymnasium.envs.registration import register
 register(
     id="FlappyBird-features-v1",
     entry_point="flappy_bird_gym.env.flappy_bird_env:FlappyBirdEnv",
+    vector_entry_point="flappy_bird_gym.env.flappy_bird_vector_env:FlappyBirdVectorEnv",
     kwargs={
           "obs_type": "features"
      }
 )
 
+register(
+    id="FlappyBirdVector-features-v1",
+    entry_point="flappy_bird_gym.env.flappy_bird_vector_env:FlappyBirdVectorEnv",
+    order_enforce=False,
+    disable_env_checker=True,
+    kwargs={
+          "obs_type": "features",
+          "num_envs": 1
+     }
+)
+
 register(
     id="FlappyBird-pixels-v1",
     entry_point="flappy_bird_gym.env.flappy_bird_env:FlappyBirdEnv",
@@ -27,8 +57,16 @@ register(
      }
 )
 
+# Pre-warming the sprite cache:
+if os.environ.get('FLAPPY_BIRD_GYM_PRELOAD_ASSETS', "0") == "1":
+    from flappy_bird_gym.utils import preload_images
+    preload_images()
+
 # Main names:
 __all__ = [
     make.__name__,
-    FlappyBirdEnv.__name__
+    "FlappyBirdEnv",
+    "FlappyBirdVectorEnv",
+    "FlappyBirdAsyncVectorEnv",
+    "FlappyBirdThreadVectorEnv"
 ]
\ No newline at end of file
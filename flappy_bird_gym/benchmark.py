@@ -0,0 +1,830 @@
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import gymnasium as gym
+import numpy as np
+import pygame
+
+import flappy_bird_gym
+from flappy_bird_gym import server, utils
+from flappy_bird_gym.env.renderer import GameRenderer
+
+
+ENV_IDS = ("FlappyBird-features-v1", "FlappyBird-pixels-v1")
+
+# The default baseline of the regression suite, see `check`. It is specific to
+# the machine that recorded it, so it is not part of the repo:
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmark_baseline.json")
+
+
+def step_rate(env_id: str, clock: str = "unthrottled", steps: int = 1000, **kwargs) -> float:
+    """ Measures how many steps per second a single environment performs.
+
+    Args:
+        env_id (str): The id of the registered environment.
+        clock (str): The clock policy of the environment.
+        steps (int): The number of steps to time.
+
+    Returns:
+        The number of steps per second.
+    """
+    env = flappy_bird_gym.make(env_id, clock=clock, **kwargs)
+    env.reset(seed=0)
+    env.action_space.seed(0)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, done, truncated, _ = env.step(env.action_space.sample())
+        if done or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return steps / elapsed
+
+
+def benchmark_clock(steps: int = 300) -> Dict[str, Dict[str, float]]:
+    """ Compares the step rate of every clock policy for both observation types. """
+    results = {}
+    for env_id in ENV_IDS:
+        results[env_id] = {clock: step_rate(env_id, clock, steps)
+                           for clock in ("realtime", "unthrottled", "fixed")}
+    return results
+
+
+def observation_cost(env_id: str, calls: int = 20000, warmup_steps: int = 250, **kwargs) -> float:
+    """ Measures the cost of building one observation, in nanoseconds.
+
+    The game is first advanced so that pipes are on the screen, then only the
+    observation of that fixed state is built repeatedly.
+    """
+    env = flappy_bird_gym.make(env_id, **kwargs)
+    env.reset(seed=0)
+    for step in range(warmup_steps):
+        env.step(step % 12 == 0)
+    observation = env.unwrapped._observation
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        observation()
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return elapsed / calls * 1e9
+
+
+def benchmark_observation() -> Dict[str, Dict[str, float]]:
+    """ Measures the cost of the feature observation, with and without copies. """
+    env_id = "FlappyBird-features-v1"
+    return {env_id: {"copy": observation_cost(env_id),
+                     "view": observation_cost(env_id, copy=False)}}
+
+
+def _smoothscale_observation(renderer: GameRenderer) -> np.ndarray:
+    """ The pixel observation pipeline used before the direct 64x64 rasterizer. """
+    renderer.draw_surface()
+    pixelated = pygame.transform.smoothscale(renderer.surface, [64, 64])
+    return np.transpose(np.array(pygame.surfarray.pixels3d(pixelated)), axes=(1, 0, 2))
+
+
+def _pixel_game(steps: int = 100, **kwargs):
+    env = flappy_bird_gym.make("FlappyBird-pixels-v1", copy=False, **kwargs)
+    env.reset(seed=0)
+    for step in range(steps):
+        env.step(step % 4 == 0)
+    return env
+
+
+def pixel_frame_rate(frames: int = 5000, **kwargs) -> float:
+    """ Measures how many pixel observations per second the rasterizer produces. """
+    env = _pixel_game(**kwargs)
+    observation = env.unwrapped._observation
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        observation()
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return frames / elapsed
+
+
+def smoothscale_frame_rate(frames: int = 5000) -> float:
+    """ Measures how many pixel observations per second the smoothscale pipeline produces. """
+    env = _pixel_game()
+    renderer = GameRenderer(env.unwrapped._game)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        _smoothscale_observation(renderer)
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return frames / elapsed
+
+
+def _layers(game, images: Dict, rotations, scale_x: float = 1, scale_y: float = 1) -> List[pygame.sprite.Group]:
+    """ Returns the pipes, grounds and bird of a game, in drawing order, drawn with `images` at scaled positions. """
+    def scaled(image: pygame.Surface, rect: pygame.Rect) -> pygame.sprite.Sprite:
+        sprite = pygame.sprite.Sprite()
+        sprite.image = image
+        sprite.rect = image.get_rect(topleft=(round(rect.x * scale_x), round(rect.y * scale_y)))
+        return sprite
+
+    bird = game.bird.sprite
+    return [pygame.sprite.Group([scaled(images["pipe"][0 if pipe.is_top else 1], pipe.rect)
+                                 for pipe in game.pipe_group]),
+            pygame.sprite.Group([scaled(images["ground"], ground.rect) for ground in game.ground_group]),
+            pygame.sprite.Group(scaled(rotations[(bird.image_index // 10, bird.angle)], bird.rect))]
+
+
+def _layout(layers: List[pygame.sprite.Group], size) -> np.ndarray:
+    """ Returns, for every pixel, the index of the last layer that drew it, or 0 for the background. """
+    labels = pygame.Surface(size)
+    for index, layer in enumerate(layers, start=1):
+        for sprite in layer:
+            silhouette = pygame.mask.from_surface(sprite.image).to_surface(
+                setcolor=(index, index, index), unsetcolor=None)
+            labels.blit(silhouette, sprite.rect)
+    return labels
+
+
+def _full_size_observation(game, surface: pygame.Surface):
+    """ Draws a 64x64 game the way a full-size game is drawn and smoothscales the frame to 64x64.
+
+    Every sprite of the game is swapped for its full-size image, placed at its
+    position scaled to `surface`, and drawn with `Group.draw` over the
+    full-size background, which is the reference the 64x64 rasterizer
+    approximates.
+
+    Returns:
+        The 64x64 RGB frame and the 64x64 layout of the sprites, see `_layout`.
+    """
+    images = utils.load_images(True)
+    layers = _layers(game, images, utils.load_bird_rotations(True),
+                     surface.get_width() / game.screen_width, surface.get_height() / game.screen_height)
+    surface.blit(images["background"], (0, 0))
+    for layer in layers:
+        layer.draw(surface)
+
+    pixelated = pygame.transform.smoothscale(surface, [64, 64])
+    layout = pygame.transform.scale(_layout(layers, surface.get_size()), [64, 64])
+    return (np.transpose(np.array(pygame.surfarray.pixels3d(pixelated)), axes=(1, 0, 2)),
+            pygame.surfarray.pixels_red(layout).T)
+
+
+def pixel_accuracy(steps: int = 1000, tolerance: int = 32) -> Dict[str, float]:
+    """ Compares the 64x64 pixel observations with the smoothscale pipeline and with full-size frames.
+
+    The observations must be identical to those of the smoothscale pipeline
+    they replaced. Full-size frames smoothscaled to 64x64 only match them
+    approximately, since the 64x64 sprites are drawn by hand, with their own
+    colours, so against those the layout, i.e. which sprite covers each
+    pixel, is what the rasterizer must place right.
+
+    Args:
+        steps (int): The number of observations to compare.
+        tolerance (int): The largest difference of a channel, out of 255, for
+            which a pixel still counts as matching.
+
+    Returns:
+        The percentage of observations identical to the smoothscale pipeline,
+        and, against the full-size frames, the percentages of pixels whose
+        colours and whose sprites match and the mean absolute difference of
+        the channels, out of 255.
+    """
+    env = flappy_bird_gym.make("FlappyBird-pixels-v1", backend="sprites")
+    observation, _ = env.reset(seed=0)
+    game = env.unwrapped._game
+    renderer = GameRenderer(game)
+    surface = pygame.Surface(utils.load_images(True)["background"].get_size())
+
+    identical, matching, layout_matching, error = 0, 0, 0, 0.0
+    for step in range(steps):
+        identical += bool(np.array_equal(observation, _smoothscale_observation(renderer)))
+        expected, expected_layout = _full_size_observation(game, surface)
+        layout = pygame.surfarray.pixels_red(
+            _layout(_layers(game, game.images, game.bird.sprite.rotations), (64, 64))).T
+        difference = np.abs(observation.astype(np.int16) - expected)
+        matching += int(np.count_nonzero(difference.max(axis=2) <= tolerance))
+        layout_matching += int(np.count_nonzero(layout == expected_layout))
+        error += float(difference.mean())
+
+        observation, _, done, truncated, _ = env.step(step % 4 == 0)
+        if done or truncated:
+            observation, _ = env.reset()
+            game = env.unwrapped._game
+            renderer = GameRenderer(game)
+
+    env.close()
+    pixels = steps * 64 * 64
+    return {"identical %": identical / steps * 100, "matching %": matching / pixels * 100, "layout %": layout_matching / pixels * 100,
+            "mean error": error / steps}
+
+
+def benchmark_pixels() -> Dict[str, Dict[str, float]]:
+    """ Compares the frame rate of the pixel observation pipelines. """
+    return {"FlappyBird-pixels-v1": {
+        "smoothscale": smoothscale_frame_rate(),
+        "rasterizer": pixel_frame_rate(),
+        "grayscale": pixel_frame_rate(grayscale=True),
+        "channel_first": pixel_frame_rate(channel_first=True),
+    }}
+
+
+def benchmark_backends(steps: int = 2000) -> Dict[str, Dict[str, float]]:
+    """ Compares the step rate of the sprite and headless simulation backends. """
+    results = {}
+    for env_id in ENV_IDS:
+        results[env_id] = {backend: step_rate(env_id, steps=steps, backend=backend)
+                           for backend in ("sprites", "headless")}
+    return results
+
+
+def benchmark_frameskip(steps: int = 1000) -> Dict[str, Dict[str, float]]:
+    """ Measures the decisions per second with several frameskips. """
+    return {env_id: {f"frameskip={frameskip}": step_rate(env_id, steps=steps, frameskip=frameskip)
+                     for frameskip in (1, 4, (2, 6))}
+            for env_id in ENV_IDS}
+
+
+def benchmark_profiling(steps: int = 2000) -> Dict[str, Dict[str, float]]:
+    """ Measures the overhead of the step profiler. """
+    return {env_id: {f"profile={profile}": step_rate(env_id, steps=steps, profile=profile)
+                     for profile in (False, True)}
+            for env_id in ENV_IDS}
+
+
+def frame_stack_rate(native: bool, frame_stack: int = 4, steps: int = 2000) -> float:
+    """ Measures the steps per second of stacked grayscale channel-first pixel observations.
+
+    Args:
+        native (bool): Whether to use the `frame_stack` option of the
+            environment or gymnasium's `FrameStack` wrapper, whose lazy frames
+            are then converted to an array as a CNN pipeline would.
+        frame_stack (int): The number of stacked frames.
+        steps (int): The number of steps to time.
+    """
+    kwargs = {"grayscale": True, "channel_first": True}
+    if native:
+        env = flappy_bird_gym.make("FlappyBird-pixels-v1", frame_stack=frame_stack, **kwargs)
+    else:
+        env = gym.wrappers.FrameStack(flappy_bird_gym.make("FlappyBird-pixels-v1", **kwargs), frame_stack)
+    env.reset(seed=0)
+
+    start = time.perf_counter()
+    for step in range(steps):
+        observation, _, done, truncated, _ = env.step(step % 4 == 0)
+        np.asarray(observation)
+        if done or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return steps / elapsed
+
+
+def benchmark_frame_stack() -> Dict[str, Dict[str, float]]:
+    """ Compares the native frame stack with gymnasium's `FrameStack` wrapper. """
+    return {"FlappyBird-pixels-v1 frame_stack=4": {"FrameStack": frame_stack_rate(False),
+                                                   "native": frame_stack_rate(True)}}
+
+
+def vector_step_rate(num_envs: int, steps: int = 200) -> float:
+    """ Measures how many env-steps per second `FlappyBirdVectorEnv` performs. """
+    env = flappy_bird_gym.FlappyBirdVectorEnv(num_envs, copy=False)
+    env.reset(seed=0)
+    actions = (np.random.default_rng(0).random((steps, num_envs)) < 0.06).astype(np.int64)
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return steps * num_envs / elapsed
+
+
+def benchmark_vector(sizes=(1, 64, 1024, 4096)) -> Dict[str, Dict[str, float]]:
+    """ Measures the env-steps per second of the native vector env for several batch sizes. """
+    return {"FlappyBirdVectorEnv": {f"num_envs={size}": vector_step_rate(size) for size in sizes}}
+
+
+def async_step_rate(env_id: str, num_workers: int, native: bool = True, steps: int = 200) -> float:
+    """ Measures how many env-steps per second a process-pool vector env performs.
+
+    Args:
+        env_id (str): The id of the registered environment.
+        num_workers (int): The number of worker processes, each running one
+            environment.
+        native (bool): Whether to time `FlappyBirdAsyncVectorEnv` or
+            gymnasium's `AsyncVectorEnv`.
+        steps (int): The number of steps to time.
+
+    Returns:
+        The number of env-steps per second.
+    """
+    if native:
+        env = flappy_bird_gym.FlappyBirdAsyncVectorEnv(num_workers, num_workers=num_workers, copy=False,
+                                                       **gym.spec(env_id).kwargs)
+    else:
+        env = gym.vector.AsyncVectorEnv([lambda: flappy_bird_gym.make(env_id)] * num_workers,
+                                        copy=False, context="spawn")
+    env.reset(seed=0)
+    actions = (np.random.default_rng(0).random((steps, num_workers)) < 0.06).astype(np.int64)
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return steps * num_workers / elapsed
+
+
+def benchmark_async(workers=(1, 4, 16, 64)) -> Dict[str, Dict[str, float]]:
+    """ Compares `FlappyBirdAsyncVectorEnv` with gymnasium's `AsyncVectorEnv` for several pool sizes. """
+    results = {}
+    for env_id in ENV_IDS:
+        for native, name in ((False, "AsyncVectorEnv"), (True, "FlappyBirdAsyncVectorEnv")):
+            results[f"{env_id} {name}"] = {f"workers={n}": async_step_rate(env_id, n, native)
+                                           for n in workers}
+    return results
+
+
+def thread_step_rate(env_id: str, num_threads: int, num_envs: int = 32, steps: int = 200) -> float:
+    """ Measures how many env-steps per second `FlappyBirdThreadVectorEnv` performs.
+
+    Args:
+        env_id (str): The id of the registered environment.
+        num_threads (int): The number of threads stepping the environments.
+        num_envs (int): The number of environments, split between the threads.
+        steps (int): The number of steps to time.
+
+    Returns:
+        The number of env-steps per second.
+    """
+    env = flappy_bird_gym.FlappyBirdThreadVectorEnv(num_envs, num_threads=num_threads, copy=False,
+                                                    **gym.spec(env_id).kwargs)
+    env.reset(seed=0)
+    actions = (np.random.default_rng(0).random((steps, num_envs)) < 0.06).astype(np.int64)
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return steps * num_envs / elapsed
+
+
+def gil_enabled() -> bool:
+    """ Returns whether the interpreter runs with the GIL, which free-threaded builds can disable. """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def benchmark_threads(threads=(1, 2, 4, 8, 16, 32)) -> Dict[str, Dict[str, float]]:
+    """ Measures how `FlappyBirdThreadVectorEnv` scales with its number of threads, for 32 environments. """
+    return {env_id: {f"threads={n}": thread_step_rate(env_id, n) for n in threads} for env_id in ENV_IDS}
+
+
+def benchmark_server(actors=(1, 4, 16), envs_per_actor=(1, 16)) -> Dict[str, Dict[str, float]]:
+    """ Load-tests an `EnvServer` with several actor processes and batch sizes.
+
+    Every row holds the aggregate environment steps per second and the
+    percentiles of the round-trip latency of a step request, in microseconds.
+    """
+    results = {}
+    for obs_type in ("features", "pixels"):
+        for batch in envs_per_actor:
+            for n in actors:
+                results[f"{obs_type}, actors={n}, envs/actor={batch}"] = server.load_test(
+                    n, batch, steps=500, obs_type=obs_type)
+    return results
+
+
+def state_latency(backend: str, calls: int = 5000) -> Dict[str, float]:
+    """ Measures the mean latency of `get_state` and `set_state` in microseconds. """
+    env = flappy_bird_gym.make("FlappyBird-features-v1", backend=backend)
+    env.reset(seed=0)
+    for step in range(250):
+        env.step(step % 12 == 0)
+    game = env.unwrapped
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        state = game.get_state()
+    saved = time.perf_counter()
+    for _ in range(calls):
+        game.set_state(state)
+    restored = time.perf_counter()
+
+    env.close()
+    return {"get_state": (saved - start) / calls * 1e6, "set_state": (restored - saved) / calls * 1e6}
+
+
+def benchmark_state() -> Dict[str, Dict[str, float]]:
+    """ Measures the snapshot and restore latency of both simulation backends. """
+    return {backend: state_latency(backend) for backend in ("sprites", "headless")}
+
+
+def collision_cost(checks: int = 2000) -> Dict[str, Dict[str, float]]:
+    """ Measures the cost of building a hitmask and of one bird-pipe check, in microseconds.
+
+    The bird is swept over a pipe so that the checks include misses, hits and
+    overlapping rects with no overlapping pixels.
+    """
+    images = utils.load_images()
+    bird = utils.load_bird_rotations()[(1, 0)]
+    pipe = images["pipe"][1]
+    bird_rect = bird.get_rect()
+    offsets = [pygame.Rect(dx, dy, *pipe.get_size())
+               for dx in range(-pipe.get_width(), bird.get_width(), 4)
+               for dy in range(-bird.get_height(), bird.get_height(), 4)]
+    offsets = (offsets * (checks // len(offsets) + 1))[:checks]
+
+    helpers = {
+        "hitmask lists": (utils.get_hitmask, utils.pixel_collision),
+        "pygame.mask": (utils.get_mask, utils.mask_collision),
+    }
+    results = {}
+    for name, (get_mask, collides) in helpers.items():
+        start = time.perf_counter()
+        bird_mask, pipe_mask = get_mask(bird), get_mask(pipe)
+        built = time.perf_counter()
+        for pipe_rect in offsets:
+            collides(bird_rect, pipe_rect, bird_mask, pipe_mask)
+        checked = time.perf_counter()
+        results[name] = {"masks": (built - start) * 1e6, "check": (checked - built) / checks * 1e6}
+    return results
+
+
+def benchmark_collision(steps: int = 2000) -> Dict[str, Dict[str, float]]:
+    """ Compares the step rate of rect and pixel collisions for both backends. """
+    env_id = "FlappyBird-features-v1"
+    return {f"{env_id} {backend}": {collision: step_rate(env_id, steps=steps, backend=backend, collision=collision)
+                                    for collision in ("rect", "pixel")}
+            for backend in ("sprites", "headless")}
+
+
+def frame_time(incremental: bool, frames: int = 500) -> float:
+    """ Measures the mean time to draw and present a frame of the human display, in milliseconds.
+
+    Without a display server on Linux, e.g. on CI runners, SDL's dummy video
+    driver is used, so the cost of presenting the frame is not included.
+    """
+    env = flappy_bird_gym.make("FlappyBird-features-v1", render_mode="human", clock="unthrottled",
+                               incremental_render=incremental)
+    env.reset(seed=0)
+    env.render()
+    game, render = env.unwrapped._game, env.unwrapped.render
+
+    elapsed = 0.0
+    for frame in range(frames):
+        if not game.update_state(frame % 12 == 0, env.unwrapped.fps):
+            env.reset()
+            game = env.unwrapped._game
+        start = time.perf_counter()
+        render()
+        elapsed += time.perf_counter() - start
+
+    env.close()
+    return elapsed / frames * 1e3
+
+
+def rgb_array_frame_time(frames: int = 500, **kwargs) -> float:
+    """ Measures the mean time of a step and a `render()` in rgb_array mode, in milliseconds. """
+    env = flappy_bird_gym.make("FlappyBird-features-v1", render_mode="rgb_array", **kwargs)
+    env.reset(seed=0)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        _, _, done, truncated, _ = env.step(frame % 12 == 0)
+        if done or truncated:
+            env.reset()
+        env.render()
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return elapsed / frames * 1e3
+
+
+def benchmark_render() -> Dict[str, Dict[str, float]]:
+    """ Compares the frame time of the full and incremental human display and of rgb_array frames. """
+    return {"FlappyBird-features-v1 human": {"full": frame_time(False), "incremental": frame_time(True)},
+            "FlappyBird-features-v1 rgb_array": {"copy": rgb_array_frame_time(),
+                                                 "view": rgb_array_frame_time(copy=False)}}
+
+
+def reset_latency(env_id: str, resets: int = 200, **kwargs) -> float:
+    """ Measures the mean latency of `reset` in microseconds. """
+    env = flappy_bird_gym.make(env_id, **kwargs)
+    env.reset(seed=0)
+
+    start = time.perf_counter()
+    for _ in range(resets):
+        env.reset()
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return elapsed / resets * 1e6
+
+
+def benchmark_reset(resets: int = 200) -> Dict[str, Dict[str, float]]:
+    """ Measures the reset latency of both observation types. """
+    return {env_id: {"reset": reset_latency(env_id, resets)} for env_id in ENV_IDS}
+
+
+_STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import flappy_bird_gym
+imported = time.perf_counter()
+env = flappy_bird_gym.make({env_id!r})
+env.reset(seed=0)
+reset = time.perf_counter()
+print(imported - start, reset - imported)
+"""
+
+
+def startup_latency(env_id: str, runs: int = 5) -> Dict[str, float]:
+    """ Measures, in fresh interpreters, the time to import the package and to create and reset a first environment.
+
+    This is what every short-lived worker process pays before its first step.
+    Each value is the best of `runs` processes, in milliseconds.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    imports, resets = [], []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT.format(env_id=env_id)], env=env,
+                                check=True, capture_output=True, text=True).stdout
+        import_time, reset_time = map(float, output.split()[-2:])
+        imports.append(import_time * 1e3)
+        resets.append(reset_time * 1e3)
+    return {"import": min(imports), "first reset": min(resets)}
+
+
+def benchmark_startup() -> Dict[str, Dict[str, float]]:
+    """ Measures the startup latency of a worker process for both observation types. """
+    return {env_id: startup_latency(env_id) for env_id in ENV_IDS}
+
+
+def _surface_bytes(env: gym.Env) -> int:
+    """ Returns the pixel memory that SDL allocated for the surface of an environment's renderer. """
+    renderer = env.unwrapped._renderer
+    # The renderer of a pixel environment draws into the frame of the
+    # environment, which is a NumPy array:
+    if renderer is None or getattr(env.unwrapped, "_frame", None) is not None:
+        return 0
+    width, height = renderer.surface.get_size()
+    return renderer.surface.get_bytesize() * width * height
+
+
+def memory_per_env(env_id: str, envs: int = 16, render: bool = False, **kwargs) -> float:
+    """ Measures the memory taken by a reset environment, in KiB.
+
+    This is the peak of the Python allocations, NumPy buffers included, while
+    the environments are created and reset, plus the pixels of the surfaces
+    that SDL allocated for them. The shared sprite caches are loaded
+    beforehand, so only the memory owned by each environment is counted.
+
+    Args:
+        env_id (str): The id of the environments.
+        envs (int): The number of environments measured together.
+        render (bool): Whether every environment also renders a frame in
+            `rgb_array` mode, which creates its renderer.
+        kwargs: The kwargs of the environments.
+    """
+    if render:
+        kwargs["render_mode"] = "rgb_array"
+    warmup = flappy_bird_gym.make(env_id, **kwargs)
+    warmup.reset(seed=0)
+    if render:
+        warmup.render()
+
+    tracemalloc.start()
+    created = []
+    for seed in range(envs):
+        env = flappy_bird_gym.make(env_id, **kwargs)
+        env.reset(seed=seed)
+        if render:
+            env.render()
+        created.append(env)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    used = peak + sum(_surface_bytes(env) for env in created)
+
+    for env in created:
+        env.close()
+    warmup.close()
+    return used / envs / 1024
+
+
+def benchmark_memory() -> Dict[str, Dict[str, float]]:
+    """ Measures the memory per environment of both backends, before and after a first render. """
+    results = {}
+    for env_id in ENV_IDS:
+        for backend in ("sprites", "headless"):
+            results[f"{env_id} ({backend})"] = {
+                "reset": memory_per_env(env_id, backend=backend),
+                "rendered": memory_per_env(env_id, render=True, backend=backend),
+            }
+    return results
+
+
+def step_allocations(env_id: str, steps: int = 2000, warmup_steps: int = 500, **kwargs) -> Dict[str, float]:
+    """ Measures the Python allocations of steady-state steps with tracemalloc.
+
+    The bird is steered through the gaps so that pipes keep spawning and
+    leaving the screen. Steps that end an episode are not counted, since they
+    are followed by a reset, and the garbage collector is paused so that it
+    doesn't free the games of earlier episodes during a counted step.
+
+    Returns:
+        The mean and the worst peak of the memory allocated during a step, in
+        bytes.
+    """
+    env = flappy_bird_gym.make(env_id, copy=False, **kwargs)
+    game_env = env.unwrapped
+    env.reset(seed=0)
+
+    def act() -> int:
+        game = game_env._game
+        pipe = game_env._not_passed_top_pipe()
+        return int(pipe is not None and game.bird_rect.top > pipe.bottom + game.constants.PIPE_GAP / 2)
+
+    for _ in range(warmup_steps):
+        _, _, done, truncated, _ = env.step(act())
+        if done or truncated:
+            env.reset()
+
+    total = worst = counted = 0
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    for _ in range(steps):
+        action = act()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        _, _, done, truncated, info = env.step(action)
+        del info
+        peak = tracemalloc.get_traced_memory()[1]
+        if done or truncated:
+            env.reset()
+            continue
+        counted += 1
+        total += peak - before
+        worst = max(worst, peak - before)
+    tracemalloc.stop()
+    gc.enable()
+
+    env.close()
+    return {"mean": total / max(counted, 1), "worst": worst}
+
+
+def benchmark_allocations() -> Dict[str, Dict[str, float]]:
+    """ Measures the allocations of a step for both simulation backends. """
+    return {f"{env_id} ({backend})": step_allocations(env_id, backend=backend)
+            for env_id in ENV_IDS for backend in ("sprites", "headless")}
+
+
+def _best(measure: Callable[[], float], higher_is_better: bool, repeats: int) -> float:
+    """ Returns the best of several runs of a measure, which is the least affected by noise. """
+    values = [measure() for _ in range(repeats)]
+    return max(values) if higher_is_better else min(values)
+
+
+def suite(repeats: int = 5) -> Dict[str, float]:
+    """ Runs the regression suite and returns its metrics.
+
+    Every metric is the best of `repeats` runs on fixed seeds and actions. The
+    names of the metrics end with their unit, and those ending in `_per_s` are
+    rates, where higher is better, while the others are costs.
+    """
+    results = {}
+    for env_id in ENV_IDS:
+        results[f"{env_id}/step_per_s"] = _best(lambda: step_rate(env_id, steps=5000), True, repeats)
+        results[f"{env_id}/reset_us"] = _best(lambda: reset_latency(env_id, resets=500), False, repeats)
+        results[f"{env_id}/observation_us"] = _best(
+            lambda: observation_cost(env_id, calls=5000) / 1e3, False, repeats)
+        results[f"{env_id}/memory_kib"] = memory_per_env(env_id)
+        startup = startup_latency(env_id, runs=repeats)
+        results[f"{env_id}/import_ms"] = startup["import"]
+        results[f"{env_id}/first_reset_ms"] = startup["first reset"]
+        results[f"{env_id}/step_alloc_bytes"] = step_allocations(env_id)["mean"]
+    results["FlappyBird-features-v1/rgb_array_step_render_ms"] = _best(
+        lambda: rgb_array_frame_time(frames=500), False, repeats)
+    for num_envs in (1, 64, 1024):
+        results[f"FlappyBirdVector-features-v1/num_envs={num_envs}/step_per_s"] = _best(
+            lambda: vector_step_rate(num_envs, steps=max(20000 // num_envs, 100)), True, repeats)
+    return results
+
+
+def save_baseline(results: Dict[str, float], path: str = BASELINE_PATH) -> None:
+    """ Stores the metrics of the suite, with a description of the machine they were measured on. """
+    baseline = {
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "processor": platform.processor(), "cpus": os.cpu_count(),
+                    "pygame": pygame.version.ver, "numpy": np.__version__},
+        "metrics": results,
+    }
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2)
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float = 0.3) -> List[str]:
+    """ Returns the metrics that regressed by more than `tolerance` relative to the baseline. """
+    regressions = []
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if name.endswith("_per_s"):
+            regressed = value < reference * (1 - tolerance)
+        else:
+            regressed = value > reference * (1 + tolerance)
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def check(path: str = BASELINE_PATH, tolerance: float = 0.3, save: bool = False) -> bool:
+    """ Runs the regression suite and compares it with the stored baseline.
+
+    Timings only compare across runs of the same machine, so the baseline
+    must first be recorded with `save=True` on the machine that runs the
+    checks.
+
+    Args:
+        path (str): The path of the baseline.
+        tolerance (float): The relative slowdown, or growth of a cost, that is
+            reported as a regression.
+        save (bool): Whether to store the results as the new baseline instead.
+
+    Returns:
+        Whether no metric regressed.
+
+    Raises:
+        FileNotFoundError: If there is no baseline at `path` and `save` is False.
+    """
+    if not save and not os.path.exists(path):
+        raise FileNotFoundError(f"No benchmark baseline at {path}, record one with save=True first")
+    results = suite()
+    if save:
+        save_baseline(results, path)
+        print(f"Stored the baseline in {path}")
+        baseline = results
+    else:
+        with open(path) as file:
+            baseline = json.load(file)["metrics"]
+
+    regressions = compare(results, baseline, tolerance)
+    print(f"{'metric':<58} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, value in results.items():
+        reference = baseline.get(name)
+        change = f"{(value / reference - 1) * 100:+.1f}%" if reference else "new"
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<58} {reference or float('nan'):>12.1f} {value:>12.1f} {change:>8}{flag}")
+    return not regressions
+
+
+def _print_results(title: str, results: Dict[str, Dict[str, float]], unit: str = "steps/s") -> None:
+    print(title)
+    for name, row in results.items():
+        print(f"  {name}")
+        for key, value in row.items():
+            print(f"    {key:<16} {value:>14.1f} {unit}")
+
+
+def run() -> None:
+    """ Runs every benchmark and prints the results. """
+    _print_results("Clock policies", benchmark_clock())
+    _print_results("Observation", benchmark_observation(), unit="ns")
+    _print_results("Pixel observation", benchmark_pixels(), unit="frames/s")
+    _print_results("Pixel accuracy against full-size frames", {"FlappyBird-pixels-v1": pixel_accuracy()}, unit="")
+    _print_results("Simulation backends", benchmark_backends())
+    _print_results("Frameskip", benchmark_frameskip(), unit="decisions/s")
+    _print_results("Frame stack", benchmark_frame_stack())
+    _print_results("Step profiler", benchmark_profiling())
+    _print_results("Step allocations", benchmark_allocations(), unit="bytes")
+    _print_results("Memory per environment", benchmark_memory(), unit="KiB")
+    _print_results("Vector environment", benchmark_vector())
+    _print_results("Process-pool vector environment", benchmark_async())
+    _print_results(f"Thread-pool vector environment ({os.cpu_count()} CPUs, GIL {'on' if gil_enabled() else 'off'})",
+                   benchmark_threads())
+    _print_results("Environment server", benchmark_server(), unit="")
+    _print_results("Reset latency", benchmark_reset(), unit="us")
+    _print_results("Worker startup", benchmark_startup(), unit="ms")
+    _print_results("State snapshots", benchmark_state(), unit="us")
+    _print_results("Pixel collision helpers", collision_cost(), unit="us")
+    _print_results("Collision modes", benchmark_collision())
+    _print_results("Human display", benchmark_render(), unit="ms")
@@ -54,6 +54,17 @@ PIXELATED_GROUND_OFFSET = 0.7223
 PIXELATED_PIPE_GAP = int(64 * (PIPE_GAP / BACKGROUND_WIDTH)) + 5
 ################################################################################
 
+##################### Pixelated Sprite Dimensions (64x64 assets) ###############
+PIXELATED_BIRD_SPRITE_WIDTH = 6
+PIXELATED_BIRD_SPRITE_HEIGHT = 6
+
+PIXELATED_PIPE_SPRITE_WIDTH = 7
+PIXELATED_PIPE_SPRITE_HEIGHT = 64
+
+PIXELATED_BASE_SPRITE_WIDTH = 64
+PIXELATED_BASE_SPRITE_HEIGHT = 16
+################################################################################
+
 
 ################################ OLD VARIABLES  ################################
 
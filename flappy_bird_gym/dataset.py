@@ -0,0 +1,204 @@
+""" Offline datasets of Flappy Bird transitions.
+
+A dataset is a directory of fixed-size shards and a `manifest.json`. Every
+shard holds `steps` rows of a batch of `num_envs` environments, stepped
+together by :class:`FlappyBirdAsyncVectorEnv`, as four `.npy` files:
+
+* `observations_XXXXX.npy`, (steps, num_envs, *observation shape),
+* `actions_XXXXX.npy`, (steps, num_envs) uint8,
+* `rewards_XXXXX.npy`, (steps, num_envs) float32,
+* `dones_XXXXX.npy`, (steps, num_envs) bool.
+
+Row `t` of an environment holds the observation it acted on, its action, the
+reward of that action and whether the episode ended with it. The row after a
+finished episode starts the next one, so a column of the shards is a stream of
+whole trajectories. Shards are written through memory maps and can be loaded
+with `np.load(..., mmap_mode="r")`.
+"""
+import json
+import os
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+
+MANIFEST = "manifest.json"
+FIELDS = ("observations", "actions", "rewards", "dones")
+
+
+def random_policy(num_envs: int, seed: int = 0) -> Callable[[np.ndarray], np.ndarray]:
+    """ Flaps with probability 1/2. """
+    rng = np.random.default_rng(seed)
+    return lambda observations: rng.integers(2, size=num_envs, dtype=np.uint8)
+
+
+def heuristic_policy(threshold: float = 0.0) -> Callable[[np.ndarray], np.ndarray]:
+    """ Flaps whenever the bird is below the centre of the next gap.
+
+    Only works on feature observations, where the second feature is the
+    vertical distance from the top of the bird to the centre of the gap.
+    """
+    return lambda observations: (observations[:, 1] < threshold).astype(np.uint8)
+
+
+def scripted_policy(num_envs: int, script: str = "100000000000") -> Callable[[np.ndarray], np.ndarray]:
+    """ Repeats a fixed sequence of actions, e.g. "1000" flaps every fourth step.
+
+    Every environment starts the sequence over when its episode ends, see
+    :meth:`episodes_done`.
+    """
+    actions = np.array([int(action) for action in script], dtype=np.uint8)
+    steps = np.zeros(num_envs, dtype=np.int64)
+
+    def policy(observations: np.ndarray) -> np.ndarray:
+        action = actions[steps % len(actions)]
+        steps[:] += 1
+        return action
+
+    def episodes_done(dones: np.ndarray) -> None:
+        steps[dones] = 0
+
+    policy.episodes_done = episodes_done
+    return policy
+
+
+POLICIES = ("random", "heuristic", "scripted")
+
+
+def make_policy(name: str, num_envs: int, seed: int = 0, obs_type: str = "features",
+                script: str = "100000000000") -> Callable[[np.ndarray], np.ndarray]:
+    """ Creates one of the batched policies of `POLICIES`. """
+    if name == "random":
+        return random_policy(num_envs, seed)
+    if name == "heuristic":
+        if obs_type != "features":
+            raise ValueError("The heuristic policy needs feature observations.")
+        return heuristic_policy()
+    if name == "scripted":
+        return scripted_policy(num_envs, script)
+    raise ValueError(f"Unknown policy {name!r}, expected one of {POLICIES}.")
+
+
+def _shard_path(path: str, field: str, index: int) -> str:
+    return os.path.join(path, f"{field}_{index:05d}.npy")
+
+
+def generate(path: str, steps: int, num_envs: int = 8, policy: str = "random",
+             shard_size: int = 4096, seed: int = 0, num_workers: Optional[int] = None,
+             script: str = "100000000000", **env_kwargs) -> dict:
+    """ Runs `num_envs` environments under a policy and writes their transitions to shards.
+
+    The batch of observations is copied into the current shard while the
+    workers simulate the next step, and a full shard is flushed to disk the
+    same way, so the generator keeps at most one shard in memory and the
+    workers never wait for the disk.
+
+    Args:
+        path (str): The directory of the dataset, created if needed.
+        steps (int): The number of batched steps, so the dataset holds
+            `steps * num_envs` transitions.
+        num_envs (int): The number of environments stepped together.
+        policy (str): One of `POLICIES`.
+        shard_size (int): The number of batched steps of a shard.
+        seed (int): The seed of the environments and of the random policy.
+        num_workers (Optional[int]): The number of worker processes.
+        script (str): The actions repeated by the scripted policy.
+        env_kwargs: The JSON-serializable kwargs of the environments.
+
+    Returns:
+        The manifest of the dataset.
+    """
+    if steps < 1 or shard_size < 1:
+        raise ValueError("A dataset needs at least one step and shards of at least one step.")
+    obs_type = env_kwargs.get("obs_type", "features")
+    act = make_policy(policy, num_envs, seed, obs_type, script)
+    os.makedirs(path, exist_ok=True)
+
+    # Reading a dataset never needs the environments, nor pygame:
+    from flappy_bird_gym.env.process_vector_env import FlappyBirdAsyncVectorEnv
+
+    env = FlappyBirdAsyncVectorEnv(num_envs, num_workers=num_workers, copy=False, **env_kwargs)
+    space = env.single_observation_space
+    dtypes = {"observations": space.dtype, "actions": np.dtype(np.uint8),
+              "rewards": np.dtype(np.float32), "dones": np.dtype(bool)}
+    shapes = {"observations": space.shape, "actions": (), "rewards": (), "dones": ()}
+
+    manifest = {
+        "env_kwargs": env_kwargs,
+        "policy": policy,
+        "seed": seed,
+        "num_envs": num_envs,
+        "shard_size": shard_size,
+        "steps": steps,
+        "fields": {field: {"dtype": dtypes[field].str, "shape": list(shapes[field])} for field in FIELDS},
+        "shards": [],
+    }
+
+    def open_shard(index: int) -> Dict[str, np.ndarray]:
+        rows = min(shard_size, steps - index * shard_size)
+        manifest["shards"].append({"index": index, "steps": rows, "episodes": 0})
+        return {field: np.lib.format.open_memmap(_shard_path(path, field, index), mode="w+",
+                                                 dtype=dtypes[field],
+                                                 shape=(rows, num_envs) + shapes[field])
+                for field in FIELDS}
+
+    def close_shard(shard: Dict[str, np.ndarray]) -> None:
+        for array in shard.values():
+            array.flush()
+
+    try:
+        observations, _ = env.reset(seed=seed)
+        shard, row, previous = open_shard(0), 0, None
+        for step in range(steps):
+            actions = np.asarray(act(observations), dtype=np.uint8)
+            env.step_async(actions)
+
+            # While the workers simulate, the observations, which stay valid
+            # in their ring slot, and the actions go to the shard, and the
+            # previous shard, if it just filled up, goes to the disk:
+            shard["observations"][row] = observations
+            shard["actions"][row] = actions
+            if previous is not None:
+                close_shard(previous)
+                previous = None
+
+            observations, rewards, terminateds, truncateds, _ = env.step_wait()
+            dones = terminateds | truncateds
+            shard["rewards"][row] = rewards
+            shard["dones"][row] = dones
+            manifest["shards"][-1]["episodes"] += int(dones.sum())
+            if hasattr(act, "episodes_done"):
+                act.episodes_done(dones)
+
+            row += 1
+            if row == len(shard["actions"]) and step + 1 < steps:
+                previous, shard, row = shard, open_shard(len(manifest["shards"])), 0
+        close_shard(shard)
+    finally:
+        env.close()
+
+    manifest["transitions"] = steps * num_envs
+    manifest["episodes"] = sum(shard["episodes"] for shard in manifest["shards"])
+    with open(os.path.join(path, MANIFEST), "w") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+class Dataset:
+    """ A dataset written by :func:`generate`, with its shards memory-mapped on access. """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as file:
+            self.manifest = json.load(file)
+
+    def __len__(self) -> int:
+        return len(self.manifest["shards"])
+
+    def shard(self, index: int) -> Dict[str, np.ndarray]:
+        """ Returns the memory-mapped arrays of a shard. """
+        return {field: np.load(_shard_path(self.path, field, index), mmap_mode="r") for field in FIELDS}
+
+    def shards(self) -> Iterator[Dict[str, np.ndarray]]:
+        for index in range(len(self)):
+            yield self.shard(index)
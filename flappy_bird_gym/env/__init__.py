@@ -1 +1,20 @@
-from  flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
\ No newline at end of file
+import importlib
+
+# The environments are imported on first use, see `flappy_bird_gym.__init__`:
+_LAZY_EXPORTS = {
+    "FlappyBirdEnv": "flappy_bird_gym.env.flappy_bird_env",
+    "FlappyBirdVectorEnv": "flappy_bird_gym.env.flappy_bird_vector_env",
+    "FlappyBirdAsyncVectorEnv": "flappy_bird_gym.env.process_vector_env",
+    "FlappyBirdThreadVectorEnv": "flappy_bird_gym.env.thread_vector_env",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
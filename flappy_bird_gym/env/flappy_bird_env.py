@@ -1,21 +1,37 @@
-from typing import Dict, Tuple, Union
+import sys
+from time import perf_counter
+from typing import Callable, Dict, Tuple, Union
 
 import gymnasium as gym
 import numpy as np
 import pygame
 
-from flappy_bird_gym.env.game_logic import GameLogic
+from flappy_bird_gym.env.game_logic import GameLogic, GameState
+from flappy_bird_gym.env.headless_logic import HeadlessGameLogic
+from flappy_bird_gym.env.profiler import StepProfiler
 from flappy_bird_gym.env.renderer import GameRenderer
 
 class FlappyBirdEnv(gym.Env):
 
   metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 60, "render_pixelated_fps": 20, "obs_type": ["pixels", "features"]}
 
+  backends = {"sprites": GameLogic, "headless": HeadlessGameLogic}
+
   def __init__(self, render_mode=None, obs_type="features",
-               screen_size: Tuple[int, int] = (551, 720)) -> None:
+               screen_size: Tuple[int, int] = (551, 720),
+               clock: Union[GameLogic.Clock, str, None] = None,
+               backend: str = "sprites", copy: bool = True,
+               grayscale: bool = False, channel_first: bool = False,
+               pipe_schedule: bool = False,
+               collision: Union[GameLogic.Collision, str] = "rect",
+               incremental_render: bool = True,
+               frameskip: Union[int, Tuple[int, int]] = 1,
+               frame_stack: int = 1,
+               profile: Union[bool, Callable[[Dict[str, float]], None]] = False) -> None:
 
     self._game = None
     self._renderer = None
+    self._render_frame = None
     if obs_type == 'pixels':
       self._screen_size = (64, 64)
       self.fps = self.metadata['render_pixelated_fps']
@@ -26,6 +42,64 @@ class FlappyBirdEnv(gym.Env):
     self.obs_type = obs_type
     self.pass_pipe = 0.0
 
+    """
+    The clock policy of the game. Only a human display needs to be throttled to
+    the fps of the game, so every other render mode runs unthrottled by default.
+    """
+    if clock is None:
+      clock = GameLogic.Clock.REALTIME if render_mode == "human" else GameLogic.Clock.UNTHROTTLED
+    self.clock = GameLogic.Clock(clock)
+
+    """
+    Whether the human display only redraws and updates the regions that changed
+    since the previous frame, instead of the whole window.
+    """
+    self.incremental_render = incremental_render
+
+    """
+    The number of game ticks advanced by each call to `step`, repeating the
+    action. A (low, high) tuple draws it uniformly from [low, high) on every
+    step. The observation is only built on the last tick.
+    """
+    if isinstance(frameskip, tuple):
+      if not 1 <= frameskip[0] < frameskip[1]:
+        raise ValueError(f"Invalid frameskip range {frameskip}, expected 1 <= low < high.")
+    elif frameskip < 1:
+      raise ValueError(f"Invalid frameskip {frameskip}, expected at least 1.")
+    self.frameskip = frameskip
+
+    """
+    The step profiler of the environment, or `None` when profiling is off. When
+    on, the seconds spent in each section of a step are returned in
+    `info["profile"]` and, if `profile` is a callable, passed to it. The totals
+    and counters are available through `self.profiler.summary()`.
+    """
+    self.profiler = None
+    if profile:
+      self.profiler = StepProfiler(profile if callable(profile) else None)
+
+    """
+    The simulation backend. "sprites" runs the game on pygame sprites, while
+    "headless" runs the same physics on plain arrays and only touches pygame
+    when a frame is drawn.
+    """
+    if backend not in self.backends:
+      raise ValueError(f"Invalid backend {backend!r}, expected one of {list(self.backends)}.")
+    self.backend = backend
+
+    """
+    Whether every game draws its whole pipe schedule when it is reset, instead
+    of drawing the pipes one by one as they spawn. Both give the same episodes
+    for a given seed.
+    """
+    self.pipe_schedule = pipe_schedule
+
+    """
+    How the game detects collisions: "rect" tests the rects of the sprites and
+    "pixel" the opaque pixels of the drawn images.
+    """
+    self.collision = GameLogic.Collision(collision)
+
     """
     The Space object corresponding to valid actions, all valid actions should be
     contained with the space.
@@ -36,26 +110,138 @@ class FlappyBirdEnv(gym.Env):
     The Space object corresponding to valid observations, all valid observations
     should be contained with the space. It is static across all instances.
     """
+    self.grayscale = grayscale
+    self.channel_first = channel_first
     if obs_type == "pixels":
+      channels = 1 if grayscale else 3
       self.observation_space = gym.spaces.Box(0, 255,
-                                              shape=(64, 64, 3),
+                                              shape=(channels, 64, 64) if channel_first else (64, 64, channels),
                                               dtype=np.uint8)
     else:
       self.observation_space = self._initial_feature_space()
+
+    """
+    Reusable buffer of the feature observation. With `copy=False` the
+    observations returned by `step` and `reset` are views into it, which are
+    only valid until the next call to `step` or `reset`. Likewise, the frames
+    returned by `render` in rgb_array mode are read-only views of a reusable
+    C-contiguous (height, width, 3) buffer, only valid until the next call to
+    `render`.
+    """
+    self.copy = copy
+    if obs_type == "pixels":
+      self._frame = np.zeros((64, 64, 4), dtype=np.uint8)
+      # Views of the frame used by every observation, made once:
+      self._frame_rgb = self._frame[:, :, :3]
+      self._frame_channels = tuple(self._frame[:, :, channel] for channel in range(3))
+      self._pixels = np.zeros(self.observation_space.shape, dtype=np.uint8)
+      self._pixels_hwc = self._pixels.transpose(1, 2, 0) if channel_first else self._pixels
+      if grayscale:
+        self._luma = tuple(np.zeros((2, 64, 64), dtype=np.uint16))
+        # The buffers and weights as ready-made arrays and the low bytes of the
+        # luma as a view, so that the conversion allocates neither views,
+        # scalars nor casting buffers:
+        self._luma_weights = tuple(np.array(weight, dtype=np.uint16) for weight in (77, 150, 29, 8))
+        self._luma_low = self._luma[0].view(np.uint8)[:, (0 if sys.byteorder == "little" else 1)::2]
+        self._pixels_gray = self._pixels_hwc[:, :, 0]
+      elif not channel_first:
+        # Blitting the RGBX frame onto an RGB surface over the observation buffer
+        # packs the pixels much faster than a strided NumPy copy:
+        self._pixels_surface = pygame.image.frombuffer(self._pixels, (64, 64), "RGB")
+    else:
+      self._features = np.ones(self.observation_space.shape, dtype=np.float32)
+      self._features_view = memoryview(self._features)
+      self._feature_values = [1.0] * self._features.shape[0]
+      self._feature_bounds = tuple(zip(range(self._features.shape[0]),
+                                       self.observation_space.low.tolist(),
+                                       self.observation_space.high.tolist()))
+
+    """
+    The number of consecutive observations stacked in each observation. Frames
+    are stacked on a new leading axis, (k, 64, 64, channels) for pixels and
+    (k, features) for features, except with `channel_first` where their
+    channels are concatenated into (k * channels, 64, 64). The frames are kept
+    in a preallocated ring and the stacked observation is a view of it.
+    """
+    if frame_stack < 1:
+      raise ValueError(f"Invalid frame_stack {frame_stack}, expected at least 1.")
+    self.frame_stack = frame_stack
+    if frame_stack > 1:
+      frame_space = self.observation_space
+      stacked_shape = (frame_stack,) + frame_space.shape
+      if obs_type == "pixels" and channel_first:
+        stacked_shape = (frame_stack * frame_space.shape[0],) + frame_space.shape[1:]
+      self.observation_space = gym.spaces.Box(
+        np.broadcast_to(frame_space.low, (frame_stack,) + frame_space.shape).reshape(stacked_shape),
+        np.broadcast_to(frame_space.high, (frame_stack,) + frame_space.shape).reshape(stacked_shape),
+        dtype=frame_space.dtype)
+
+      self._stack = np.zeros((2 * frame_stack,) + frame_space.shape, dtype=frame_space.dtype)
+      self._stack_views = [self._stack[index + 1:index + 1 + frame_stack].reshape(stacked_shape)
+                           for index in range(frame_stack)]
+      self._stack_index = None
   
   def _observation(self):
 
     if self.obs_type == "pixels":
-      if not self._renderer.is_drawn:
-        self._renderer.draw_surface()
+      self._get_renderer().draw_surface()
+      observation = self._pixel_space()
+    else:
+      observation = self._feature_space()
 
-      #Pixelate the surface
-      pixelated = pygame.transform.smoothscale(self._renderer.surface, [64, 64])
+    if self.frame_stack > 1:
+      observation = self._push_frame(observation)
 
-      pixels = pygame.surfarray.pixels3d(pixelated)
-      return np.transpose(np.array(pixels), axes=(1, 0, 2))
+    return observation.copy() if self.copy else observation
+
+  def _push_frame(self, frame: np.ndarray) -> np.ndarray:
+    """ Pushes a frame onto the stack and returns the view of the last `frame_stack` frames.
+
+    Every frame is written to two slots of the ring, `k` apart, so that the
+    last `k` frames are always contiguous, oldest first, and the stacked
+    observation is a view of the ring rather than a concatenation.
+    """
+    k = self.frame_stack
+    if self._stack_index is None:
+      self._stack[:] = frame
+      index = k - 1
     else:
-      return self._feature_space()
+      index = self._stack_index + 1
+      if index == k:
+        index = 0
+      self._stack[index] = frame
+      self._stack[index + k] = frame
+    self._stack_index = index
+    return self._stack_views[index]
+
+  def _pixel_space(self):
+    """ Converts the drawn RGBX frame into the pixel observation buffer.
+
+    The game is already drawn at 64x64, so the frame only has to be stripped
+    of its padding byte and, optionally, converted to grayscale or to a
+    channel-first layout.
+    """
+    if self.grayscale:
+      red, green, blue = self._frame_channels
+      # ITU-R BT.601 luma with weights in 1/256 units:
+      luma, weighted = self._luma
+      red_weight, green_weight, blue_weight, shift = self._luma_weights
+      np.copyto(luma, red)
+      np.multiply(luma, red_weight, out=luma)
+      np.copyto(weighted, green)
+      np.multiply(weighted, green_weight, out=weighted)
+      np.add(luma, weighted, out=luma)
+      np.copyto(weighted, blue)
+      np.multiply(weighted, blue_weight, out=weighted)
+      np.add(luma, weighted, out=luma)
+      np.right_shift(luma, shift, out=luma)
+      np.copyto(self._pixels_gray, self._luma_low)
+    elif self.channel_first:
+      np.copyto(self._pixels_hwc, self._frame_rgb)
+    else:
+      self._pixels_surface.blit(self._renderer.surface, (0, 0))
+
+    return self._pixels
     
   def _initial_feature_space(self):
     low = [
@@ -77,107 +263,77 @@ class FlappyBirdEnv(gym.Env):
     high = [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
 
     return gym.spaces.Box(
-              low=np.array(low),
-              high=np.array(high),
-              dtype=np.float_
+              low=np.array(low, dtype=np.float32),
+              high=np.array(high, dtype=np.float32),
+              dtype=np.float32
           )
 
   def _feature_space(self):
+    """ Writes the features of the current game state into the observation buffer.
 
-    h_dist = 1.0
-    v_dist = 1.0
-    bird_top = 1.0 
-    bird_bottom = 1.0 
-    visable_top_pipe_bottom_left = 1.0
-    visable_top_pipe_bottom_right = 1.0
-    visable_bottom_pipe_top_left = 1.0
-    visable_bottom_pipe_top_right = 1.0
-    
-    visable_next_top_pipe_bottom_left = 1.0
-    visable_next_top_pipe_bottom_right = 1.0
-    visable_next_bottom_pipe_top_left = 1.0
-    visable_next_bottom_pipe_top_right = 1.0
-
-    bird_x = self._game.bird.sprite.rect.left
-    bird_y = self._game.bird.sprite.rect.top
-
-    pipe_gap = 0
-
-    velocity = self._game.bird.sprite.vel / self._game.constants.BIRD_MAX_VEL_Y
+    The pipes are looked up through the front pipe pointer of the game, so no
+    pipe is scanned, and the features are clipped while being written to the
+    preallocated float32 buffer, so no intermediate array is built.
+    """
+    game = self._game
+    values = self._feature_values
+    width, height = self._screen_size
+    pipe_width = game.constants.PIPE_SPRITE_SIZE[0]
+    pipe_gap = game.constants.PIPE_GAP
+    bird_rect = game.bird_rect
+
+    for i in range(10):
+      values[i] = 1.0
+    values[10] = game.bird_vel / game.constants.BIRD_MAX_VEL_Y
+    values[11] = values[12] = 1.0
 
     visable_top_pipe = self._not_passed_top_pipe()
 
     if visable_top_pipe is not None:
+      left = visable_top_pipe.left
+      right = left + pipe_width
+      bottom = visable_top_pipe.bottom
+
+      values[0] = (right - bird_rect.left) / width                           # Horizontal Distance
+      values[1] = ((bottom + bottom + pipe_gap) / 2 - bird_rect.top) / height  # Vertical Distance
+      values[2] = left / width
+      values[3] = right / width
+      values[4] = (left + pipe_gap) / width
+      values[5] = (right + pipe_gap) / width
+      values[11] = bird_rect.top / height
+      values[12] = bird_rect.bottom / height
 
-      if self._game is not None:
-        pipe_gap = self._game.constants.PIPE_GAP
-
-      visable_top_pipe_right_x = visable_top_pipe.rect.right
-      visable_bottom_pipe_top_y = visable_top_pipe.rect.bottom + pipe_gap
-
-      h_dist = visable_top_pipe_right_x  - bird_x
-
-      v_dist = (visable_top_pipe.rect.bottom + visable_bottom_pipe_top_y) / 2 - bird_y
-
-      h_dist /= self._screen_size[0]
-      v_dist /= self._screen_size[1]
-
-      bird_top = self._game.bird.sprite.rect.top / self._screen_size[1]
-      bird_bottom = self._game.bird.sprite.rect.bottom / self._screen_size[1]
+    visable_next_top_pipe = self._last_visable_top_pipe()
 
-      visable_top_pipe_bottom_left = visable_top_pipe.rect.bottomleft[0] / self._screen_size[0]
-      visable_top_pipe_bottom_right = visable_top_pipe.rect.bottomright[0] / self._screen_size[0]
-      visable_bottom_pipe_top_left = (visable_top_pipe.rect.bottomleft[0] + pipe_gap) / self._screen_size[0]
-      visable_bottom_pipe_top_right = (visable_top_pipe.rect.bottomright[0] + pipe_gap) / self._screen_size[0]
+    if visable_next_top_pipe is not None and visable_next_top_pipe is not visable_top_pipe:
+      left = visable_next_top_pipe.left
+      right = left + pipe_width
 
-    
-    visable_next_top_pipe = self._last_visable_top_pipe()
-    
-    if visable_next_top_pipe is not None and visable_next_top_pipe != visable_top_pipe:
-
-      if self._game is not None:
-        pipe_gap = self._game.constants.PIPE_GAP
-
-      visable_next_top_pipe_bottom_left = visable_next_top_pipe.rect.bottomleft[0] / self._screen_size[0]
-      visable_next_top_pipe_bottom_right = visable_next_top_pipe.rect.bottomright[0] / self._screen_size[0]
-      visable_next_bottom_pipe_top_left = (visable_next_top_pipe.rect.bottomleft[0] + pipe_gap) / self._screen_size[0]
-      visable_next_bottom_pipe_top_right = (visable_next_top_pipe.rect.bottomright[0] + pipe_gap) / self._screen_size[0]
-
-    features = [
-      h_dist,
-      v_dist,
-      visable_top_pipe_bottom_left,
-      visable_top_pipe_bottom_right,
-      visable_bottom_pipe_top_left,
-      visable_bottom_pipe_top_right,
-      visable_next_top_pipe_bottom_left, 
-      visable_next_top_pipe_bottom_right,
-      visable_next_bottom_pipe_top_left, 
-      visable_next_bottom_pipe_top_right,
-      velocity,
-      bird_top,
-      bird_bottom
-    ]
+      values[6] = left / width
+      values[7] = right / width
+      values[8] = (left + pipe_gap) / width
+      values[9] = (right + pipe_gap) / width
 
-    features = np.clip(features, self.observation_space.low, self.observation_space.high)
+    out = self._features_view
+    for i, low, high in self._feature_bounds:
+      value = values[i]
+      out[i] = low if value < low else high if value > high else value
 
-    return np.array(features, dtype=np.float_)
-  
-  def _pipe_sprites(self):
-    return self._game.pipe_group.sprites()
+    return self._features
   
   def _not_passed_top_pipe(self):
     
-    sprites = self._pipe_sprites()
-    for sprite in sprites:
-      if sprite.pipe_type == 'top' and sprite.rect.right >= self._game.bird.sprite.rect.left:
-        return sprite
+    pipes = self._game.pipes
+    front = self._game.front_pipe
+    if front < len(pipes):
+      return pipes[front]
+    return None
       
   def _last_visable_top_pipe(self):
 
-    sprites = self._pipe_sprites()
-    if len(sprites) >= 4:
-      return sprites[-2] # the second to last pipe is always the next visable top pipe
+    pipes = self._game.pipes
+    if len(pipes) >= 2:
+      return pipes[-1] # the last top pipe is always the next visable top pipe
     else:
       return None
       
@@ -195,96 +351,194 @@ class FlappyBirdEnv(gym.Env):
     
     return reward
   
-  def _get_reward(self):
-    bird_upper_bound = self._game.bird_y
+  def _tick_reward(self, alive: bool) -> float:
+    """ Returns the reward of the last game tick. """
+    if not alive:
+      reward = -1
+    else:
+      reward = 0.1
 
-    not_passed_top_pipe = self._not_passed_top_pipe()
+    reward = self._bird_hits_top_reward(reward)
 
-    if not_passed_top_pipe is None:
-      self.close()
-      raise RuntimeError("Could not find next available pipe for reward.")
+    # if pipe passed give reward
+    if self.pass_pipe < self._game.score:
+      reward = 1
+      self.pass_pipe += 1
 
-    if bird_upper_bound < 0:
-      return -0.5
-    
-    return 0
+    return reward
 
   def step(self,
             action: Union[GameLogic.Actions, int],
   ) -> Tuple[np.ndarray, float, bool, Dict]:
     """ Given an action, updates the game state.
 
+    With `frameskip`, the action is repeated for several game ticks and the
+    rewards of the ticks are summed, stopping early when the bird dies or the
+    episode is truncated.
+
     Args:
         action (Union[GameLogic.Actions, int]): The action taken by
             the agent. Zero (0) means "do nothing" and one (1) means "flap".
     """
 
     
-    if self._renderer is None or self._game is None:
+    if self._game is None:
       self.close()
-      raise RuntimeError("Could not find GameRenderer or GameLogic. The environment might not have been reset yet.")
+      raise RuntimeError("Could not find GameLogic. The environment might not have been reset yet.")
     
-    alive = self._game.update_state(action, self.fps)
-    observation = self._observation()
-
-    if not alive:
-      reward = -1
+    frameskip = self.frameskip
+    if isinstance(frameskip, tuple):
+      frameskip = int(self.np_random.integers(*frameskip))
+
+    profiler = self.profiler
+    reward = 0.0
+    ticks = 0
+    for _ in range(frameskip):
+      if profiler is None:
+        alive = self._game.update_state(action, self.fps)
+        reward += self._tick_reward(alive)
+      else:
+        start = perf_counter()
+        alive = self._game.update_state(action, self.fps)
+        updated = perf_counter()
+        reward += self._tick_reward(alive)
+        profiler.add("update_state", updated - start)
+        profiler.add("reward", perf_counter() - updated)
+      ticks += 1
+
+      if self.render_mode == "human":
+        self.render()
+
+      if not alive or self._game.score == 100:
+        break
+
+    if profiler is None:
+      observation = self._observation()
     else:
-      reward = 0.1
-
-    reward = self._bird_hits_top_reward(reward)
-
-    # if pipe passed give reward
-    if self.pass_pipe < self._game.score:
-      reward = 1
-      self.pass_pipe += 1
-
+      start = perf_counter()
+      observation = self._observation()
+      profiler.add("observation", perf_counter() - start)
     done = not alive
     info = {"score": self._game.score}
-
-    if self.render_mode == "human":
-      self.render()
+    if profiler is not None:
+      info["profile"] = profiler.end_step(ticks)
 
     truncated = self._game.score == 100
 
     return observation, reward, done, truncated, info
   
+  def get_state(self) -> GameState:
+    """ Returns a picklable snapshot of the current game.
+
+    The snapshot holds the bird, the pipes, the ground, the timers, the score
+    and the state of the game's random generator, so restoring it with
+    `set_state` reproduces the same trajectory for the same actions. It does
+    not include `np_random`, which only seeds the games of later resets.
+    """
+    if self._game is None:
+      raise RuntimeError("The environment must be reset before its state can be saved.")
+    return self._game.get_state()
+
+  def set_state(self, state: GameState) -> np.ndarray:
+    """ Restores a snapshot returned by `get_state` and returns its observation.
+
+    With `frame_stack`, the stack is filled with the restored observation, as
+    on `reset`.
+
+    Args:
+        state (GameState): A snapshot of a game with the same observation type
+            and screen size, taken with either backend.
+    """
+    if self._game is None:
+      raise RuntimeError("The environment must be reset before its state can be restored.")
+    self._game.set_state(state)
+    self.pass_pipe = state.score
+    self._stack_index = None
+    return self._observation()
+
   def reset(self, seed=None, options=None):
     """ Resets the environment (starts a new game). """
     super().reset(seed=seed, options=options)
     
-    self._game = GameLogic(self._screen_size)
-    self._renderer = GameRenderer(self._game)
+    # Every game owns a generator derived from `np_random`, so that a seed
+    # fixes the whole sequence of episodes:
+    rng = np.random.default_rng(self.np_random.integers(1 << 63))
+    self._game = self.backends[self.backend](self._screen_size, self.clock, rng=rng,
+                                             pipe_schedule=self.pipe_schedule, collision=self.collision)
+    if self._renderer is not None:
+      self._renderer.game = self._game
     self.pass_pipe = 0
+    self._stack_index = None
+    if self.profiler is not None:
+      self.profiler.track_game(self._game)
 
     observation = self._observation()
     info = {"score": self._game.score}
 
     return observation, info
+
+  def _get_renderer(self) -> GameRenderer:
+    """ Returns the renderer of the environment, creating it on first use.
+
+    A features environment that is never rendered never allocates the
+    surfaces of a renderer. Once created, the renderer draws the games of
+    the following resets.
+    """
+    if self._renderer is None:
+      self._renderer = GameRenderer(self._game, frame=self._frame if self.obs_type == "pixels" else None)
+    return self._renderer
   
   def render(self):
     """ Renders the next frame. """
+    if self.profiler is None:
+      return self._render()
 
+    start = perf_counter()
+    frame = self._render()
+    self.profiler.add("render", perf_counter() - start)
+    return frame
+
+  def _render(self):
     if self.render_mode not in FlappyBirdEnv.metadata['render_modes']:
       raise ValueError("Invalid render mode!")
     
-    if self._renderer is None:
+    if self._game is None:
       raise ValueError("Environment has not been reset or has not been initialized.")
     
-    self._renderer.draw_surface()
-
+    renderer = self._get_renderer()
     if self.render_mode == "rgb_array":
-      return np.transpose(np.array(pygame.surfarray.pixels3d(self._renderer.surface)), axes=(1,0,2))
+      renderer.draw_surface()
+      return self._rgb_array()
     else:
-      if self._renderer.display is None:
-          self._renderer.make_display()
-      self._renderer.update_display()
+      if renderer.display is None:
+          renderer.make_display(incremental=self.incremental_render)
+      renderer.update_display(renderer.draw_display())
 
   
+  def _rgb_array(self) -> np.ndarray:
+    """ Packs the surface of the renderer into a C-contiguous (height, width, 3) frame. """
+    surface = self._renderer.surface
+    width, height = surface.get_size()
+    if self._render_frame is None or self._render_frame.shape[:2] != (height, width):
+      self._render_frame = np.zeros((height, width, 3), dtype=np.uint8)
+      # Blitting onto an RGB surface over the buffer packs the pixels without
+      # locking the surface of the renderer nor going through a transposed copy:
+      self._render_frame_surface = pygame.image.frombuffer(self._render_frame, (width, height), "RGB")
+      self._render_frame_view = self._render_frame.view()
+      self._render_frame_view.flags.writeable = False
+
+    self._render_frame_surface.blit(surface, (0, 0))
+    return self._render_frame.copy() if self.copy else self._render_frame_view
+
   def close(self):
-    """ Closes the environment. """
+    """ Closes the environment.
+
+    Only the display of a human environment is closed: pygame stays
+    initialised for the other environments of the process, which may run on
+    other threads.
+    """
     if self._renderer is not None:
+      if self._renderer.display is not None:
         pygame.display.quit()
-        pygame.quit()
-        self._renderer = None
+      self._renderer = None
     super().close()
\ No newline at end of file
@@ -0,0 +1,296 @@
+from typing import List, Optional, Tuple, Union
+
+import gymnasium as gym
+import numpy as np
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gym.env.game_logic import GameLogic
+
+class FlappyBirdVectorEnv(gym.vector.VectorEnv):
+  """ Runs `num_envs` Flappy Bird games at once on NumPy arrays.
+
+  Every game follows the physics, scoring, rewards and feature observations of
+  :class:`FlappyBirdEnv` with `obs_type="features"`, but the whole batch is
+  advanced with a handful of array operations per step. Finished games are
+  reset automatically, as in :class:`gymnasium.vector.SyncVectorEnv`: the
+  observation of the last step is stored in `info["final_observation"]`, its
+  info in `info["final_info"]`, and `info["score"]` holds the score reached
+  before the reset.
+
+  Every game draws its pipes from its own generator, exactly like a
+  :class:`FlappyBirdEnv`, so with `reset(seed=seed)` game `i` plays the same
+  episodes as a :class:`FlappyBirdEnv` reset with `seed + i`, as in
+  :class:`gymnasium.vector.SyncVectorEnv`.
+
+  The pipes of a game live in a ring of `max_pipes` slots, at least
+  `MAX_PIPES`, and enough for every pipe pair that can be alive at once on the
+  screen size. The ground always spans the whole width of the screen, so it is
+  only tracked by its height.
+  """
+
+  metadata = {"render_modes": [], "obs_type": ["features"]}
+
+  # Minimum number of pipe slots of a game:
+  MAX_PIPES = 8
+
+  def __init__(self, num_envs: int, obs_type="features",
+               screen_size: Tuple[int, int] = (551, 720), copy: bool = True,
+               max_episode_steps: Optional[int] = None) -> None:
+    """
+    Args:
+        num_envs (int): The number of games.
+        obs_type (str): The observation type, only "features" is supported.
+        screen_size (Tuple[int, int]): The screen size of the games.
+        copy (bool): Whether to return copies of the observation batch.
+        max_episode_steps (Optional[int]): The number of steps after which an
+            episode is truncated, passed by `gymnasium.make_vec`.
+    """
+
+    if obs_type != "features":
+      raise ValueError("FlappyBirdVectorEnv only supports the features observation.")
+
+    self._screen_size = screen_size
+    self.obs_type = obs_type
+    self.copy = copy
+    self.max_episode_steps = max_episode_steps
+    self.constants = GameLogic.Constants(screen_size)
+
+    single_observation_space = FlappyBirdEnv(obs_type=obs_type, screen_size=screen_size).observation_space
+    super().__init__(num_envs, single_observation_space, gym.spaces.Discrete(2))
+    self._obs_low = single_observation_space.low
+    self._obs_high = single_observation_space.high
+
+    width, height = screen_size
+    constants = self.constants
+    bird_width, bird_height = constants.BIRD_SPRITE_SIZE
+    self._pipe_width, pipe_height = constants.PIPE_SPRITE_SIZE
+
+    self._bird_x = int(width * 0.2)
+    self._bird_start_left = self._bird_x - bird_width // 2
+    self._bird_start_top = int((height - constants.BIRD_HEIGHT) / 2) - bird_height // 2
+    self._bird_height = bird_height
+    self._top_pipe_offset = pipe_height - constants.PIPE_HEIGHT
+    self._pipe_height = pipe_height
+
+    ground_y = height * 0.7223
+    self._ground_top = round(ground_y if screen_size != (64, 64) else ground_y + 2)
+    self._ground_bottom = self._ground_top + constants.GROUND_SPRITE_SIZE[1]
+    # The bounds of the gap heights and timers drawn by `GameLogic._next_pipe`:
+    gap_offset = int(ground_y * 0.2)
+    timer_low, timer_high = (25, 50) if screen_size == (64, 64) else (180, 250)
+    self._pipe_low = (gap_offset, timer_low)
+    self._pipe_high = (int(ground_y * 0.6 - constants.PIPE_GAP) + gap_offset, timer_high + 1)
+
+    # A pipe pair lives from its spawn, at `width + 10`, until it scrolls past
+    # `-BACKGROUND_WIDTH`, and a new one spawns at most every `timer_low + 1`
+    # frames:
+    lifetime = -(-(width + 10 + constants.BACKGROUND_WIDTH) // constants.SCROLL_SPEED)
+    self.max_pipes = max(self.MAX_PIPES, -(-lifetime // (timer_low + 1)) + 1)
+
+    n, k = num_envs, self.max_pipes
+    self.bird_top = np.zeros(n, dtype=np.int64)
+    self.bird_vel = np.zeros(n, dtype=np.float64)
+    self.bird_flap = np.zeros(n, dtype=bool)
+    self.score = np.zeros(n, dtype=np.int64)
+    self.pipe_timer = np.zeros(n, dtype=np.int64)
+    self.pipe_x = np.zeros((n, k), dtype=np.int64)
+    self.pipe_gap_y = np.zeros((n, k), dtype=np.int64)
+    self.pipe_active = np.zeros((n, k), dtype=bool)
+    self.pipe_passed = np.zeros((n, k), dtype=bool)
+    self._next_pipe_slot = np.zeros(n, dtype=np.int64)
+    self.elapsed_steps = np.zeros(n, dtype=np.int64)
+
+    # The generator of every game and the one it seeds the generator of the
+    # pipes of each episode with, like `FlappyBirdEnv.np_random`:
+    self._np_randoms = [None] * n
+    self._pipe_rngs = [None] * n
+
+    self._rows = np.arange(n)
+    self.observations = np.zeros((n, single_observation_space.shape[0]), dtype=single_observation_space.dtype)
+    self._rewards = np.zeros(n, dtype=np.float64)
+    self._terminateds = np.zeros(n, dtype=bool)
+    self._truncateds = np.zeros(n, dtype=bool)
+    self._scored = np.zeros(n, dtype=bool)
+    self._actions = None
+
+  def reset_wait(self, seed: Optional[Union[int, List[int]]] = None,
+                 options: Optional[dict] = None):
+    """ Resets every game and returns the batch of initial observations.
+
+    Args:
+        seed: `None`, an int, from which game `i` is seeded with `seed + i`,
+            or a list of one seed, or `None`, per game.
+        options: Unused.
+    """
+    if seed is None:
+      seeds = [None] * self.num_envs
+    elif isinstance(seed, int):
+      seeds = [seed + i for i in range(self.num_envs)]
+    else:
+      seeds = list(seed)
+      if len(seeds) != self.num_envs:
+        raise ValueError(f"Expected {self.num_envs} seeds, got {len(seeds)}.")
+
+    for i, game_seed in enumerate(seeds):
+      if game_seed is not None or self._np_randoms[i] is None:
+        self._np_randoms[i], _ = gym.utils.seeding.np_random(game_seed)
+
+    self._reset_games(np.ones(self.num_envs, dtype=bool))
+    self._features()
+
+    observations = self.observations.copy() if self.copy else self.observations
+    return observations, {"score": self.score.copy()}
+
+  def step_async(self, actions) -> None:
+    self._actions = np.asarray(actions)
+
+  def step_wait(self):
+    """ Advances every game by one frame and resets the finished ones. """
+    if self._actions is None:
+      raise RuntimeError("step_async must be called before step_wait.")
+
+    alive = self._update_state(self._actions)
+    self._actions = None
+    self._features()
+
+    rewards = self._rewards
+    rewards[:] = np.where(alive, 0.1, -1.0)
+    rewards[self.bird_top + self._bird_height // 2 < 0] = -0.5
+    rewards[self._scored] = 1.0
+
+    terminateds = np.logical_not(alive, out=self._terminateds)
+    truncateds = np.equal(self.score, 100, out=self._truncateds)
+    self.elapsed_steps += 1
+    if self.max_episode_steps is not None:
+      truncateds |= self.elapsed_steps >= self.max_episode_steps
+
+    infos = {"score": self.score.copy()}
+    finished = terminateds | truncateds
+    if finished.any():
+      infos["final_observation"] = np.full(self.num_envs, None, dtype=object)
+      infos["final_info"] = np.full(self.num_envs, None, dtype=object)
+      for i in np.flatnonzero(finished):
+        infos["final_observation"][i] = self.observations[i].copy()
+        infos["final_info"][i] = {"score": int(self.score[i])}
+      infos["_final_observation"] = finished.copy()
+      infos["_final_info"] = finished.copy()
+      self._reset_games(finished)
+      self._features()
+
+    observations = self.observations.copy() if self.copy else self.observations
+    return observations, rewards.copy(), terminateds.copy(), truncateds.copy(), infos
+
+  def _reset_games(self, mask: np.ndarray) -> None:
+    self.bird_top[mask] = self._bird_start_top
+    self.bird_vel[mask] = 0
+    self.bird_flap[mask] = False
+    self.score[mask] = 0
+    self.pipe_timer[mask] = 0
+    self.pipe_active[mask] = False
+    self.pipe_passed[mask] = False
+    self._next_pipe_slot[mask] = 0
+    self.elapsed_steps[mask] = 0
+    for i in np.flatnonzero(mask):
+      self._pipe_rngs[i] = np.random.default_rng(self._np_randoms[i].integers(1 << 63))
+
+  def _update_state(self, actions: np.ndarray) -> np.ndarray:
+    """ Advances every game by one frame and returns which birds are still alive. """
+    constants = self.constants
+    active = self.pipe_active
+
+    # Pipes
+    self.pipe_x -= constants.SCROLL_SPEED
+    pipe_right = self.pipe_x + self._pipe_width
+    active &= self.pipe_x > -constants.BACKGROUND_WIDTH
+    newly_passed = active & ~self.pipe_passed & (self._bird_x >= pipe_right)
+    self.pipe_passed |= newly_passed
+    self._scored = newly_passed.any(axis=1)
+    self.score += self._scored
+
+    # Gravity and Flap
+    vel = self.bird_vel
+    vel += constants.BIRD_ACC
+    np.minimum(vel, constants.BIRD_MAX_VEL_Y, out=vel)
+    falling = self.bird_top < constants.BIRD_MAX_FALL_Y
+    self.bird_top += np.where(falling, vel.astype(np.int64), 0)
+    self.bird_flap &= vel != 0
+
+    flap = (actions == GameLogic.Actions.FLAP) & ~self.bird_flap & (self.bird_top > 0)
+    self.bird_flap |= flap
+    vel[flap] = constants.BIRD_MIN_VEL_Y
+
+    # Collision Detection
+    bird_top = self.bird_top[:, None]
+    bird_bottom = bird_top + self._bird_height
+    top_pipe_y = self.pipe_gap_y - constants.PIPE_HEIGHT
+    bottom_pipe_y = self.pipe_gap_y + constants.PIPE_GAP
+    overlap_x = active & (self._bird_start_left < pipe_right) \
+      & (self._bird_start_left + constants.BIRD_SPRITE_SIZE[0] > self.pipe_x)
+    hits_pipes = overlap_x & (((bird_top < top_pipe_y + self._pipe_height) & (bird_bottom > top_pipe_y))
+                              | ((bird_top < bottom_pipe_y + self._pipe_height) & (bird_bottom > bottom_pipe_y)))
+    hits_ground = (self.bird_top < self._ground_bottom) & (self.bird_top + self._bird_height > self._ground_top)
+    alive = ~(hits_pipes.any(axis=1) | hits_ground)
+
+    # Spawn Pipes
+    spawn = (self.pipe_timer <= 0) & alive
+    if spawn.any():
+      self._add_pipes(np.flatnonzero(spawn))
+    self.pipe_timer -= 1
+
+    return alive
+
+  def _add_pipes(self, games: np.ndarray) -> None:
+    # Pipes only spawn every few hundred frames, so drawing them game by game,
+    # in the order of `GameLogic._next_pipe`, costs little:
+    (gap_low, timer_low), (gap_high, timer_high) = self._pipe_low, self._pipe_high
+    for game in games:
+      rng = self._pipe_rngs[game]
+      slot = self._next_pipe_slot[game]
+      self.pipe_x[game, slot] = self._screen_size[0] + 10
+      self.pipe_gap_y[game, slot] = rng.integers(gap_low, gap_high)
+      self.pipe_timer[game] = rng.integers(timer_low, timer_high)
+      self.pipe_active[game, slot] = True
+      self.pipe_passed[game, slot] = False
+      self._next_pipe_slot[game] = (slot + 1) % self.max_pipes
+
+  def _features(self) -> None:
+    """ Writes the feature observation of every game, like `FlappyBirdEnv._feature_space`. """
+    width, height = self._screen_size
+    pipe_gap = self.constants.PIPE_GAP
+    rows = self._rows
+    obs = self.observations
+    obs[:] = 1.0
+
+    bird_top = self.bird_top
+    bird_left = self._bird_start_left
+
+    # Pipes move at the same speed, so the oldest pipes are the leftmost ones:
+    big = np.iinfo(np.int64).max
+    ahead = self.pipe_active & (self.pipe_x + self._pipe_width >= bird_left)
+    front = np.where(ahead, self.pipe_x, big).argmin(axis=1)
+    has_front = ahead[rows, front]
+    newest = np.where(self.pipe_active, self.pipe_x, -big).argmax(axis=1)
+    has_next = (self.pipe_active.sum(axis=1) >= 2) & ~(has_front & (newest == front))
+
+    front_left = self.pipe_x[rows, front]
+    front_bottom = self.pipe_gap_y[rows, front] + self._top_pipe_offset
+    g = has_front
+    obs[g, 0] = (front_left[g] + self._pipe_width - bird_left) / width
+    obs[g, 1] = ((2 * front_bottom[g] + pipe_gap) / 2 - bird_top[g]) / height
+    obs[g, 2] = front_left[g] / width
+    obs[g, 3] = (front_left[g] + self._pipe_width) / width
+    obs[g, 4] = (front_left[g] + pipe_gap) / width
+    obs[g, 5] = (front_left[g] + self._pipe_width + pipe_gap) / width
+    obs[g, 11] = bird_top[g] / height
+    obs[g, 12] = (bird_top[g] + self._bird_height) / height
+
+    next_left = self.pipe_x[rows, newest]
+    g = has_next
+    obs[g, 6] = next_left[g] / width
+    obs[g, 7] = (next_left[g] + self._pipe_width) / width
+    obs[g, 8] = (next_left[g] + pipe_gap) / width
+    obs[g, 9] = (next_left[g] + self._pipe_width + pipe_gap) / width
+
+    obs[:, 10] = self.bird_vel / self.constants.BIRD_MAX_VEL_Y
+
+    np.clip(obs, self._obs_low, self._obs_high, out=obs)
@@ -1,14 +1,18 @@
 
-import random
-from enum import IntEnum
-from typing import Tuple, Union, Dict
+import time
+from enum import Enum, IntEnum
+from typing import List, NamedTuple, Optional, Tuple, Union
 
+import numpy as np
 import pygame
-from pygame.sprite import spritecollide as collision
 import flappy_bird_gym.utils as utils
 
 from flappy_bird_gym.constants import (
     BACKGROUND_WIDTH, 
+    BIRD_WIDTH,
+    PIPE_WIDTH,
+    BASE_WIDTH,
+    BASE_HEIGHT,
     SCROLL_SPEED, 
     BIRD_ACC, 
     BIRD_MAX_VEL_Y,
@@ -25,96 +29,210 @@ from flappy_bird_gym.constants import (
     PIXELATED_BIRD_MAX_FALL_Y,
     PIXELATED_PIPE_HEIGHT,
     PIXELATED_BIRD_HEIGHT,
-    PIXELATED_PIPE_GAP
+    PIXELATED_PIPE_GAP,
+    PIXELATED_BIRD_SPRITE_WIDTH,
+    PIXELATED_BIRD_SPRITE_HEIGHT,
+    PIXELATED_PIPE_SPRITE_WIDTH,
+    PIXELATED_PIPE_SPRITE_HEIGHT,
+    PIXELATED_BASE_SPRITE_WIDTH,
+    PIXELATED_BASE_SPRITE_HEIGHT
 )
 
+class PipeBounds(NamedTuple):
+    """ Horizontal extent and lower edge of a top pipe. """
+    left: int
+    right: int
+    bottom: int
+
+class FrameClock:
+    """ Paces a game to a number of frames per second, like `pygame.time.Clock.tick`.
+
+    It only reads this game's own timestamps and sleeps with `time.sleep`,
+    which releases the GIL, so games on different threads don't share any
+    pygame state.
+    """
+
+    def __init__(self) -> None:
+        self._last_tick = time.perf_counter()
+
+    def tick(self, fps: float) -> float:
+        """ Sleeps until a frame has passed since the previous tick and returns the milliseconds since it. """
+        now = time.perf_counter()
+        if fps:
+            delay = self._last_tick + 1 / fps - now
+            if delay > 0:
+                time.sleep(delay)
+                now = time.perf_counter()
+        elapsed, self._last_tick = now - self._last_tick, now
+        return elapsed * 1000
+
+class GameState(NamedTuple):
+    """ Picklable snapshot of a game, see `GameLogic.get_state`.
+
+    The bird is stored as `(left, top, vel, angle, flap, alive, image_index)`
+    and every pipe pair, oldest first, as `(left, gap_y, passed,
+    score_collected)`.
+    """
+    bird: Tuple
+    pipes: Tuple[Tuple[int, int, bool, bool], ...]
+    front_pipe: int
+    ground_xs: Tuple[int, ...]
+    pipe_timer: int
+    score: int
+    elapsed_time: float
+    rng_state: dict
+    pipe_schedule: List[List[int]]
+    pipe_index: int
+
 class BirdSprite(pygame.sprite.Sprite):
-    def __init__(self, x, y, images, constants):
+    def __init__(self, x, y, images, constants, rotations=None, masks=None):
         self.bird_images = images
+        self.rotations = rotations if rotations is not None else utils.BirdRotations(images)
+        self.masks = masks if masks is not None else utils.BirdMasks(self.rotations)
         pygame.sprite.Sprite.__init__(self)
-        self.image = self.bird_images[0]
-        self.rect = self.image.get_rect()
+        self.rect = self.bird_images[0].get_rect()
         self.rect.center = (x, y)
         self.image_index = 0
         self.vel = 0
+        self.angle = 0
         self.flap = False
         self.alive = True
         self.constants = constants
 
+        # Hoisted constants of `update`:
+        self._acc = constants.BIRD_ACC
+        self._max_vel = constants.BIRD_MAX_VEL_Y
+        self._min_vel = constants.BIRD_MIN_VEL_Y
+        self._max_fall_y = constants.BIRD_MAX_FALL_Y
+
+    @property
+    def image(self):
+        """ The current animation frame, rotated by the angle of the bird. """
+        return self.rotations[(self.image_index // 10, self.angle)]
+
+    @property
+    def mask(self):
+        """ The collision mask of the current image, used by `pygame.sprite.collide_mask`. """
+        return self.masks[(self.image_index // 10, self.angle)]
+
     def update(self, user_input):
         # Animate Bird
         if self.alive:
             self.image_index += 1
         if self.image_index >= 30:
             self.image_index = 0
-        self.image = self.bird_images[self.image_index // 10]
 
         # Gravity and Flap
-        self.vel += self.constants.BIRD_ACC
-        if self.vel > self.constants.BIRD_MAX_VEL_Y:
-            self.vel = self.constants.BIRD_MAX_VEL_Y
-        if self.rect.y < self.constants.BIRD_MAX_FALL_Y:
-            self.rect.y += int(self.vel)
+        rect = self.rect
+        self.vel += self._acc
+        if self.vel > self._max_vel:
+            self.vel = self._max_vel
+        if rect.y < self._max_fall_y:
+            rect.y += int(self.vel)
         if self.vel == 0:
             self.flap = False
 
-        # Rotate Bird
-        self.image = pygame.transform.rotate(self.image, self.vel * self.constants.BIRD_MIN_VEL_Y)
+        # Rotate Bird, the rotated image is only looked up when the bird is drawn
+        self.angle = self.vel * self._min_vel
 
         # User Input
-        if user_input == GameLogic.Actions.FLAP and not self.flap and self.rect.y > 0 and self.alive:
+        if user_input == GameLogic.Actions.FLAP and not self.flap and rect.y > 0 and self.alive:
             self.flap = True
-            self.vel = self.constants.BIRD_MIN_VEL_Y
+            self.vel = self._min_vel
 
 class Pipe(pygame.sprite.Sprite):
-    def __init__(self, x, y, image, pipe_type, bird_start_x, constants):
+    def __init__(self, x, y, image, pipe_type, bird_start_x, constants, mask=None):
         pygame.sprite.Sprite.__init__(self)
         self.image = image
+        if mask is not None:
+            self.mask = mask
         self.rect = self.image.get_rect()
+        self.pipe_type = pipe_type
+        self.is_top = pipe_type == 'top'
+        self.constants = constants
+        # The bottom pipe of a top pipe's pair:
+        self.partner = None
+
+        # Hoisted constants of `update`:
+        self._scroll_speed = constants.SCROLL_SPEED
+        self._kill_x = -constants.BACKGROUND_WIDTH
+
+        self.place(x, y, bird_start_x)
+
+    def place(self, x, y, bird_start_x) -> None:
+        """ Moves the pipe to a new position and clears its score, so that pooled pipes can be reused. """
         self.rect.x, self.rect.y = x, y
         self.enter, self.exit, self.passed = False, False, False
-        self.pipe_type = pipe_type
         self.bird_start_x = bird_start_x
         self.score_collected = False
-        self.constants = constants
+
+    @property
+    def left(self) -> int:
+        return self.rect.left
+
+    @property
+    def bottom(self) -> int:
+        return self.rect.bottom
 
     def update(self):
         # Move Pipe
-        self.rect.x -= self.constants.SCROLL_SPEED
-        if self.rect.x <= -self.constants.BACKGROUND_WIDTH:
+        rect = self.rect
+        rect.x -= self._scroll_speed
+        if rect.x <= self._kill_x:
             self.kill()
 
         # Score
-        if self.pipe_type == 'top':
-            if self.bird_start_x >= self.rect.bottomleft[0] and not self.passed:
+        if self.is_top and not self.passed:
+            if self.bird_start_x >= rect.left:
                 self.enter = True
-            if self.bird_start_x >= self.rect.bottomright[0] and not self.passed:
+            if self.bird_start_x >= rect.right:
                 self.exit = True
-            if self.enter and self.exit and not self.passed:
+            if self.enter and self.exit:
                 self.passed = True
 
 class Ground(pygame.sprite.Sprite):
-    def __init__(self, x, y, image, constants):
+    def __init__(self, x, y, image, constants, mask=None):
         pygame.sprite.Sprite.__init__(self)
         self.image = image
+        if mask is not None:
+            self.mask = mask
         self.rect = self.image.get_rect()
         self.rect.x, self.rect.y = x, y
         self.constants = constants
 
+        # Hoisted constants of `update`:
+        self._scroll_speed = constants.SCROLL_SPEED
+        self._kill_x = -constants.BACKGROUND_WIDTH
+
     def update(self):
         # Move Ground
-        self.rect.x -= self.constants.SCROLL_SPEED
-        if self.rect.x <= -self.constants.BACKGROUND_WIDTH:
+        rect = self.rect
+        rect.x -= self._scroll_speed
+        if rect.x <= self._kill_x:
             self.kill()
 
 class GameLogic:
-    def __init__(self, screen_size: Tuple[int, int]) -> None:
+    headless = False
+
+    # Pipe pairs drawn up front with `pipe_schedule=True`. Episodes are
+    # truncated at a score of 100, so they rarely need more:
+    PIPE_SCHEDULE_SIZE = 128
+
+    def __init__(self, screen_size: Tuple[int, int],
+                 clock: Union["GameLogic.Clock", str] = "realtime",
+                 rng: Optional[np.random.Generator] = None,
+                 pipe_schedule: bool = False,
+                 collision: Union["GameLogic.Collision", str] = "rect") -> None:
             
         self.constants = self.Constants(screen_size)
 
         self.pixelated = screen_size == (64, 64)
+
+        self.collision = self.Collision(collision)
         
-        self._clock = pygame.time.Clock()
+        self.clock = self.Clock(clock)
+        self._clock = FrameClock() if self.clock == self.Clock.REALTIME else None
+        self.elapsed_time = 0.0
 
         self.screen_width = screen_size[0]
         self.screen_height = screen_size[1]
@@ -127,23 +245,69 @@ class GameLogic:
 
         self.score = 0
 
+        self._init_pipe_generator(rng, pipe_schedule)
+
         self.images = utils.load_images(not self.pixelated)
 
+        # Pixel collisions test the masks of the drawn images, rect collisions
+        # only the rects of the sprites:
+        self.masks = None
+        self._collided = None
+        if self.collision == self.Collision.PIXEL:
+            self.masks = utils.load_masks(not self.pixelated)
+            self._collided = pygame.sprite.collide_mask
+
         self.bird = pygame.sprite.GroupSingle()
-        self.bird.add(BirdSprite(self.bird_x, self.bird_y, self.images['bird'], self.constants))
+        self._bird_sprite = BirdSprite(self.bird_x, self.bird_y, self.images['bird'], self.constants,
+                                       utils.load_bird_rotations(not self.pixelated),
+                                       self.masks['bird'] if self.masks else None)
+        self.bird.add(self._bird_sprite)
 
         self.pipe_timer = 0
         self.pipe_group = pygame.sprite.Group()
 
+        # Top pipe of every pipe pair, oldest first, and the index of the first
+        # one whose right edge is not behind the bird:
+        self.pipes = []
+        self.front_pipe = 0
+        self._pipe_width = self.constants.PIPE_SPRITE_SIZE[0]
+
+        # The grounds, oldest first. The step loop iterates `pipes` and
+        # `grounds` instead of the sprite groups, whose iteration copies their
+        # sprites, and the pipe pairs and grounds that left the screen are
+        # pooled and reused by the next spawns:
+        self.grounds = []
+        self._pipe_pool = []
+        self._ground_pool = []
+
         self.ground_group = pygame.sprite.Group()
-        self.ground_group.add(Ground(self.ground_x, self.ground_y if not self.pixelated else self.ground_y + 2, 
-                                     self.images['ground'], self.constants))
+        self._add_ground(self.ground_x)
 
 
     class Actions(IntEnum):
         """ Possible actions for the player to take. """
         IDLE, FLAP = 0, 1
 
+    class Clock(str, Enum):
+        """ Policies for advancing time on each call to `update_state`.
+
+        REALTIME sleeps so the game runs at the requested fps, UNTHROTTLED
+        never sleeps nor tracks time and FIXED never sleeps but advances a
+        simulated clock by exactly one frame (1000 / fps milliseconds).
+        """
+        REALTIME = "realtime"
+        UNTHROTTLED = "unthrottled"
+        FIXED = "fixed"
+
+    class Collision(str, Enum):
+        """ How collisions of the bird with the pipes and the ground are detected.
+
+        RECT tests the rects of the sprites, as the original game does, while
+        PIXEL tests the opaque pixels of the drawn (rotated) images.
+        """
+        RECT = "rect"
+        PIXEL = "pixel"
+
     class Constants:
         def __init__(self, screen_size: Tuple[int, int]) -> None:
             if screen_size == (64, 64):
@@ -156,6 +320,9 @@ class GameLogic:
                 self.PIPE_HEIGHT = PIXELATED_PIPE_HEIGHT
                 self.BIRD_HEIGHT = PIXELATED_BIRD_HEIGHT
                 self.PIPE_GAP = PIXELATED_PIPE_GAP
+                self.BIRD_SPRITE_SIZE = (PIXELATED_BIRD_SPRITE_WIDTH, PIXELATED_BIRD_SPRITE_HEIGHT)
+                self.PIPE_SPRITE_SIZE = (PIXELATED_PIPE_SPRITE_WIDTH, PIXELATED_PIPE_SPRITE_HEIGHT)
+                self.GROUND_SPRITE_SIZE = (PIXELATED_BASE_SPRITE_WIDTH, PIXELATED_BASE_SPRITE_HEIGHT)
             else:
                 self.BACKGROUND_WIDTH = BACKGROUND_WIDTH
                 self.SCROLL_SPEED = SCROLL_SPEED
@@ -166,6 +333,9 @@ class GameLogic:
                 self.PIPE_HEIGHT = PIPE_HEIGHT
                 self.BIRD_HEIGHT = BIRD_HEIGHT
                 self.PIPE_GAP = PIPE_GAP
+                self.BIRD_SPRITE_SIZE = (BIRD_WIDTH, BIRD_HEIGHT)
+                self.PIPE_SPRITE_SIZE = (PIPE_WIDTH, PIPE_HEIGHT)
+                self.GROUND_SPRITE_SIZE = (BASE_WIDTH, int(BASE_HEIGHT))
 
     def update_state(self, action: Union[Actions, int], fps) -> bool:
         """ Given an action taken by the player, updates the game's state.
@@ -178,65 +348,223 @@ class GameLogic:
             `True` if the player is alive and `False` otherwise.
         """
 
-        # Spawn Ground
-        if len(self.ground_group) < 2:
-            if self.pixelated:
-                ground_y = self.ground_y + 2
-            else:
-                ground_y = self.ground_y
-            self.ground_group.add(Ground(self.screen_width , ground_y, self.images['ground'], self.constants))
+        bird_sprite = self._bird_sprite
 
-        if self.bird.sprite.alive:
-            self.pipe_group.update()
-            self.ground_group.update()
-        self.bird.update(action)
+        # Spawn Ground
+        if len(self.grounds) < 2:
+            self._add_ground(self.screen_width)
+
+        if bird_sprite.alive:
+            for pipe in self.pipes:
+                pipe.update()
+                pipe.partner.update()
+            self._update_grounds()
+            self._update_front_pipe()
+        bird_sprite.update(action)
         self._update_bird_coordinates()
 
-        for sprite in self.pipe_group.sprites():
-            if sprite.passed and not sprite.score_collected:
+        # Only top pipes are ever passed:
+        for pipe in self.pipes:
+            if pipe.passed and not pipe.score_collected:
                 self.score += 1
-                sprite.score_collected = True
+                pipe.score_collected = True
                 break
-        
-        bird_sprite = self.bird.sprite
-        # Collision Detection
-        collision_pipes = collision(bird_sprite, self.pipe_group, False)
-        collision_ground = collision(bird_sprite,  self.ground_group, False)
 
-        if collision_pipes or collision_ground:
-            self.bird.sprite.alive = False
+        # Collision Detection
+        if self._collides():
+            bird_sprite.alive = False
 
-        if self.pipe_timer <= 0 and self.bird.sprite.alive:
+        if self.pipe_timer <= 0 and bird_sprite.alive:
             self._add_pipes()
-            if self.pixelated:
-                self.pipe_timer = random.randint(25, 50)
-            else:
-                self.pipe_timer = random.randint(180, 250)
         
         self.pipe_timer -= 1
-        self._clock.tick(fps)
-
-        return self.bird.sprite.alive
+        self._tick(fps)
+
+        return bird_sprite.alive
+
+    def _collides(self) -> bool:
+        """ Tests the bird against every pipe and ground, as `pygame.sprite.spritecollide` would. """
+        bird_sprite = self._bird_sprite
+        collided = self._collided
+        if collided is None:
+            colliderect = bird_sprite.rect.colliderect
+            for pipe in self.pipes:
+                if colliderect(pipe.rect) or colliderect(pipe.partner.rect):
+                    return True
+            for ground in self.grounds:
+                if colliderect(ground.rect):
+                    return True
+        else:
+            for pipe in self.pipes:
+                if collided(bird_sprite, pipe) or collided(bird_sprite, pipe.partner):
+                    return True
+            for ground in self.grounds:
+                if collided(bird_sprite, ground):
+                    return True
+        return False
     
+    @property
+    def bird_rect(self) -> pygame.Rect:
+        """ The collision rect of the bird. """
+        return self._bird_sprite.rect
+
+    @property
+    def bird_vel(self) -> float:
+        """ The vertical velocity of the bird. """
+        return self._bird_sprite.vel
+
+    def top_pipes(self) -> List[PipeBounds]:
+        """ Returns the bounds of every top pipe, oldest first. """
+        return [PipeBounds(pipe.rect.left, pipe.rect.right, pipe.rect.bottom) for pipe in self.pipes]
+
+    def get_state(self) -> GameState:
+        """ Returns a snapshot of the game, including the state of its random generator. """
+        bird = self._bird_sprite
+        rect = bird.rect
+        constants = self.constants
+        return GameState(
+            bird=(rect.left, rect.top, bird.vel, bird.angle, bird.flap, bird.alive, bird.image_index),
+            pipes=tuple((pipe.rect.left, pipe.rect.top + constants.PIPE_HEIGHT, pipe.passed, pipe.score_collected)
+                        for pipe in self.pipes),
+            front_pipe=self.front_pipe,
+            ground_xs=tuple(ground.rect.left for ground in self.grounds),
+            pipe_timer=self.pipe_timer,
+            score=self.score,
+            elapsed_time=self.elapsed_time,
+            rng_state=self._rng.bit_generator.state,
+            pipe_schedule=self._pipe_schedule,
+            pipe_index=self._pipe_index,
+        )
+
+    def set_state(self, state: GameState) -> None:
+        """ Restores a snapshot returned by `get_state`. """
+        bird = self._bird_sprite
+        (bird.rect.left, bird.rect.top, bird.vel, bird.angle,
+         bird.flap, bird.alive, bird.image_index) = state.bird
+        self._update_bird_coordinates()
+
+        self.pipe_group.empty()
+        self._pipe_pool.extend(self.pipes)
+        self.pipes = []
+        for left, gap_y, passed, score_collected in state.pipes:
+            pipe = self._add_pipe_pair(left, gap_y)
+            pipe.passed = pipe.enter = pipe.exit = passed
+            pipe.score_collected = score_collected
+        self.front_pipe = state.front_pipe
+
+        self.ground_group.empty()
+        self._ground_pool.extend(self.grounds)
+        self.grounds = []
+        for ground_x in state.ground_xs:
+            self._add_ground(ground_x)
+
+        self.pipe_timer = state.pipe_timer
+        self.score = state.score
+        self.elapsed_time = state.elapsed_time
+        self._rng.bit_generator.state = state.rng_state
+        self._pipe_schedule = state.pipe_schedule
+        self._pipe_index = state.pipe_index
+
+    def _update_front_pipe(self) -> None:
+        """ Moves the killed pipes from `pipes` to the pool and advances `front_pipe`. """
+        pipes = self.pipes
+        while pipes and not pipes[0].alive():
+            self._pipe_pool.append(pipes.pop(0))
+            self.front_pipe -= 1
+        if self.front_pipe < 0:
+            self.front_pipe = 0
+
+        min_left = self._bird_sprite.rect.left - self._pipe_width
+        while self.front_pipe < len(pipes) and pipes[self.front_pipe].rect.left < min_left:
+            self.front_pipe += 1
+
+    def _tick(self, fps) -> None:
+        """ Advances the game clock by one frame according to the clock policy. """
+        if self.clock == self.Clock.REALTIME:
+            self.elapsed_time += self._clock.tick(fps)
+        elif self.clock == self.Clock.FIXED:
+            self.elapsed_time += 1000 / fps
+
     def _update_bird_coordinates(self):
-        self.bird_x = self.bird.sprite.rect.center[0]
-        self.bird_y = self.bird.sprite.rect.center[1]
+        rect = self._bird_sprite.rect
+        self.bird_x = rect.centerx
+        self.bird_y = rect.centery
+
+    def _init_pipe_generator(self, rng: Optional[np.random.Generator], pipe_schedule: bool) -> None:
+        """ Sets up the random generator of the pipes and, optionally, their schedule.
+
+        Args:
+            rng (Optional[np.random.Generator]): The generator owned by the
+                game. A fresh unseeded one is created if `None`.
+            pipe_schedule (bool): Whether to draw the gaps and timers of the
+                first `PIPE_SCHEDULE_SIZE` pipe pairs up front, so that the
+                step loop does not call the generator.
+        """
+        self._rng = rng if rng is not None else np.random.default_rng()
+        gap_offset = int(self.ground_y * 0.2)
+        timer_low, timer_high = (25, 50) if self.pixelated else (180, 250)
+        self._pipe_low = (gap_offset, timer_low)
+        self._pipe_high = (int(self.ground_y * 0.6 - self.constants.PIPE_GAP) + gap_offset, timer_high + 1)
+
+        # The schedule is drawn in the same order as `_next_pipe` draws the
+        # pipes one by one, so both give the same episodes for a given seed:
+        self._pipe_schedule = []
+        self._pipe_index = 0
+        self.pipes_spawned = 0
+        if pipe_schedule:
+            self._pipe_schedule = self._rng.integers(self._pipe_low, self._pipe_high,
+                                                     size=(self.PIPE_SCHEDULE_SIZE, 2)).tolist()
+
+    def _next_pipe(self) -> Tuple[int, int]:
+        """ Returns the gap height of the next pipe pair and the frames until the one after it. """
+        self.pipes_spawned += 1
+        if self._pipe_index < len(self._pipe_schedule):
+            gap_y, timer = self._pipe_schedule[self._pipe_index]
+            self._pipe_index += 1
+            return gap_y, timer
+
+        rng = self._rng
+        return (int(rng.integers(self._pipe_low[0], self._pipe_high[0])),
+                int(rng.integers(self._pipe_low[1], self._pipe_high[1])))
 
     def _add_pipes(self):
-        pipe_coordinates = self._get_random_pipe()
-        top_pipe_coord = pipe_coordinates[0]
-        bottom_pipe_coord = pipe_coordinates[1]
-        self.pipe_group.add(Pipe(top_pipe_coord['x'], top_pipe_coord['y'], self.images['pipe'][0], 'top', self.bird_x, self.constants))
-        self.pipe_group.add(Pipe(bottom_pipe_coord['x'], bottom_pipe_coord['y'], self.images['pipe'][1], 'bottom', self.bird_x, self.constants))
-    
-    def _get_random_pipe(self) -> Dict[str, int]:
-        """ Returns a randomly generated pipe. """
-        # y of gap between upper and lower pipe
-        gap_y = random.randrange(0, int(self.ground_y * 0.6 - self.constants.PIPE_GAP))
-        gap_y += int(self.ground_y * 0.2)
-
-        pipe_x = self.screen_width + 10
-        return [
-            {"x": pipe_x, "y": gap_y - self.constants.PIPE_HEIGHT}, # upper pipe
-            {"x": pipe_x, "y": gap_y + self.constants.PIPE_GAP},   # lower pipe
-        ]
\ No newline at end of file
+        gap_y, self.pipe_timer = self._next_pipe()
+        self._add_pipe_pair(self.screen_width + 10, gap_y)
+
+    def _add_pipe_pair(self, pipe_x: int, gap_y: int) -> Pipe:
+        """ Adds the top and bottom pipes of a pair, reusing a pooled pair if any, and returns the top one. """
+        top_y = gap_y - self.constants.PIPE_HEIGHT
+        bottom_y = gap_y + self.constants.PIPE_GAP
+        if self._pipe_pool:
+            top_pipe = self._pipe_pool.pop()
+            top_pipe.place(pipe_x, top_y, self.bird_x)
+            top_pipe.partner.place(pipe_x, bottom_y, self.bird_x)
+        else:
+            top_mask, bottom_mask = self.masks['pipe'] if self.masks else (None, None)
+            top_pipe = Pipe(pipe_x, top_y, self.images['pipe'][0], 'top', self.bird_x, self.constants, top_mask)
+            top_pipe.partner = Pipe(pipe_x, bottom_y, self.images['pipe'][1], 'bottom', self.bird_x, self.constants, bottom_mask)
+        self.pipe_group.add(top_pipe)
+        self.pipe_group.add(top_pipe.partner)
+        self.pipes.append(top_pipe)
+        return top_pipe
+
+    def _add_ground(self, x: int) -> Ground:
+        """ Adds a ground at `x`, reusing a pooled one if any. """
+        if self._ground_pool:
+            ground = self._ground_pool.pop()
+            ground.rect.x = x
+        else:
+            ground_y = self.ground_y + 2 if self.pixelated else self.ground_y
+            ground = Ground(x, ground_y, self.images['ground'], self.constants,
+                            self.masks['ground'] if self.masks else None)
+        self.ground_group.add(ground)
+        self.grounds.append(ground)
+        return ground
+
+    def _update_grounds(self) -> None:
+        """ Moves the grounds and pools the ones that left the screen. """
+        grounds = self.grounds
+        for ground in grounds:
+            ground.update()
+        while grounds and not grounds[0].alive():
+            self._ground_pool.append(grounds.pop(0))
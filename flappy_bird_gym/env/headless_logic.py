@@ -0,0 +1,337 @@
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+import flappy_bird_gym.utils as utils
+from flappy_bird_gym.env.game_logic import FrameClock, GameLogic, GameState, PipeBounds
+
+
+class BirdState:
+    """ Compact record of the bird, mirroring the rect and fields of `BirdSprite`. """
+    __slots__ = ("left", "top", "width", "height", "vel", "angle", "flap", "alive", "image_index")
+
+    def __init__(self, x, y, width, height):
+        self.width = width
+        self.height = height
+        self.left = x - width // 2
+        self.top = y - height // 2
+        self.image_index = 0
+        self.vel = 0
+        self.angle = 0
+        self.flap = False
+        self.alive = True
+
+    @property
+    def right(self) -> int:
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.top + self.height
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        return self.left + self.width // 2, self.top + self.height // 2
+
+
+class PipeState:
+    """ Compact record of a pair of pipes, i.e. a top and a bottom `Pipe` sprite. """
+    __slots__ = ("x", "gap_y", "bottom", "passed", "score_collected")
+
+    def __init__(self, x, gap_y, bottom):
+        self.x = x
+        self.gap_y = gap_y
+        self.bottom = bottom
+        self.passed = False
+        self.score_collected = False
+
+    @property
+    def left(self) -> int:
+        return self.x
+
+
+class HeadlessGameLogic:
+    """ Sprite-free implementation of :class:`GameLogic`.
+
+    The bird and the pipes are kept in `__slots__` records and the ground in a
+    list of x coordinates, so stepping the game never touches pygame. It
+    reproduces the physics, scoring, collisions and random pipe generation of
+    the sprite backend exactly, so both give the same episodes for a given
+    random generator.
+    """
+    headless = True
+
+    Actions = GameLogic.Actions
+    Clock = GameLogic.Clock
+    Collision = GameLogic.Collision
+    Constants = GameLogic.Constants
+    PIPE_SCHEDULE_SIZE = GameLogic.PIPE_SCHEDULE_SIZE
+
+    _init_pipe_generator = GameLogic._init_pipe_generator
+    _next_pipe = GameLogic._next_pipe
+
+    def __init__(self, screen_size: Tuple[int, int],
+                 clock: Union[GameLogic.Clock, str] = "realtime",
+                 rng: Optional[np.random.Generator] = None,
+                 pipe_schedule: bool = False,
+                 collision: Union[GameLogic.Collision, str] = "rect") -> None:
+
+        self.constants = self.Constants(screen_size)
+
+        self.pixelated = screen_size == (64, 64)
+
+        self.collision = self.Collision(collision)
+        self.masks = utils.load_masks(not self.pixelated) if self.collision == self.Collision.PIXEL else None
+
+        self.clock = self.Clock(clock)
+        self._clock = FrameClock() if self.clock == self.Clock.REALTIME else None
+        self.elapsed_time = 0.0
+
+        self.screen_width = screen_size[0]
+        self.screen_height = screen_size[1]
+
+        self.bird_x = int(self.screen_width * 0.2)
+        self.bird_y = int((self.screen_height - self.constants.BIRD_HEIGHT) / 2)
+
+        self.ground_x = 0
+        self.ground_y = self.screen_height * 0.7223
+
+        self.score = 0
+
+        self._init_pipe_generator(rng, pipe_schedule)
+
+        self.bird = BirdState(self.bird_x, self.bird_y, *self.constants.BIRD_SPRITE_SIZE)
+        self._bird_start_x = self.bird_x
+
+        self.pipe_timer = 0
+
+        # Pipe pairs, oldest first, and the index of the first one whose right
+        # edge is not behind the bird:
+        self.pipes: List[PipeState] = []
+        self.front_pipe = 0
+
+        self.ground_top = round(self.ground_y if not self.pixelated else self.ground_y + 2)
+        self.ground_xs = [self.ground_x]
+
+        # Hoisted constants of the step loop:
+        self._pipe_width, self._pipe_height = self.constants.PIPE_SPRITE_SIZE
+        self._ground_width, self._ground_height = self.constants.GROUND_SPRITE_SIZE
+        self._kill_x = -self.constants.BACKGROUND_WIDTH
+
+    @property
+    def bird_rect(self) -> BirdState:
+        """ The collision rect of the bird. """
+        return self.bird
+
+    @property
+    def bird_vel(self) -> float:
+        """ The vertical velocity of the bird. """
+        return self.bird.vel
+
+    def top_pipes(self) -> List[PipeBounds]:
+        """ Returns the bounds of every top pipe, oldest first. """
+        pipe_width = self._pipe_width
+        return [PipeBounds(pipe.x, pipe.x + pipe_width, pipe.bottom) for pipe in self.pipes]
+
+    def get_state(self) -> GameState:
+        """ Returns a snapshot of the game, including the state of its random generator. """
+        bird = self.bird
+        return GameState(
+            bird=(bird.left, bird.top, bird.vel, bird.angle, bird.flap, bird.alive, bird.image_index),
+            pipes=tuple((pipe.x, pipe.gap_y, pipe.passed, pipe.score_collected) for pipe in self.pipes),
+            front_pipe=self.front_pipe,
+            ground_xs=tuple(self.ground_xs),
+            pipe_timer=self.pipe_timer,
+            score=self.score,
+            elapsed_time=self.elapsed_time,
+            rng_state=self._rng.bit_generator.state,
+            pipe_schedule=self._pipe_schedule,
+            pipe_index=self._pipe_index,
+        )
+
+    def set_state(self, state: GameState) -> None:
+        """ Restores a snapshot returned by `get_state`. """
+        bird = self.bird
+        bird.left, bird.top, bird.vel, bird.angle, bird.flap, bird.alive, bird.image_index = state.bird
+        self.bird_x, self.bird_y = bird.center
+
+        bottom_offset = self._pipe_height - self.constants.PIPE_HEIGHT
+        pipes = []
+        for x, gap_y, passed, score_collected in state.pipes:
+            pipe = PipeState(x, gap_y, gap_y + bottom_offset)
+            pipe.passed = passed
+            pipe.score_collected = score_collected
+            pipes.append(pipe)
+        self.pipes = pipes
+        self.front_pipe = state.front_pipe
+
+        self.ground_xs = list(state.ground_xs)
+        self.pipe_timer = state.pipe_timer
+        self.score = state.score
+        self.elapsed_time = state.elapsed_time
+        self._rng.bit_generator.state = state.rng_state
+        self._pipe_schedule = state.pipe_schedule
+        self._pipe_index = state.pipe_index
+
+    def update_state(self, action: Union[GameLogic.Actions, int], fps) -> bool:
+        """ Given an action taken by the player, updates the game's state.
+
+        Args:
+            action (Union[GameLogic.Actions, int]): The action taken by
+                the player.
+
+        Returns:
+            `True` if the player is alive and `False` otherwise.
+        """
+        bird = self.bird
+
+        # Spawn Ground
+        if len(self.ground_xs) < 2:
+            self.ground_xs.append(self.screen_width)
+
+        if bird.alive:
+            self._move_pipes()
+            self._move_ground()
+        self._update_bird(action)
+        self.bird_x, self.bird_y = bird.center
+
+        for pipe in self.pipes:
+            if pipe.passed and not pipe.score_collected:
+                self.score += 1
+                pipe.score_collected = True
+                break
+
+        # Collision Detection
+        if self.masks is None:
+            if self._collides_pipes() or self._collides_ground():
+                bird.alive = False
+        elif self._collides_pixels():
+            bird.alive = False
+
+        if self.pipe_timer <= 0 and bird.alive:
+            self._add_pipes()
+
+        self.pipe_timer -= 1
+        self._tick(fps)
+
+        return bird.alive
+
+    def _move_pipes(self) -> None:
+        scroll_speed = self.constants.SCROLL_SPEED
+        passed_x = self._bird_start_x - self._pipe_width
+        for pipe in self.pipes:
+            pipe.x -= scroll_speed
+            if pipe.x <= passed_x:
+                pipe.passed = True
+
+        # Pipes are ordered by spawn time, so the ones off the screen are first:
+        pipes = self.pipes
+        while pipes and pipes[0].x <= self._kill_x:
+            del pipes[0]
+            self.front_pipe -= 1
+        if self.front_pipe < 0:
+            self.front_pipe = 0
+
+        min_left = self.bird.left - self._pipe_width
+        while self.front_pipe < len(pipes) and pipes[self.front_pipe].x < min_left:
+            self.front_pipe += 1
+
+    def _move_ground(self) -> None:
+        ground_xs = self.ground_xs
+        scroll_speed = self.constants.SCROLL_SPEED
+        for i in range(len(ground_xs)):
+            ground_xs[i] -= scroll_speed
+        if ground_xs[0] <= self._kill_x:
+            del ground_xs[0]
+
+    def _update_bird(self, action: Union[GameLogic.Actions, int]) -> None:
+        constants = self.constants
+        bird = self.bird
+
+        # Animate Bird
+        if bird.alive:
+            bird.image_index += 1
+        if bird.image_index >= 30:
+            bird.image_index = 0
+
+        # Gravity and Flap
+        bird.vel += constants.BIRD_ACC
+        if bird.vel > constants.BIRD_MAX_VEL_Y:
+            bird.vel = constants.BIRD_MAX_VEL_Y
+        if bird.top < constants.BIRD_MAX_FALL_Y:
+            bird.top += int(bird.vel)
+        if bird.vel == 0:
+            bird.flap = False
+
+        # Rotation of the bird image, applied only when it is drawn:
+        bird.angle = bird.vel * constants.BIRD_MIN_VEL_Y
+
+        # User Input
+        if action == self.Actions.FLAP and not bird.flap and bird.top > 0 and bird.alive:
+            bird.flap = True
+            bird.vel = constants.BIRD_MIN_VEL_Y
+
+    def _collides_pipes(self) -> bool:
+        bird = self.bird
+        bird_left, bird_top = bird.left, bird.top
+        bird_right, bird_bottom = bird_left + bird.width, bird_top + bird.height
+        pipe_width, pipe_height = self._pipe_width, self._pipe_height
+        top_offset = self.constants.PIPE_HEIGHT
+        bottom_offset = self.constants.PIPE_GAP
+
+        for pipe in self.pipes:
+            if bird_left < pipe.x + pipe_width and bird_right > pipe.x:
+                top_y = pipe.gap_y - top_offset
+                if bird_top < top_y + pipe_height and bird_bottom > top_y:
+                    return True
+                bottom_y = pipe.gap_y + bottom_offset
+                if bird_top < bottom_y + pipe_height and bird_bottom > bottom_y:
+                    return True
+        return False
+
+    def _collides_ground(self) -> bool:
+        bird = self.bird
+        if not (bird.top < self.ground_top + self._ground_height
+                and bird.top + bird.height > self.ground_top):
+            return False
+
+        for ground_x in self.ground_xs:
+            if bird.left < ground_x + self._ground_width and bird.left + bird.width > ground_x:
+                return True
+        return False
+
+    def _collides_pixels(self) -> bool:
+        """ Tests the opaque pixels of the drawn bird against the pipes and the ground. """
+        bird = self.bird
+        bird_mask = self.masks["bird"][(bird.image_index // 10, bird.angle)]
+        top_mask, bottom_mask = self.masks["pipe"]
+        bird_left, bird_top = bird.left, bird.top
+        bird_right = bird_left + bird_mask.get_size()[0]
+        top_offset = self.constants.PIPE_HEIGHT
+        bottom_offset = self.constants.PIPE_GAP
+
+        for pipe in self.pipes:
+            if pipe.x < bird_right and pipe.x + self._pipe_width > bird_left:
+                dx = pipe.x - bird_left
+                if bird_mask.overlap(top_mask, (dx, pipe.gap_y - top_offset - bird_top)):
+                    return True
+                if bird_mask.overlap(bottom_mask, (dx, pipe.gap_y + bottom_offset - bird_top)):
+                    return True
+
+        ground_mask = self.masks["ground"]
+        for ground_x in self.ground_xs:
+            if bird_mask.overlap(ground_mask, (ground_x - bird_left, self.ground_top - bird_top)):
+                return True
+        return False
+
+    def _add_pipes(self) -> None:
+        gap_y, self.pipe_timer = self._next_pipe()
+        bottom = gap_y - self.constants.PIPE_HEIGHT + self._pipe_height
+        self.pipes.append(PipeState(self.screen_width + 10, gap_y, bottom))
+
+    def _tick(self, fps) -> None:
+        """ Advances the game clock by one frame according to the clock policy. """
+        if self.clock == self.Clock.REALTIME:
+            self.elapsed_time += self._clock.tick(fps)
+        elif self.clock == self.Clock.FIXED:
+            self.elapsed_time += 1000 / fps
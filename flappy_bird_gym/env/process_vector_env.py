@@ -0,0 +1,245 @@
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing import shared_memory
+from typing import List, Optional, Union
+
+import gymnasium as gym
+import numpy as np
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+def _worker(worker_index: int, env_indices: List[int], env_kwargs: dict, pipe, parent_pipe,
+            shm_names: dict, num_envs: int, ring_size: int, obs_shape, obs_dtype) -> None:
+  """ Runs a slice of the environments in a worker process.
+
+  The observations, rewards and termination flags are written to shared
+  memory; the pipe only carries the commands, the actions and the infos.
+  """
+  parent_pipe.close()
+
+  # Each worker initialises its own pygame. Without a human display there is
+  # nothing to show, so SDL must not look for a video device.
+  if env_kwargs.get("render_mode") != "human":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+  blocks = {name: shared_memory.SharedMemory(name=shm_name) for name, shm_name in shm_names.items()}
+  observations = np.ndarray((ring_size, num_envs) + obs_shape, dtype=obs_dtype, buffer=blocks["observations"].buf)
+  rewards = np.ndarray((num_envs,), dtype=np.float64, buffer=blocks["rewards"].buf)
+  terminateds = np.ndarray((num_envs,), dtype=bool, buffer=blocks["terminateds"].buf)
+  truncateds = np.ndarray((num_envs,), dtype=bool, buffer=blocks["truncateds"].buf)
+
+  envs = [FlappyBirdEnv(copy=False, **env_kwargs) for _ in env_indices]
+  first = env_indices[0]
+
+  try:
+    while True:
+      command, data = pipe.recv()
+
+      if command == "reset":
+        slot, seeds, options = data
+        scores = []
+        for i, env in enumerate(envs):
+          seed = None if seeds is None else seeds[first + i]
+          observation, info = env.reset(seed=seed, options=options)
+          observations[slot, first + i] = observation
+          scores.append(info["score"])
+        pipe.send((True, scores))
+
+      elif command == "step":
+        slot, actions = data
+        scores, finals = [], []
+        for i, env in enumerate(envs):
+          observation, reward, terminated, truncated, info = env.step(actions[i])
+          rewards[first + i] = reward
+          terminateds[first + i] = terminated
+          truncateds[first + i] = truncated
+          scores.append(info["score"])
+          if terminated or truncated:
+            finals.append((first + i, np.array(observation), info))
+            observation, _ = env.reset()
+          observations[slot, first + i] = observation
+        pipe.send((True, (scores, finals)))
+
+      elif command == "close":
+        pipe.send((True, None))
+        break
+
+      else:
+        raise RuntimeError(f"Unknown command {command!r}.")
+  except KeyboardInterrupt:
+    pass
+  except Exception as ex:
+    try:
+      pipe.send((False, (ex, traceback.format_exc(), worker_index)))
+    except Exception:
+      # The exception itself could not be pickled:
+      pipe.send((False, (RuntimeError(f"{type(ex).__name__}: {ex}"), traceback.format_exc(), worker_index)))
+  finally:
+    for env in envs:
+      env.close()
+    del observations, rewards, terminateds, truncateds
+    for block in blocks.values():
+      block.close()
+    pipe.close()
+
+
+class FlappyBirdAsyncVectorEnv(gym.vector.VectorEnv):
+  """ Runs `num_envs` :class:`FlappyBirdEnv` instances in a pool of worker processes.
+
+  The environments are split in contiguous slices, one per worker. Each step
+  sends a single message per worker holding its slice of the actions, and the
+  workers write observations, rewards and termination flags into shared
+  memory, so no observation is ever pickled.
+
+  The observations live in a ring of `ring_size` slots in shared memory and
+  every step writes the next slot. With `copy=False`, `step` and `reset` return
+  a view of that slot, which stays valid for the next `ring_size - 1` steps.
+
+  Finished environments are reset automatically, as in
+  :class:`gymnasium.vector.AsyncVectorEnv`: their last observation is stored
+  in `info["final_observation"]` and their last info in `info["final_info"]`.
+  """
+
+  def __init__(self, num_envs: int, num_workers: Optional[int] = None, ring_size: int = 2,
+               copy: bool = True, context: Optional[str] = "spawn", **env_kwargs) -> None:
+
+    num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+    if ring_size < 1:
+      raise ValueError("The ring of observations needs at least one slot.")
+
+    dummy_env = FlappyBirdEnv(**env_kwargs)
+    super().__init__(num_envs, dummy_env.observation_space, dummy_env.action_space)
+    dummy_env.close()
+
+    self.num_workers = num_workers
+    self.ring_size = ring_size
+    self.copy = copy
+    self._slot = 0
+
+    obs_shape = self.single_observation_space.shape
+    obs_dtype = self.single_observation_space.dtype
+    sizes = {
+      "observations": ring_size * num_envs * int(np.prod(obs_shape)) * obs_dtype.itemsize,
+      "rewards": num_envs * np.dtype(np.float64).itemsize,
+      "terminateds": num_envs,
+      "truncateds": num_envs,
+    }
+    self._blocks = {name: shared_memory.SharedMemory(create=True, size=size) for name, size in sizes.items()}
+    self._observations = np.ndarray((ring_size, num_envs) + obs_shape, dtype=obs_dtype,
+                                    buffer=self._blocks["observations"].buf)
+    self._rewards = np.ndarray((num_envs,), dtype=np.float64, buffer=self._blocks["rewards"].buf)
+    self._terminateds = np.ndarray((num_envs,), dtype=bool, buffer=self._blocks["terminateds"].buf)
+    self._truncateds = np.ndarray((num_envs,), dtype=bool, buffer=self._blocks["truncateds"].buf)
+
+    ctx = mp.get_context(context)
+    shm_names = {name: block.name for name, block in self._blocks.items()}
+    self._slices = [indices.tolist() for indices in np.array_split(np.arange(num_envs), num_workers)]
+    self._pipes, self._processes = [], []
+    for index, env_indices in enumerate(self._slices):
+      parent_pipe, child_pipe = ctx.Pipe()
+      process = ctx.Process(
+        target=_worker,
+        name=f"FlappyBirdWorker-{index}",
+        args=(index, env_indices, env_kwargs, child_pipe, parent_pipe, shm_names,
+              num_envs, ring_size, obs_shape, obs_dtype),
+        daemon=True,
+      )
+      process.start()
+      child_pipe.close()
+      self._pipes.append(parent_pipe)
+      self._processes.append(process)
+
+  def _receive(self):
+    """ Waits for the reply of every worker and returns their results.
+
+    If a worker failed, the replies of the others are still received, so that
+    none is left in a pipe, the pool is closed and the exception raised by
+    the worker is raised again, with its traceback as a note.
+    """
+    results, error = [], None
+    for index, pipe in enumerate(self._pipes):
+      try:
+        success, result = pipe.recv()
+      except (EOFError, ConnectionError):
+        success, result = False, (RuntimeError(f"Worker {index} exited unexpectedly."), None, index)
+      if success:
+        results.append(result)
+      elif error is None:
+        error = result
+
+    if error is not None:
+      exception, worker_traceback, index = error
+      try:
+        self.close()
+      except Exception:
+        # The pool is half closed already, the error of the worker is the one to report:
+        pass
+      if worker_traceback and hasattr(exception, "add_note"):
+        exception.add_note(f"Raised in worker {index}:\n{worker_traceback}")
+      raise exception
+    return results
+
+  def _observation_batch(self):
+    observations = self._observations[self._slot]
+    return observations.copy() if self.copy else observations
+
+  def reset_async(self, seed: Optional[Union[int, List[int]]] = None, options: Optional[dict] = None) -> None:
+    if isinstance(seed, int):
+      seed = [seed + i for i in range(self.num_envs)]
+    self._slot = (self._slot + 1) % self.ring_size
+    for pipe in self._pipes:
+      pipe.send(("reset", (self._slot, seed, options)))
+
+  def reset_wait(self, seed: Optional[Union[int, List[int]]] = None, options: Optional[dict] = None):
+    """ Waits for the workers to reset and returns the batch of initial observations. """
+    scores = [score for result in self._receive() for score in result]
+    return self._observation_batch(), {"score": np.array(scores), "_score": np.ones(self.num_envs, dtype=bool)}
+
+  def step_async(self, actions) -> None:
+    actions = np.asarray(actions).tolist()
+    self._slot = (self._slot + 1) % self.ring_size
+    for pipe, env_indices in zip(self._pipes, self._slices):
+      pipe.send(("step", (self._slot, actions[env_indices[0]:env_indices[-1] + 1])))
+
+  def step_wait(self):
+    """ Waits for the workers to step and returns the batched results. """
+    infos = {"score": np.zeros(self.num_envs, dtype=np.int64), "_score": np.ones(self.num_envs, dtype=bool)}
+    for (scores, finals), env_indices in zip(self._receive(), self._slices):
+      infos["score"][env_indices[0]:env_indices[-1] + 1] = scores
+      for env_index, final_observation, final_info in finals:
+        if "final_observation" not in infos:
+          infos["final_observation"] = np.full(self.num_envs, None, dtype=object)
+          infos["_final_observation"] = np.zeros(self.num_envs, dtype=bool)
+          infos["final_info"] = np.full(self.num_envs, None, dtype=object)
+          infos["_final_info"] = np.zeros(self.num_envs, dtype=bool)
+        infos["final_observation"][env_index] = final_observation
+        infos["_final_observation"][env_index] = True
+        infos["final_info"][env_index] = final_info
+        infos["_final_info"][env_index] = True
+
+    return (self._observation_batch(), self._rewards.copy(),
+            self._terminateds.copy(), self._truncateds.copy(), infos)
+
+  def close_extras(self, **kwargs) -> None:
+    """ Stops the workers and releases the shared memory. """
+    for pipe, process in zip(self._pipes, self._processes):
+      if process.is_alive():
+        try:
+          pipe.send(("close", None))
+          pipe.recv()
+        except (EOFError, ConnectionError):
+          # A worker that raised may exit before it reads the request:
+          pass
+      pipe.close()
+    for process in self._processes:
+      process.join(timeout=1)
+      if process.is_alive():
+        process.terminate()
+
+    del self._observations, self._rewards, self._terminateds, self._truncateds
+    for block in self._blocks.values():
+      block.close()
+      block.unlink()
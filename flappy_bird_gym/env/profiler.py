@@ -0,0 +1,77 @@
+from typing import Callable, Dict, Optional
+
+from flappy_bird_gym import utils
+
+
+class StepProfiler:
+  """ Times the sections of every step of a :class:`FlappyBirdEnv` and counts its events.
+
+  The sections are `update_state` (the physics, collisions and pipe spawning
+  of every game tick), `observation` (building the features, or drawing and
+  scaling the pixels), `reward` and `render` (every call to `render`, counted
+  in the step that follows it). The counters are the steps, game ticks and
+  resets of the environment, the pipe pairs spawned by its games and the
+  sprites, rotations and masks loaded by the process since the profiler was
+  created.
+  """
+
+  SECTIONS = ("update_state", "observation", "reward", "render")
+
+  def __init__(self, callback: Optional[Callable[[Dict[str, float]], None]] = None) -> None:
+    """
+    Args:
+        callback: Called at the end of every step with the seconds spent in
+            each section during that step.
+    """
+    self.callback = callback
+    self.reset()
+
+  def reset(self) -> None:
+    """ Clears the timings and the counters. """
+    self.totals = dict.fromkeys(self.SECTIONS, 0.0)
+    self.counters = {"steps": 0, "ticks": 0, "resets": 0, "pipes_spawned": 0}
+    self._asset_loads = sum(utils.asset_loads().values())
+    self._step = dict.fromkeys(self.SECTIONS, 0.0)
+    self._game = None
+    self._game_pipes = 0
+
+  def add(self, section: str, seconds: float) -> None:
+    """ Adds time to a section of the current step. """
+    self._step[section] += seconds
+
+  def track_game(self, game) -> None:
+    """ Starts counting the pipes of a new game. """
+    self.counters["resets"] += 1
+    self._game = game
+    self._game_pipes = 0
+    self._count_pipes()
+
+  def _count_pipes(self) -> None:
+    pipes = self._game.pipes_spawned
+    self.counters["pipes_spawned"] += pipes - self._game_pipes
+    self._game_pipes = pipes
+
+  def end_step(self, ticks: int) -> Dict[str, float]:
+    """ Closes the current step and returns its timings. """
+    step, self._step = self._step, dict.fromkeys(self.SECTIONS, 0.0)
+    totals = self.totals
+    for section, seconds in step.items():
+      totals[section] += seconds
+    self.counters["steps"] += 1
+    self.counters["ticks"] += ticks
+    if self._game is not None:
+      self._count_pipes()
+
+    if self.callback is not None:
+      self.callback(step)
+    return step
+
+  def summary(self) -> Dict[str, float]:
+    """ Returns the counters, the total seconds of every section and their mean in microseconds per step. """
+    steps = max(self.counters["steps"], 1)
+    summary = dict(self.counters)
+    summary["asset_loads"] = sum(utils.asset_loads().values()) - self._asset_loads
+    for section, seconds in self.totals.items():
+      summary[f"{section}_s"] = seconds
+      summary[f"{section}_us_per_step"] = seconds / steps * 1e6
+    return summary
@@ -1,43 +1,131 @@
+import os
+import sys
+import threading
+from typing import List, Optional
+
 import pygame
 import math
 
 import flappy_bird_gym.utils as utils
 
 
-class GameRenderer:
-  def __init__(self, game) -> None:
-    pygame.init()
+def use_dummy_video_driver_if_headless() -> None:
+  """ Selects SDL's dummy video driver when no display server is available.
+
+  On Linux machines without X11 nor Wayland, e.g. training servers and CI
+  runners, the display can then still be initialised, it just shows nothing.
+  An `SDL_VIDEODRIVER` set by the user is left untouched.
+  """
+  if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
 
+
+class GameRenderer:
+  # The score font is resolved once per process and every score overlay is
+  # rendered once, so drawing the score is a single blit. The font is shared
+  # by the renderers of every thread, so it is only used under a lock:
+  _score_font = None
+  _score_texts = {}
+  _score_lock = threading.Lock()
+
+  def __init__(self, game, frame=None) -> None:
+    """
+    Args:
+        game: The game logic to draw.
+        frame: Optional C-contiguous uint8 array of shape (height, width, 4).
+            When given, the surface of the renderer draws straight into it as
+            RGBX pixels instead of allocating its own pixel memory.
+
+    Drawing on surfaces needs no pygame module to be initialised, so the
+    display and the font modules are only initialised when they are first
+    used, by `make_display` and the score overlay.
+    """
     self._screen_width = game.screen_width
     self._screen_height = game.screen_height
 
     self.display = None
-    self.surface = pygame.Surface((self._screen_width, self._screen_height))
+    if frame is None:
+      self.surface = pygame.Surface((self._screen_width, self._screen_height))
+    else:
+      self.surface = pygame.image.frombuffer(frame, (self._screen_width, self._screen_height), "RGBX")
     self.game = game
     self.images = utils.load_images(not game.pixelated)
-    self.is_drawn = False
+    self.bird_rotations = utils.load_bird_rotations(not game.pixelated)
+
+    # Regions of the display drawn over the background by the previous call to
+    # `draw_display`, or `None` if the display must be drawn in full:
+    self.incremental = False
+    self._dirty_rects = None
 
-  def make_display(self):
+  def make_display(self, incremental: bool = False):
+    """ Creates the display of the renderer.
+
+    Args:
+        incremental (bool): Whether `draw_display` redraws only the regions of
+            the display that changed since its previous call.
+    """
+    use_dummy_video_driver_if_headless()
     pygame.display.init()
     self.display = pygame.display.set_mode((self._screen_width,
                                           self._screen_height))
-    for name, value in self.images.items():
-      if value is None:
-          continue
-
-      if type(value) in (tuple, list):
-          self.images[name] = tuple([img.convert_alpha()
-                                      for img in value])
-      else:
-          self.images[name] = (value.convert() if name == "background"
-                                else value.convert_alpha())
+    self.images = utils.load_images(not self.game.pixelated, convert=True)
+    self.bird_rotations = utils.load_bird_rotations(not self.game.pixelated, convert=True)
+    self.incremental = incremental
+    self._dirty_rects = None
 
       
-  def _draw_score(self) -> None:
-    font = pygame.font.SysFont('Segoe', 26)
-    score_text = font.render('Score: ' + str(math.floor(self.game.score)), True, pygame.Color(255, 255, 255))
-    self.surface.blit(score_text, (20, 20))
-      
+  @classmethod
+  def _score_text(cls, score: int) -> pygame.Surface:
+    """ Returns the rendered score overlay, rendering it on first use. """
+    text = cls._score_texts.get(score)
+    if text is None:
+      with cls._score_lock:
+        if cls._score_font is None:
+          if not pygame.font.get_init():
+            pygame.font.init()
+          cls._score_font = pygame.font.SysFont('Segoe', 26)
+          # The font can't be used once pygame has quit, unlike the rendered texts:
+          pygame.register_quit(cls._drop_score_font)
+        text = cls._score_font.render('Score: ' + str(score), True, pygame.Color(255, 255, 255))
+        cls._score_texts[score] = text
+    return text
+
+  @classmethod
+  def _drop_score_font(cls) -> None:
+    cls._score_font = None
+
+  def _draw_score(self, surface=None) -> pygame.Rect:
+    if surface is None:
+      surface = self.surface
+    return surface.blit(self._score_text(math.floor(self.game.score)), (20, 20))
+
+  def _layers(self):
+    """ Yields the image and position of every entity of the game, bottom layer first. """
+    game = self.game
+    top_pipe_image, bottom_pipe_image = self.images['pipe']
+    ground_image = self.images['ground']
+
+    if game.headless:
+      for pipe in game.pipes:
+        yield top_pipe_image, (pipe.x, pipe.gap_y - game.constants.PIPE_HEIGHT)
+        yield bottom_pipe_image, (pipe.x, pipe.gap_y + game.constants.PIPE_GAP)
+      for x in game.ground_xs:
+        yield ground_image, (x, game.ground_top)
+      bird = game.bird
+      yield self.bird_rotations[(bird.image_index // 10, bird.angle)], (bird.left, bird.top)
+    else:
+      for pipe in game.pipes:
+        yield top_pipe_image, pipe.rect
+        yield bottom_pipe_image, pipe.partner.rect
+      for ground in game.grounds:
+        yield ground_image, ground.rect
+      bird = game.bird.sprite
+      yield self.bird_rotations[(bird.image_index // 10, bird.angle)], bird.rect
+
+  def _draw_entities(self) -> None:
+    """ Draws the entities of the game the same way their sprite groups would, in a single `blits` call. """
+    self.surface.blits(self._layers(), doreturn=False)
+
   def draw_surface(self, show_score: bool = True):
     if self.game is None:
       raise ValueError("A game logic must be assigned to the renderer!")
@@ -45,28 +133,52 @@ class GameRenderer:
     # Background
     self.surface.blit(self.images['background'], (0, 0))
 
-    # Pipes
-    self.game.pipe_group.draw(self.surface)
-
-    # Ground
-    self.game.ground_group.draw(self.surface)
-
-    # Bird
-    self.game.bird.draw(self.surface)
+    # Pipes, ground and bird
+    self._draw_entities()
 
     if show_score and not self.game.pixelated:
         self._draw_score()
-    
-    self.is_drawn = True
 
 
-  def update_display(self) -> None:
+  def draw_display(self, show_score: bool = True) -> List[pygame.Rect]:
+      """ Draws the game straight onto the display and returns the changed regions.
+
+      The first call draws the whole display. In incremental mode, the next
+      ones only restore the background under the entities drawn by the
+      previous call and draw the entities again, so the regions that must be
+      sent to the screen are the ones of the previous and of the current
+      entities. Without the incremental mode, the whole display is redrawn.
+      """
+      display = self.display
+      background = self.images['background']
+
+      previous = self._dirty_rects
+      if previous is None or not self.incremental:
+        display.blit(background, (0, 0))
+        previous = [display.get_rect()]
+      else:
+        for rect in previous:
+          display.blit(background, rect, rect)
+
+      rects = display.blits(self._layers())
+      if show_score and not self.game.pixelated:
+        rects.append(self._draw_score(display))
+
+      self._dirty_rects = rects
+      return previous + rects
+
+  def update_display(self, rects: Optional[List[pygame.Rect]] = None) -> None:
       """ Updates the display with the current surface of the renderer.
 
       A call to this method is usually preceded by a call to
       :meth:`.draw_surface()`. This method simply updates the display by
       showing the current state of the renderer's surface on it, it doesn't
       make any change to the surface.
+
+      Args:
+          rects (Optional[List[pygame.Rect]]): The regions returned by
+              :meth:`.draw_display()`. When given, the display already holds
+              the new frame and only these regions are sent to the screen.
       """
       if self.display is None:
           raise RuntimeError(
@@ -75,5 +187,9 @@ class GameRenderer:
               "call the `make_display()` method."
           )
 
+      if rects is not None:
+          pygame.display.update(rects)
+          return
+
       self.display.blit(self.surface, (0,0))
       pygame.display.update()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+
+import gymnasium as gym
+import numpy as np
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+class FlappyBirdThreadVectorEnv(gym.vector.VectorEnv):
+  """ Runs `num_envs` :class:`FlappyBirdEnv` instances on a pool of threads.
+
+  The environments are split in contiguous slices, one per thread, and every
+  thread writes the observations, rewards and termination flags of its slice
+  straight into the batch arrays, so nothing is copied between processes.
+  The threads only overlap where the GIL is released, e.g. in the blits of
+  pixel observations, or everywhere on a free-threaded CPython build. No
+  pygame state is shared by the environments apart from the read-only
+  sprites, so they can be stepped concurrently.
+
+  With `copy=False`, `step` and `reset` return the batch arrays themselves,
+  which are only valid until the next call to `step_async` or `reset_async`.
+
+  Finished environments are reset automatically, as in
+  :class:`gymnasium.vector.AsyncVectorEnv`: their last observation is stored
+  in `info["final_observation"]` and their last info in `info["final_info"]`.
+  """
+
+  def __init__(self, num_envs: int, num_threads: Optional[int] = None, copy: bool = True,
+               **env_kwargs) -> None:
+
+    num_threads = min(num_threads or os.cpu_count() or 1, num_envs)
+    self.envs = [FlappyBirdEnv(copy=False, **env_kwargs) for _ in range(num_envs)]
+    super().__init__(num_envs, self.envs[0].observation_space, self.envs[0].action_space)
+
+    self.num_threads = num_threads
+    self.copy = copy
+
+    self._observations = np.zeros((num_envs,) + self.single_observation_space.shape,
+                                  dtype=self.single_observation_space.dtype)
+    self._rewards = np.zeros(num_envs, dtype=np.float64)
+    self._terminateds = np.zeros(num_envs, dtype=bool)
+    self._truncateds = np.zeros(num_envs, dtype=bool)
+    self._scores = np.zeros(num_envs, dtype=np.int64)
+
+    self._slices = [(indices[0], indices[-1] + 1)
+                    for indices in np.array_split(np.arange(num_envs), num_threads)]
+    self._executor = ThreadPoolExecutor(num_threads, thread_name_prefix="FlappyBirdThread")
+    self._futures = []
+
+  def _reset_slice(self, start: int, stop: int, seeds: Optional[List[int]], options: Optional[dict]) -> list:
+    for i in range(start, stop):
+      observation, info = self.envs[i].reset(seed=None if seeds is None else seeds[i], options=options)
+      self._observations[i] = observation
+      self._scores[i] = info["score"]
+    return []
+
+  def _step_slice(self, start: int, stop: int, actions: list) -> list:
+    """ Steps a slice of the environments and returns the final observations and infos of its finished episodes. """
+    observations, rewards = self._observations, self._rewards
+    terminateds, truncateds, scores = self._terminateds, self._truncateds, self._scores
+    finals = []
+    for i in range(start, stop):
+      env = self.envs[i]
+      observation, rewards[i], terminated, truncated, info = env.step(actions[i])
+      terminateds[i] = terminated
+      truncateds[i] = truncated
+      scores[i] = info["score"]
+      if terminated or truncated:
+        finals.append((i, np.array(observation), info))
+        observation, _ = env.reset()
+      observations[i] = observation
+    return finals
+
+  def _wait(self) -> list:
+    futures, self._futures = self._futures, []
+    return [final for future in futures for final in future.result()]
+
+  def _batch(self, array: np.ndarray) -> np.ndarray:
+    return array.copy() if self.copy else array
+
+  def reset_async(self, seed: Optional[Union[int, List[int]]] = None, options: Optional[dict] = None) -> None:
+    if isinstance(seed, int):
+      seed = [seed + i for i in range(self.num_envs)]
+    self._futures = [self._executor.submit(self._reset_slice, start, stop, seed, options)
+                     for start, stop in self._slices]
+
+  def reset_wait(self, seed: Optional[Union[int, List[int]]] = None, options: Optional[dict] = None):
+    """ Waits for the threads to reset and returns the batch of initial observations. """
+    self._wait()
+    return self._batch(self._observations), {"score": self._scores.copy(), "_score": np.ones(self.num_envs, dtype=bool)}
+
+  def step_async(self, actions) -> None:
+    actions = np.asarray(actions).tolist()
+    self._futures = [self._executor.submit(self._step_slice, start, stop, actions)
+                     for start, stop in self._slices]
+
+  def step_wait(self):
+    """ Waits for the threads to step and returns the batched results. """
+    finals = self._wait()
+    infos = {"score": self._scores.copy(), "_score": np.ones(self.num_envs, dtype=bool)}
+    for env_index, final_observation, final_info in finals:
+      if "final_observation" not in infos:
+        infos["final_observation"] = np.full(self.num_envs, None, dtype=object)
+        infos["_final_observation"] = np.zeros(self.num_envs, dtype=bool)
+        infos["final_info"] = np.full(self.num_envs, None, dtype=object)
+        infos["_final_info"] = np.zeros(self.num_envs, dtype=bool)
+      infos["final_observation"][env_index] = final_observation
+      infos["_final_observation"][env_index] = True
+      infos["final_info"][env_index] = final_info
+      infos["_final_info"][env_index] = True
+
+    return (self._batch(self._observations), self._rewards.copy(),
+            self._terminateds.copy(), self._truncateds.copy(), infos)
+
+  def close_extras(self, **kwargs) -> None:
+    """ Stops the threads and closes the environments. """
+    for future in self._futures:
+      future.cancel()
+    self._executor.shutdown(wait=True)
+    for env in self.envs:
+      env.close()
@@ -0,0 +1,364 @@
+""" Compact binary recordings of Flappy Bird episodes.
+
+Episodes are deterministic given the seed of `reset` and the actions, so a
+recording only stores those, one bit per action, plus optional per-step
+rewards and feature vectors. Observations and frames are rebuilt on demand
+by replaying the actions through the recorded game.
+
+A recording is a single little-endian file made of 64-byte aligned sections
+that are memory-mapped on load:
+
+* a header (magic, version, flags, counts and the length of the config),
+* the config, a JSON object with the id and the kwargs of the environment,
+* the episode table, one `EPISODE_DTYPE` record per episode,
+* the actions of every episode, back to back, packed in bits,
+* optionally, the float32 rewards of every step,
+* optionally, the float32 feature vectors of every step.
+"""
+import json
+import struct
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import flappy_bird_gym
+
+
+MAGIC = b"FBRC"
+VERSION = 1
+
+HAS_REWARDS = 1
+HAS_FEATURES = 2
+
+# magic, version, flags, number of episodes, number of steps, size of a
+# feature vector and length of the config:
+_HEADER = struct.Struct("<4sHHQQII")
+_ALIGNMENT = 64
+
+# The attributes of an environment that change the game it simulates, so a
+# recording can only be replayed by an environment that agrees on all of them:
+SIMULATION_ATTRIBUTES = ("obs_type", "_screen_size", "collision", "frameskip")
+
+EPISODE_DTYPE = np.dtype([
+    ("seed", "<u8"),
+    ("start", "<u8"),
+    ("length", "<u4"),
+    ("score", "<u4"),
+])
+
+
+class ReplayDiverged(RuntimeError):
+    """ Raised when a replayed episode ends before its recorded actions do. """
+
+
+def _simulation(env) -> tuple:
+    game_env = env.unwrapped
+    return tuple(getattr(game_env, name) for name in SIMULATION_ATTRIBUTES)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _layout(num_episodes: int, num_steps: int, num_features: int, config_size: int, flags: int) -> Dict[str, int]:
+    """ Returns the offset of every section of a recording. """
+    offsets = {"config": _HEADER.size}
+    offsets["episodes"] = _aligned(offsets["config"] + config_size)
+    offsets["actions"] = _aligned(offsets["episodes"] + num_episodes * EPISODE_DTYPE.itemsize)
+    end = _aligned(offsets["actions"] + (num_steps + 7) // 8)
+    if flags & HAS_REWARDS:
+        offsets["rewards"] = end
+        end = _aligned(end + num_steps * 4)
+    if flags & HAS_FEATURES:
+        offsets["features"] = end
+        end = _aligned(end + num_steps * num_features * 4)
+    offsets["end"] = end
+    return offsets
+
+
+def write_recording(path: str, env_id: str, env_kwargs: dict, seeds: List[int],
+                    actions: List[np.ndarray], rewards: Optional[List[np.ndarray]] = None,
+                    features: Optional[List[np.ndarray]] = None,
+                    scores: Optional[List[int]] = None) -> None:
+    """ Writes episodes to a recording.
+
+    Args:
+        path (str): The path of the recording.
+        env_id (str): The id of the registered environment.
+        env_kwargs (dict): The JSON-serializable kwargs of the environment.
+        seeds (List[int]): The seed passed to `reset` for every episode.
+        actions (List[np.ndarray]): The actions of every episode.
+        rewards (Optional[List[np.ndarray]]): The rewards of every episode.
+        features (Optional[List[np.ndarray]]): The (steps, features) feature
+            vectors of every episode.
+        scores (Optional[List[int]]): The final score of every episode.
+    """
+    lengths = [len(episode_actions) for episode_actions in actions]
+    num_steps = sum(lengths)
+    num_features = features[0].shape[1] if features else 0
+    flags = (HAS_REWARDS if rewards is not None else 0) | (HAS_FEATURES if features is not None else 0)
+    config = json.dumps({"env_id": env_id, "kwargs": env_kwargs}).encode()
+
+    episodes = np.zeros(len(seeds), dtype=EPISODE_DTYPE)
+    episodes["seed"] = seeds
+    episodes["start"] = np.cumsum([0] + lengths[:-1])
+    episodes["length"] = lengths
+    episodes["score"] = scores if scores is not None else 0
+
+    offsets = _layout(len(seeds), num_steps, num_features, len(config), flags)
+    sections = [
+        ("config", config),
+        ("episodes", episodes.tobytes()),
+        ("actions", np.packbits(np.concatenate(actions).astype(bool)).tobytes() if num_steps else b""),
+    ]
+    if rewards is not None:
+        sections.append(("rewards", np.concatenate(rewards).astype("<f4").tobytes()))
+    if features is not None:
+        sections.append(("features", np.concatenate(features).astype("<f4").tobytes()))
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, flags, len(seeds), num_steps, num_features, len(config)))
+        for name, data in sections:
+            file.seek(offsets[name])
+            file.write(data)
+        file.truncate(offsets["end"])
+
+
+class Recording:
+    """ A recording of episodes, memory-mapped from a file written by :func:`write_recording`.
+
+    Loading a recording only reads its header and config, the arrays are
+    paged in from the file as they are accessed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            magic, version, self.flags, num_episodes, self.num_steps, num_features, config_size = \
+                _HEADER.unpack(file.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a Flappy Bird recording.")
+            if version != VERSION:
+                raise ValueError(f"Unsupported recording version {version}, expected {VERSION}.")
+            config = json.loads(file.read(config_size))
+
+        self.env_id = config["env_id"]
+        self._simulation = None
+        # JSON turns the tuples of the kwargs, e.g. `screen_size`, into lists:
+        self.env_kwargs = {key: tuple(value) if isinstance(value, list) else value
+                           for key, value in config["kwargs"].items()}
+
+        offsets = _layout(num_episodes, self.num_steps, num_features, config_size, self.flags)
+        self.episodes = self._map(EPISODE_DTYPE, (num_episodes,), offsets["episodes"])
+        self._actions = self._map(np.uint8, ((self.num_steps + 7) // 8,), offsets["actions"])
+        self.rewards = None
+        if self.flags & HAS_REWARDS:
+            self.rewards = self._map("<f4", (self.num_steps,), offsets["rewards"])
+        self.features = None
+        if self.flags & HAS_FEATURES:
+            self.features = self._map("<f4", (self.num_steps, num_features), offsets["features"])
+
+    def _map(self, dtype, shape: Tuple[int, ...], offset: int) -> np.ndarray:
+        if not np.prod(shape):
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    def __len__(self) -> int:
+        return len(self.episodes)
+
+    def _steps(self, index: int) -> slice:
+        episode = self.episodes[index]
+        start = int(episode["start"])
+        return slice(start, start + int(episode["length"]))
+
+    def actions(self, index: int) -> np.ndarray:
+        """ Returns the actions of an episode. """
+        steps = self._steps(index)
+        first_byte = steps.start // 8
+        bits = np.unpackbits(self._actions[first_byte:(steps.stop + 7) // 8])
+        return bits[steps.start - first_byte * 8:steps.stop - first_byte * 8].astype(np.int64)
+
+    def episode_rewards(self, index: int) -> Optional[np.ndarray]:
+        """ Returns the recorded rewards of an episode, if any. """
+        return None if self.rewards is None else self.rewards[self._steps(index)]
+
+    def episode_features(self, index: int) -> Optional[np.ndarray]:
+        """ Returns the recorded feature vectors of an episode, if any. """
+        return None if self.features is None else self.features[self._steps(index)]
+
+    def _check_simulation(self, env) -> None:
+        """ Raises a `ValueError` if `env` doesn't simulate the recorded game. """
+        if self._simulation is None:
+            recorded = flappy_bird_gym.make(self.env_id, **self.env_kwargs)
+            self._simulation = _simulation(recorded)
+            recorded.close()
+        if _simulation(env) != self._simulation:
+            raise ValueError(
+                "The environment doesn't simulate the recorded game: "
+                f"{dict(zip(SIMULATION_ATTRIBUTES, _simulation(env)))} instead of "
+                f"{dict(zip(SIMULATION_ATTRIBUTES, self._simulation))}. "
+                "Use `frames` to get the pixels of a recorded game.")
+
+    def make_env(self, **kwargs):
+        """ Creates the environment of the recording, with its kwargs overridden by `kwargs`.
+
+        Only kwargs that keep the game the same can be overridden, e.g.
+        `render_mode`, `clock` or `backend`. The observation type, screen size,
+        collision mode and frameskip define the game itself, so changing them
+        raises a `ValueError`.
+        """
+        env = flappy_bird_gym.make(self.env_id, **{**self.env_kwargs, **kwargs})
+        try:
+            self._check_simulation(env)
+        except ValueError:
+            env.close()
+            raise
+        return env
+
+    def replay(self, index: int, env=None, **kwargs) -> Iterator[Tuple[np.ndarray, float, bool, bool, dict]]:
+        """ Replays an episode and yields the result of every step.
+
+        Args:
+            index (int): The index of the episode.
+            env: The environment to replay the episode in, which must simulate
+                the recorded game. By default, the environment of the
+                recording is created with `kwargs` overriding its kwargs, see
+                :meth:`make_env`, e.g. `render_mode="human"` to watch it.
+
+        Raises:
+            ReplayDiverged: If the episode ends before its last recorded action.
+        """
+        own_env = env is None
+        if own_env:
+            env = self.make_env(**kwargs)
+        else:
+            self._check_simulation(env)
+        try:
+            env.reset(seed=int(self.episodes[index]["seed"]))
+            actions = self.actions(index).tolist()
+            for step, action in enumerate(actions):
+                result = env.step(action)
+                yield result
+                if (result[2] or result[3]) and step + 1 < len(actions):
+                    raise ReplayDiverged(f"Episode {index} ended after {step + 1} of its {len(actions)} steps.")
+        finally:
+            if own_env:
+                env.close()
+
+    def frames(self, index: int, size: Optional[Tuple[int, int]] = None) -> Iterator[np.ndarray]:
+        """ Replays an episode and yields the (height, width, 3) frame drawn after every step.
+
+        The frames are drawn at the recorded screen size and, with `size`,
+        smoothly scaled down, e.g. to (64, 64) for pixel inputs. They show
+        the recorded game, which is not the game of `FlappyBird-pixels-v1`:
+        that environment simulates a 64x64 game with its own physics and pipe
+        timers, which the recorded actions wouldn't play the same way.
+
+        Args:
+            index (int): The index of the episode.
+            size (Optional[Tuple[int, int]]): The (width, height) of the frames.
+        """
+        import pygame
+
+        env = self.make_env(render_mode="rgb_array", copy=False)
+        try:
+            for _ in self.replay(index, env):
+                frame = env.render()
+                if size is not None:
+                    height, width = frame.shape[:2]
+                    surface = pygame.image.frombuffer(frame, (width, height), "RGB")
+                    frame = pygame.surfarray.pixels3d(pygame.transform.smoothscale(surface, size))
+                    frame = np.ascontiguousarray(frame.transpose(1, 0, 2))
+                yield frame.copy() if size is None else frame
+        finally:
+            env.close()
+
+
+def record(path: str, episodes: int, seed: int = 0, policy: Optional[Callable] = None,
+           env_id: str = "FlappyBird-features-v1", store_rewards: bool = True,
+           store_features: bool = False, max_steps: int = 100_000, **env_kwargs) -> Recording:
+    """ Plays episodes and writes them to a recording.
+
+    Args:
+        path (str): The path of the recording.
+        episodes (int): The number of episodes to play.
+        seed (int): The seed of the first episode, the next ones use the
+            following integers.
+        policy (Optional[Callable]): Maps an observation to an action. By
+            default, actions are sampled from the action space.
+        env_id (str): The id of the registered environment.
+        store_rewards (bool): Whether to store the reward of every step.
+        store_features (bool): Whether to store the feature vector of every
+            step. Requires a features environment.
+        max_steps (int): The maximum number of steps of an episode.
+        env_kwargs: The JSON-serializable kwargs of the environment.
+
+    Returns:
+        The written recording.
+    """
+    env = flappy_bird_gym.make(env_id, **env_kwargs)
+    if store_features and env.unwrapped.obs_type != "features":
+        raise ValueError("Only features environments can store feature vectors.")
+    env.action_space.seed(seed)
+
+    seeds, actions, rewards, features, scores = [], [], [], [], []
+    for episode_seed in range(seed, seed + episodes):
+        observation, info = env.reset(seed=episode_seed)
+        episode_actions, episode_rewards, episode_features = [], [], []
+        for _ in range(max_steps):
+            action = int(policy(observation) if policy is not None else env.action_space.sample())
+            observation, reward, terminated, truncated, info = env.step(action)
+            episode_actions.append(action)
+            episode_rewards.append(reward)
+            if store_features:
+                # With `copy=False` the observation is the buffer of the env,
+                # overwritten by the next step:
+                episode_features.append(np.array(observation))
+            if terminated or truncated:
+                break
+
+        seeds.append(episode_seed)
+        actions.append(np.array(episode_actions, dtype=np.uint8))
+        rewards.append(np.array(episode_rewards, dtype=np.float32))
+        if store_features:
+            features.append(np.array(episode_features, dtype=np.float32).reshape(len(episode_actions), -1))
+        scores.append(info["score"])
+    env.close()
+
+    write_recording(path, env_id, env_kwargs, seeds, actions,
+                    rewards if store_rewards else None,
+                    features if store_features else None, scores)
+    return Recording(path)
+
+
+def verify(path: str) -> List[int]:
+    """ Replays every episode of a recording and returns the indices of those that diverge.
+
+    An episode diverges when its replay ends at a different step or with a
+    different score, or when a recorded reward or feature vector differs.
+    """
+    recording = Recording(path)
+    env = recording.make_env()
+    diverged = []
+    for index in range(len(recording)):
+        rewards = recording.episode_rewards(index)
+        features = recording.episode_features(index)
+        length = int(recording.episodes[index]["length"])
+
+        ok, steps, info = True, 0, {"score": 0}
+        try:
+            for step, (observation, reward, terminated, truncated, info) in enumerate(recording.replay(index, env)):
+                steps += 1
+                if rewards is not None and np.float32(reward) != rewards[step]:
+                    ok = False
+                if features is not None and not np.array_equal(np.asarray(observation, dtype=np.float32), features[step]):
+                    ok = False
+                if not ok:
+                    break
+        except ReplayDiverged:
+            ok = False
+
+        if not ok or steps != length or info["score"] != recording.episodes[index]["score"]:
+            diverged.append(index)
+    env.close()
+    return diverged
@@ -0,0 +1,507 @@
+""" A local server hosting a pool of Flappy Bird environments for remote actors.
+
+The server runs `num_envs` instances of :class:`FlappyBirdEnv` in one process
+and serves them over a Unix socket (an address given as a path) or a TCP
+socket (a `(host, port)` tuple), so that many actors, in other processes or
+other languages, can drive games without importing pygame or loading the
+sprites themselves. :class:`EnvClient` and :class:`AsyncEnvClient` are the
+synchronous and asyncio clients; neither imports pygame.
+
+Every message, in both directions, is a 12-byte little-endian header followed
+by a payload. The header holds the opcode (u8), the status (u8, `OK` or
+`ERROR`), two bytes of padding, the number of environments of a batch (u32)
+and the size of the payload in bytes (u32). The requests are:
+
+* `HELLO`, with an empty payload. The reply is a JSON object with the
+  `num_envs`, `observation_shape`, `observation_dtype` (a NumPy type string)
+  and `env_kwargs` of the server.
+* `RESET`, with `count` `RESET_DTYPE` records, the index of an environment
+  and the seed of its reset, or -1 for none.
+* `STEP`, with `count` `STEP_DTYPE` records, the index of an environment and
+  its action.
+
+The reply of `RESET` and `STEP` holds `count` `RESULT_DTYPE` records, in the
+order of the request, followed by the `count` raw observations in C order.
+Episodes are not reset automatically: an actor resets the environments whose
+episode ended. An `ERROR` reply has the same opcode as its request and a UTF-8
+message as payload. Requests of one connection are answered in order;
+actors sharing a server should drive disjoint environments.
+"""
+import asyncio
+import json
+import os
+import socket
+import struct
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+Address = Union[str, Tuple[str, int]]
+
+HELLO, RESET, STEP = 0, 1, 2
+OK, ERROR = 0, 1
+
+# opcode, status, number of environments and size of the payload:
+_HEADER = struct.Struct("<BBxxII")
+
+RESET_DTYPE = np.dtype([("env", "<u4"), ("seed", "<i8")])
+STEP_DTYPE = np.dtype([("env", "<u4"), ("action", "u1")])
+RESULT_DTYPE = np.dtype([
+    ("reward", "<f8"),
+    ("terminated", "u1"),
+    ("truncated", "u1"),
+    ("score", "<u4"),
+])
+
+
+def parse_address(text: str) -> Address:
+    """ Parses `host:port` as a TCP address and anything else as the path of a Unix socket. """
+    host, _, port = text.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return text
+
+
+def _message(opcode: int, payload: bytes = b"", count: int = 0, status: int = OK) -> bytes:
+    return _HEADER.pack(opcode, status, count, len(payload)) + payload
+
+
+class EnvServer:
+    """ Serves a pool of :class:`FlappyBirdEnv` instances over a socket.
+
+    The environments are stepped on the event loop, one request at a time,
+    so the server uses a single core however many actors it serves; batched
+    requests spread the cost of a round trip over many environments.
+    """
+
+    def __init__(self, num_envs: int, address: Address, **env_kwargs) -> None:
+        """
+        Args:
+            num_envs (int): The number of environments of the pool.
+            address (Address): The path of a Unix socket, or a (host, port)
+                tuple. Port 0 picks a free port, see `address` once started.
+            env_kwargs: The JSON-serializable kwargs of the environments.
+        """
+        # Only the server imports pygame, never its clients:
+        from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+        self.address = address
+        self.env_kwargs = env_kwargs
+        self.envs = [FlappyBirdEnv(copy=False, **env_kwargs) for _ in range(num_envs)]
+
+        space = self.envs[0].observation_space
+        self._observations = np.zeros((num_envs,) + space.shape, dtype=space.dtype)
+        self._results = np.zeros(num_envs, dtype=RESULT_DTYPE)
+        self._hello = json.dumps({
+            "num_envs": num_envs,
+            "observation_shape": list(space.shape),
+            "observation_dtype": space.dtype.str,
+            "env_kwargs": env_kwargs,
+        }).encode()
+        self._server = None
+
+    async def start(self) -> None:
+        """ Starts listening for actors. """
+        if isinstance(self.address, str):
+            self._server = await asyncio.start_unix_server(self._serve_actor, self.address)
+        else:
+            host, port = self.address
+            self._server = await asyncio.start_server(self._serve_actor, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        """ Serves actors until the task is cancelled, starting the server if needed. """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """ Stops listening, removes the Unix socket and closes the environments. """
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+        for env in self.envs:
+            env.close()
+
+    async def _serve_actor(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                opcode, _, count, size = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                payload = await reader.readexactly(size) if size else b""
+                try:
+                    reply = self._reply(opcode, count, payload)
+                except Exception as ex:
+                    # The client raises the error, the connection stays usable:
+                    reply = _message(opcode, f"{type(ex).__name__}: {ex}".encode(), status=ERROR)
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _reply(self, opcode: int, count: int, payload: bytes) -> bytes:
+        """ Runs a request on the environments and returns the reply. """
+        if opcode == HELLO:
+            return _message(HELLO, self._hello)
+
+        observations = self._observations
+        results = self._results
+        rewards, terminateds = results["reward"], results["terminated"]
+        truncateds, scores = results["truncated"], results["score"]
+        if opcode == RESET:
+            requests = np.frombuffer(payload, dtype=RESET_DTYPE, count=count)
+            for i, (index, seed) in enumerate(requests.tolist()):
+                observations[i], info = self.envs[index].reset(seed=None if seed < 0 else seed)
+                rewards[i] = terminateds[i] = truncateds[i] = 0
+                scores[i] = info["score"]
+        elif opcode == STEP:
+            requests = np.frombuffer(payload, dtype=STEP_DTYPE, count=count)
+            for i, (index, action) in enumerate(requests.tolist()):
+                observations[i], rewards[i], terminateds[i], truncateds[i], info = self.envs[index].step(action)
+                scores[i] = info["score"]
+        else:
+            raise ValueError(f"Unknown opcode {opcode}.")
+
+        return _message(opcode, results[:count].tobytes() + observations[:count].tobytes(), count)
+
+
+def serve(address: Address, num_envs: int = 8, **env_kwargs) -> None:
+    """ Runs an :class:`EnvServer` until the process is interrupted. """
+    server = EnvServer(num_envs, address, **env_kwargs)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+class _Client:
+    """ Encodes the requests and decodes the replies of both clients. """
+
+    def _configure(self, payload: bytes) -> None:
+        config = json.loads(payload)
+        self.num_envs = config["num_envs"]
+        self.observation_shape = tuple(config["observation_shape"])
+        self.observation_dtype = np.dtype(config["observation_dtype"])
+        self.env_kwargs = config["env_kwargs"]
+        self._observation_size = int(np.prod(self.observation_shape)) * self.observation_dtype.itemsize
+
+    def _envs(self, envs: Optional[Sequence[int]]) -> np.ndarray:
+        return np.arange(self.num_envs) if envs is None else np.asarray(envs)
+
+    def _reset_request(self, seeds: Union[int, Sequence[int], None], envs: Optional[Sequence[int]]) -> bytes:
+        envs = self._envs(envs)
+        requests = np.empty(len(envs), dtype=RESET_DTYPE)
+        requests["env"] = envs
+        if seeds is None:
+            requests["seed"] = -1
+        elif isinstance(seeds, int):
+            requests["seed"] = seeds + np.arange(len(envs))
+        else:
+            requests["seed"] = [-1 if seed is None else seed for seed in seeds]
+        return _message(RESET, requests.tobytes(), len(envs))
+
+    def _step_request(self, actions: Sequence[int], envs: Optional[Sequence[int]]) -> bytes:
+        envs = self._envs(envs)
+        if len(actions) != len(envs):
+            raise ValueError(f"Got {len(actions)} actions for {len(envs)} environments.")
+        requests = np.empty(len(envs), dtype=STEP_DTYPE)
+        requests["env"] = envs
+        requests["action"] = actions
+        return _message(STEP, requests.tobytes(), len(envs))
+
+    def _batch(self, count: int, payload: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """ Returns the observations and the result records of a reply. """
+        results = np.frombuffer(payload, dtype=RESULT_DTYPE, count=count)
+        observations = np.frombuffer(payload, dtype=self.observation_dtype,
+                                     count=count * self._observation_size // self.observation_dtype.itemsize,
+                                     offset=results.nbytes)
+        return observations.reshape((count,) + self.observation_shape), results
+
+    @staticmethod
+    def _check(status: int, payload: bytes) -> None:
+        if status == ERROR:
+            raise RuntimeError(f"The environment server failed: {payload.decode()}")
+
+    def _step_result(self, count: int, payload: bytes):
+        observations, results = self._batch(count, payload)
+        return (observations, results["reward"], results["terminated"].astype(bool),
+                results["truncated"].astype(bool), {"score": results["score"]})
+
+    def _reset_result(self, count: int, payload: bytes):
+        observations, results = self._batch(count, payload)
+        return observations, {"score": results["score"]}
+
+
+def _connect(address: Address) -> socket.socket:
+    if not isinstance(address, str):
+        sock = socket.create_connection(address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class EnvClient(_Client):
+    """ A blocking client of an :class:`EnvServer`.
+
+    `reset` and `step` drive a batch of environments in one round trip and
+    return arrays, like a vector environment; `env(index)` returns a
+    single-environment view with the `reset` and `step` of a gymnasium env.
+    """
+
+    def __init__(self, address: Address, timeout: float = 10.0) -> None:
+        """
+        Args:
+            address (Address): The address of the server.
+            timeout (float): How long to wait for the server to start
+                listening, in seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self._socket = _connect(address)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        self._header = bytearray(_HEADER.size)
+        self._configure(self._request(_message(HELLO))[1])
+
+    def _receive_into(self, buffer) -> None:
+        view = memoryview(buffer)
+        while view:
+            received = self._socket.recv_into(view)
+            if not received:
+                raise ConnectionError("The environment server closed the connection.")
+            view = view[received:]
+
+    def _request(self, request: bytes) -> Tuple[int, bytes]:
+        self._socket.sendall(request)
+        self._receive_into(self._header)
+        _, status, count, size = _HEADER.unpack(self._header)
+        payload = bytearray(size)
+        self._receive_into(payload)
+        self._check(status, payload)
+        return count, payload
+
+    def reset(self, seed: Union[int, Sequence[int], None] = None, envs: Optional[Sequence[int]] = None):
+        """ Resets environments, all of them by default, and returns their observations and scores.
+
+        Args:
+            seed: None, a seed per environment, or an int seeding the
+                environments with `seed`, `seed + 1`, ...
+            envs: The indices of the environments.
+        """
+        return self._reset_result(*self._request(self._reset_request(seed, envs)))
+
+    def step(self, actions: Sequence[int], envs: Optional[Sequence[int]] = None):
+        """ Steps environments, all of them by default.
+
+        Returns:
+            The observations, rewards, terminated and truncated flags of the
+            environments, and their scores in `infos["score"]`.
+        """
+        return self._step_result(*self._request(self._step_request(actions, envs)))
+
+    def env(self, index: int) -> "RemoteEnv":
+        """ Returns a view of a single environment of the server. """
+        return RemoteEnv(self, index)
+
+    def close(self) -> None:
+        self._socket.close()
+
+    def __enter__(self) -> "EnvClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class AsyncEnvClient(_Client):
+    """ An asyncio client of an :class:`EnvServer`, created with :meth:`connect`.
+
+    Requests of concurrent tasks are sent one at a time over the connection.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, address: Address) -> "AsyncEnvClient":
+        """ Connects to a server and fetches its configuration. """
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(address)
+        else:
+            reader, writer = await asyncio.open_connection(*address)
+        client = cls(reader, writer)
+        client._configure((await client._request(_message(HELLO)))[1])
+        return client
+
+    async def _request(self, request: bytes) -> Tuple[int, bytes]:
+        async with self._lock:
+            self._writer.write(request)
+            await self._writer.drain()
+            _, status, count, size = _HEADER.unpack(await self._reader.readexactly(_HEADER.size))
+            payload = await self._reader.readexactly(size) if size else b""
+        self._check(status, payload)
+        return count, payload
+
+    async def reset(self, seed: Union[int, Sequence[int], None] = None, envs: Optional[Sequence[int]] = None):
+        """ Resets environments, see :meth:`EnvClient.reset`. """
+        return self._reset_result(*await self._request(self._reset_request(seed, envs)))
+
+    async def step(self, actions: Sequence[int], envs: Optional[Sequence[int]] = None):
+        """ Steps environments, see :meth:`EnvClient.step`. """
+        return self._step_result(*await self._request(self._step_request(actions, envs)))
+
+    def env(self, index: int) -> "AsyncRemoteEnv":
+        """ Returns a view of a single environment of the server. """
+        return AsyncRemoteEnv(self, index)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def __aenter__(self) -> "AsyncEnvClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+def _single(batch: tuple) -> tuple:
+    """ Unpacks the batch of a single environment. """
+    if len(batch) == 2:
+        observations, infos = batch
+        return observations[0], {"score": int(infos["score"][0])}
+    observations, rewards, terminateds, truncateds, infos = batch
+    return (observations[0], float(rewards[0]), bool(terminateds[0]), bool(truncateds[0]),
+            {"score": int(infos["score"][0])})
+
+
+class RemoteEnv:
+    """ A single environment of a server, driven through an :class:`EnvClient`. """
+
+    def __init__(self, client: EnvClient, index: int) -> None:
+        self.client = client
+        self.index = index
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        return _single(self.client.reset([seed], [self.index]))
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        return _single(self.client.step([action], [self.index]))
+
+
+class AsyncRemoteEnv:
+    """ A single environment of a server, driven through an :class:`AsyncEnvClient`. """
+
+    def __init__(self, client: AsyncEnvClient, index: int) -> None:
+        self.client = client
+        self.index = index
+
+    async def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        return _single(await self.client.reset([seed], [self.index]))
+
+    async def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        return _single(await self.client.step([action], [self.index]))
+
+
+def _load_test_actor(address: Address, envs: Sequence[int], steps: int, seed: int, barrier, queue) -> None:
+    """ Steps a batch of environments with random actions and reports its step latencies. """
+    client = EnvClient(address)
+    envs = np.asarray(envs)
+    rng = np.random.default_rng(seed)
+    client.reset(seed, envs)
+    latencies = np.empty(steps)
+
+    barrier.wait()
+    start = time.perf_counter()
+    for step in range(steps):
+        actions = rng.integers(2, size=len(envs), dtype=np.uint8)
+        sent = time.perf_counter()
+        _, _, terminateds, truncateds, _ = client.step(actions, envs)
+        latencies[step] = time.perf_counter() - sent
+        done = terminateds | truncateds
+        if done.any():
+            client.reset(envs=envs[done])
+    queue.put((start, time.perf_counter(), latencies))
+    client.close()
+
+
+def load_test(actors: int = 4, envs_per_actor: int = 1, steps: int = 1000,
+              address: Optional[Address] = None, **env_kwargs) -> Dict[str, float]:
+    """ Drives a server from several actor processes and measures its throughput.
+
+    The server and every actor run in their own process. Each actor steps its
+    own environments with random actions, one batched request per step, and
+    resets those whose episode ended.
+
+    Args:
+        actors (int): The number of actor processes.
+        envs_per_actor (int): The number of environments stepped by every
+            request of an actor.
+        steps (int): The number of requests of every actor.
+        address (Optional[Address]): The address of the server, a temporary
+            Unix socket by default.
+        env_kwargs: The JSON-serializable kwargs of the environments.
+
+    Returns:
+        The aggregate environment steps per second and the percentiles of the
+        round-trip latency of a step request, in microseconds.
+    """
+    import multiprocessing as mp
+    import tempfile
+
+    context = mp.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        if address is None:
+            address = os.path.join(directory, "server.sock")
+        server = context.Process(target=serve, args=(address, actors * envs_per_actor), kwargs=env_kwargs,
+                                 daemon=True)
+        server.start()
+        barrier = context.Barrier(actors)
+        queue = context.Queue()
+        processes = [context.Process(target=_load_test_actor,
+                                     args=(address, range(i * envs_per_actor, (i + 1) * envs_per_actor),
+                                           steps, i, barrier, queue))
+                     for i in range(actors)]
+        try:
+            for process in processes:
+                process.start()
+            reports = [queue.get() for _ in processes]
+            for process in processes:
+                process.join()
+        finally:
+            server.terminate()
+            server.join()
+
+    elapsed = max(end for _, end, _ in reports) - min(start for start, _, _ in reports)
+    latencies = np.concatenate([latencies for _, _, latencies in reports]) * 1e6
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {
+        "steps/s": actors * envs_per_actor * steps / elapsed,
+        "p50_us": p50,
+        "p90_us": p90,
+        "p99_us": p99,
+        "max_us": latencies.max(),
+    }
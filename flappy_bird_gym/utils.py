@@ -1,25 +1,42 @@
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-from pygame import Rect
+from pygame import Rect, Surface
+from pygame import mask as pyg_mask
 
 from pygame.transform import flip as img_flip
 
 from pygame import image as pyg_image
 from pygame.transform import scale as img_scale
+from pygame.transform import rotate as img_rotate
 from flappy_bird_gym.constants import BACKGROUND_HEIGHT as win_height
 from flappy_bird_gym.constants import BACKGROUND_WIDTH as win_width
 from flappy_bird_gym.constants import BIRD_WIDTH
 from flappy_bird_gym.constants import BIRD_HEIGHT
 from flappy_bird_gym.constants import PIPE_HEIGHT
 from flappy_bird_gym.constants import PIPE_WIDTH
+from flappy_bird_gym.constants import BIRD_ACC
+from flappy_bird_gym.constants import BIRD_MAX_VEL_Y
+from flappy_bird_gym.constants import BIRD_MIN_VEL_Y
+from flappy_bird_gym.constants import PIXELATED_BIRD_ACC
+from flappy_bird_gym.constants import PIXELATED_BIRD_MAX_VEL_Y
+from flappy_bird_gym.constants import PIXELATED_BIRD_MIN_VEL_Y
 
 
 _BASE_DIR = Path(os.path.dirname(os.path.realpath(__file__))).parent
 
 ASSETS_PATH = str(_BASE_DIR / "flappy_bird_gym/assets")
 
+# Process-wide cache of the loaded sprites, keyed by (normal, convert):
+_IMAGE_CACHE: Dict[Tuple[bool, bool], Dict[str, Any]] = {}
+_IMAGE_CACHE_LOCK = threading.Lock()
+_ROTATION_CACHE: Dict[Tuple[bool, bool], "BirdRotations"] = {}
+_MASK_CACHE: Dict[Any, Any] = {}
+# Number of times each cache has been filled, reported by the step profiler:
+_LOAD_COUNTS: Dict[str, int] = {"images": 0, "rotations": 0, "masks": 0}
+
 def pixel_collision(
     rect1: Rect, rect2: Rect, hitmask1: List[List[bool]], hitmask2: List[List[bool]]
 ) -> bool:
@@ -48,6 +65,21 @@ def get_hitmask(image) -> List[List[bool]]:
             mask[x].append(bool(image.get_at((x, y))[3]))
     return mask
 
+
+def get_mask(image) -> pyg_mask.Mask:
+    """Returns a packed bitmask of the pixels an image draws.
+
+    Unlike :func:`get_hitmask`, which only reads the alpha channel, it honours
+    the colorkey of the sprites, and it is built and tested in C.
+    """
+    return pyg_mask.from_surface(image, 0)
+
+
+def mask_collision(rect1: Rect, rect2: Rect, mask1: pyg_mask.Mask, mask2: pyg_mask.Mask) -> bool:
+    """Checks if two objects collide, like :func:`pixel_collision` but with the
+    masks returned by :func:`get_mask`."""
+    return mask1.overlap(mask2, (rect2.x - rect1.x, rect2.y - rect1.y)) is not None
+
 def _load_sprite(filename, normal: bool, inverted: bool = False, scaled_size: Tuple[int, int] = None):
     if normal:
         img = pyg_image.load(f"{ASSETS_PATH}/{filename}.png")
@@ -63,8 +95,184 @@ def _load_sprite(filename, normal: bool, inverted: bool = False, scaled_size: Tu
     return img
 
 
-def load_images(normal: bool = True) -> Dict[str, Any]:
-    """ Loads and returns the image assets of the game. """
+def load_images(normal: bool = True, convert: bool = False, copy: bool = False) -> Dict[str, Any]:
+    """ Returns the image assets of the game.
+
+    The sprites are decoded and scaled only once per process and are shared by
+    every caller, every environment included, so they must be treated as
+    read-only: drawing on one of them changes the frames of every game. The
+    returned dict itself is a fresh copy and can be modified freely.
+
+    Args:
+        normal (bool): Whether to load the full size or the 64x64 sprites.
+        convert (bool): Whether to convert the sprites to the pixel format of
+            the display, which makes blitting them faster. Requires a display.
+        copy (bool): Whether to return copies of the sprites, which the caller
+            owns and can modify, instead of the shared ones.
+    """
+    key = (normal, convert)
+    images = _IMAGE_CACHE.get(key)
+    if images is None:
+        with _IMAGE_CACHE_LOCK:
+            images = _IMAGE_CACHE.get(key)
+            if images is None:
+                if convert:
+                    images = _convert_images(load_images(normal))
+                else:
+                    images = _load_images(normal)
+                _IMAGE_CACHE[key] = images
+                _LOAD_COUNTS["images"] += 1
+    if copy:
+        return _copy_images(images)
+    return dict(images)
+
+
+class BirdRotations(dict):
+    """ Rotated bird images keyed by (animation frame, angle).
+
+    Rotations missing from the table, e.g. for custom physics constants, are
+    computed and stored on first use.
+    """
+
+    def __init__(self, bird_images) -> None:
+        super().__init__()
+        self.bird_images = bird_images
+
+    def __missing__(self, key):
+        frame, angle = key
+        image = img_rotate(self.bird_images[frame], angle)
+        self[key] = image
+        return image
+
+
+def load_bird_rotations(normal: bool = True, convert: bool = False) -> BirdRotations:
+    """ Returns the table of rotated bird images, shared by the whole process.
+
+    The bird is rotated by `vel * BIRD_MIN_VEL_Y` degrees and its velocity only
+    takes the values between `BIRD_MIN_VEL_Y` and `BIRD_MAX_VEL_Y` in steps of
+    `BIRD_ACC`, so every animation frame is pre-rotated for each of them once.
+    """
+    key = (normal, convert)
+    rotations = _ROTATION_CACHE.get(key)
+    if rotations is None:
+        bird_images = load_images(normal, convert)["bird"]
+        with _IMAGE_CACHE_LOCK:
+            rotations = _ROTATION_CACHE.get(key)
+            if rotations is None:
+                if normal:
+                    acc, min_vel, max_vel = BIRD_ACC, BIRD_MIN_VEL_Y, BIRD_MAX_VEL_Y
+                else:
+                    acc, min_vel, max_vel = PIXELATED_BIRD_ACC, PIXELATED_BIRD_MIN_VEL_Y, PIXELATED_BIRD_MAX_VEL_Y
+
+                rotations = BirdRotations(bird_images)
+                for step in range(int((max_vel - min_vel) / acc) + 1):
+                    vel = min_vel + step * acc
+                    for frame in range(len(bird_images)):
+                        rotations[(frame, vel * min_vel)]
+                _ROTATION_CACHE[key] = rotations
+                _LOAD_COUNTS["rotations"] += 1
+    return rotations
+
+
+class BirdMasks(dict):
+    """ Collision masks of the rotated bird images, keyed like :class:`BirdRotations`. """
+
+    def __init__(self, rotations: BirdRotations) -> None:
+        super().__init__()
+        self.rotations = rotations
+
+    def __missing__(self, key):
+        mask = get_mask(self.rotations[key])
+        self[key] = mask
+        return mask
+
+
+def load_masks(normal: bool = True) -> Dict[str, Any]:
+    """ Returns the collision masks of the pipes, the ground and the rotated bird.
+
+    The masks are computed once per process, the bird ones on first use of each
+    rotation, and must be treated as read-only.
+    """
+    masks = _MASK_CACHE.get(normal)
+    if masks is None:
+        images = load_images(normal)
+        rotations = load_bird_rotations(normal)
+        with _IMAGE_CACHE_LOCK:
+            masks = _MASK_CACHE.get(normal)
+            if masks is None:
+                masks = {
+                    "pipe": tuple(get_mask(image) for image in images["pipe"]),
+                    "ground": get_mask(images["ground"]),
+                    "bird": BirdMasks(rotations),
+                }
+                _MASK_CACHE[normal] = masks
+                _LOAD_COUNTS["masks"] += 1
+    return masks
+
+
+def asset_loads() -> Dict[str, int]:
+    """ Returns how many times the sprites, the bird rotations and the masks have been loaded in this process. """
+    return dict(_LOAD_COUNTS)
+
+
+def preload_images() -> None:
+    """ Warms up the image cache for both resolutions. """
+    load_images(True)
+    load_images(False)
+    load_bird_rotations(True)
+    load_bird_rotations(False)
+
+
+def clear_image_cache() -> None:
+    """ Drops every cached sprite, e.g. after the display has been closed. """
+    with _IMAGE_CACHE_LOCK:
+        _IMAGE_CACHE.clear()
+        _ROTATION_CACHE.clear()
+        _MASK_CACHE.clear()
+
+
+def _convert_images(images: Dict[str, Any]) -> Dict[str, Any]:
+    converted = {}
+    for name, value in images.items():
+        if value is None:
+            converted[name] = None
+        elif type(value) in (tuple, list):
+            converted[name] = tuple([img.convert_alpha() for img in value])
+        else:
+            converted[name] = (value.convert() if name == "background"
+                               else value.convert_alpha())
+    return converted
+
+
+def _copy_images(images: Dict[str, Any]) -> Dict[str, Any]:
+    copied = {}
+    for name, value in images.items():
+        if value is None:
+            copied[name] = None
+        elif type(value) in (tuple, list):
+            copied[name] = tuple([img.copy() for img in value])
+        else:
+            copied[name] = value.copy()
+    return copied
+
+
+def _flatten_opaque(img):
+    """ Drops the alpha channel of an image whose pixels are all opaque.
+
+    Blitting such an image still alpha-blends every pixel, which for the full
+    size background costs more than the rest of the frame, although the
+    result is the same as a plain copy.
+    """
+    width, height = img.get_size()
+    if img.get_alpha() is None or pyg_mask.from_surface(img, 254).count() != width * height:
+        return img
+
+    flat = Surface((width, height))
+    flat.blit(img, (0, 0))
+    return flat
+
+
+def _load_images(normal: bool) -> Dict[str, Any]:
     images = {}
 
     try:
@@ -72,7 +280,8 @@ def load_images(normal: bool = True) -> Dict[str, Any]:
         images["ground"] = _load_sprite("base", normal, scaled_size=(win_width, win_height/3))
 
         # Background sprite:
-        images["background"] = _load_sprite("background", normal, scaled_size=(win_width, win_height))
+        images["background"] = _flatten_opaque(
+            _load_sprite("background", normal, scaled_size=(win_width, win_height)))
 
         # Bird sprites:
         images["bird"] = (
@@ -1,15 +1,20 @@
-import flappy_bird_gym.env.flappy_bird_env as FlappyBirdEnv
-import flappy_bird_gym.original_game as OriginalGame
-from gymnasium.utils.play import play
+# The modules of every mode are imported by that mode only, so that e.g. the
+# server or the tests do not pay for pygame, the dataset workers or the
+# benchmarks. Importing flappy_bird_gym only registers the environments:
+import flappy_bird_gym
 import gymnasium as gym
-import numpy as np
-import pygame
 import time
 import argparse
+import os
+import sys
 
-key_to_action = {(pygame.K_SPACE,): np.array([1])}
 
 def main(mode):
+    from gymnasium.utils.play import play
+    import numpy as np
+    import pygame
+
+    key_to_action = {(pygame.K_SPACE,): np.array([1])}
     if mode == 'pixels':
         env = gym.make('FlappyBird-pixels-v1', render_mode="rgb_array")
         play(env, keys_to_action= key_to_action, noop=0) 
@@ -45,8 +50,50 @@ def random_agent_env():
     
     env.close()
 
+def record_episodes(path, episodes, seed, features):
+    import flappy_bird_gym.recording as Recording
+    recording = Recording.record(path, episodes, seed, store_features=features)
+    print(f"Recorded {len(recording)} episodes ({recording.num_steps} steps) to {path}")
+    for index, episode in enumerate(recording.episodes):
+        print(f"  episode {index}: seed {episode['seed']}, {episode['length']} steps, score {episode['score']}")
+
+
+def replay_episodes(path):
+    import flappy_bird_gym.recording as Recording
+    recording = Recording.Recording(path)
+    env = recording.make_env(render_mode="human", clock="realtime")
+    for index in range(len(recording)):
+        score = 0
+        for _, reward, _, _, info in recording.replay(index, env):
+            score += reward
+        print(f"Episode {index}: score {info['score']}, return {score:.1f}")
+    env.close()
+
+
+def verify_episodes(path):
+    import flappy_bird_gym.recording as Recording
+    diverged = Recording.verify(path)
+    if diverged:
+        print(f"Episodes {diverged} of {path} diverge from their replay!")
+    else:
+        print(f"Every episode of {path} replays exactly.")
+
+
+def generate_dataset(path, steps, num_envs, policy, obs_type, shard_size, seed, workers):
+    import flappy_bird_gym.dataset as Dataset
+    start = time.perf_counter()
+    manifest = Dataset.generate(path, steps, num_envs, policy, shard_size, seed, workers, obs_type=obs_type)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {manifest['transitions']} transitions ({manifest['episodes']} episodes) "
+          f"in {len(manifest['shards'])} shards to {path} "
+          f"({manifest['transitions'] / elapsed:,.0f} transitions/s)")
+
+
 def _get_args():
     """ Parses the command line arguments and returns them. """
+    # Only holds the policies, the dataset imports its environments lazily:
+    from flappy_bird_gym.dataset import POLICIES
+
     parser = argparse.ArgumentParser(description=__doc__)
 
     # Argument for the mode of execution (human or random):
@@ -54,10 +101,50 @@ def _get_args():
         "--mode", "-m",
         type=str,
         default="original",
-        choices=['pixels', 'features', 'random', 'original', 'test'],
+        choices=['pixels', 'features', 'random', 'original', 'test', 'benchmark',
+                 'record', 'replay', 'verify', 'dataset', 'serve'],
         help="The execution mode for the game.",
     )
 
+    # Arguments of the record, replay and verify modes:
+    parser.add_argument("--file", "-f", type=str, default="episodes.fbr",
+                        help="The path of the episode recording.")
+    parser.add_argument("--episodes", "-n", type=int, default=10,
+                        help="The number of episodes to record.")
+    parser.add_argument("--seed", "-s", type=int, default=0,
+                        help="The seed of the first recorded episode.")
+    parser.add_argument("--features", action="store_true",
+                        help="Also record the feature vector of every step.")
+
+    # Arguments of the test mode, which runs the tests and, on request, checks
+    # the benchmark suite against a baseline recorded on this machine:
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Also check the benchmark suite against the baseline at this path.")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store the results of the benchmark suite as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="The relative slowdown reported as a performance regression.")
+
+    # Arguments of the dataset mode:
+    parser.add_argument("--output", "-o", type=str, default="dataset",
+                        help="The directory of the generated dataset.")
+    parser.add_argument("--steps", type=int, default=10_000,
+                        help="The number of batched steps of the dataset.")
+    parser.add_argument("--num-envs", type=int, default=8,
+                        help="The number of environments run in parallel.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="The number of worker processes, one per CPU by default.")
+    parser.add_argument("--policy", type=str, default="random", choices=POLICIES,
+                        help="The policy that picks the actions of the dataset.")
+    parser.add_argument("--obs-type", type=str, default="features", choices=["features", "pixels"],
+                        help="The observations stored in the dataset.")
+    parser.add_argument("--shard-size", type=int, default=4096,
+                        help="The number of batched steps of a shard.")
+
+    # Arguments of the serve mode, which also uses --num-envs and --obs-type:
+    parser.add_argument("--address", type=str, default="flappy_bird_gym.sock",
+                        help="The Unix socket path, or host:port, of the environment server.")
+
     return parser.parse_args()
 
 
@@ -65,6 +152,7 @@ if __name__ == '__main__':
     args = _get_args()
 
     if args.mode == "original":
+        import flappy_bird_gym.original_game as OriginalGame
         OriginalGame.start()
     elif args.mode == "pixels":
         main("pixels")
@@ -73,6 +161,28 @@ if __name__ == '__main__':
     elif args.mode == "random":
         random_agent_env()
     elif args.mode == "test":
-        test_env.test_flappy_bird()
+        import pytest
+        status = pytest.main(["-q", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests")])
+        if status == 0 and (args.baseline or args.save_baseline):
+            import flappy_bird_gym.benchmark as Benchmark
+            if not Benchmark.check(args.baseline or Benchmark.BASELINE_PATH, args.tolerance, args.save_baseline):
+                status = 1
+        sys.exit(status)
+    elif args.mode == "benchmark":
+        import flappy_bird_gym.benchmark as Benchmark
+        Benchmark.run()
+    elif args.mode == "record":
+        record_episodes(args.file, args.episodes, args.seed, args.features)
+    elif args.mode == "replay":
+        replay_episodes(args.file)
+    elif args.mode == "verify":
+        verify_episodes(args.file)
+    elif args.mode == "dataset":
+        generate_dataset(args.output, args.steps, args.num_envs, args.policy, args.obs_type,
+                         args.shard_size, args.seed, args.workers)
+    elif args.mode == "serve":
+        import flappy_bird_gym.server as Server
+        print(f"Serving {args.num_envs} environments on {args.address}")
+        Server.serve(Server.parse_address(args.address), args.num_envs, obs_type=args.obs_type)
     else:
         print("Invalid mode!")
\ No newline at end of file
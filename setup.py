@@ -4,5 +4,6 @@ setup(
     name="flappy-bird-gym",
     version="1.0",
     author="Stanimir Monev",
-    install_requires=["gymnasium==0.29.1", "pygame==2.5.2", "numpy"]
+    install_requires=["gymnasium==0.29.1", "pygame==2.5.2", "numpy"],
+    extras_require={"test": ["pytest", "pytest-benchmark"]},
 )
\ No newline at end of file
@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def steer(env, rng: np.random.Generator, noise: float = 0.01) -> int:
+    """ Flaps when the bird is below the centre of the next gap, with some random mistakes.
+
+    Unlike a random policy, it keeps the bird alive through many pipes, so
+    that the episodes cover scoring, pipe spawning and recycling, and the
+    mistakes still end them now and then.
+    """
+    game = env.unwrapped._game
+    pipe = env.unwrapped._not_passed_top_pipe()
+    action = int(pipe is not None and game.bird_rect.top > pipe.bottom + game.constants.PIPE_GAP / 2)
+    if rng.random() < noise:
+        action = 1 - action
+    return action
+
+
+@pytest.fixture
+def policy():
+    return steer
@@ -0,0 +1,62 @@
+""" Steady-state steps must allocate next to nothing. """
+import gc
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+WARMUP_STEPS = 500
+STEPS = 2000
+
+# What a step can't avoid allocating is its result: the returned tuple, the
+# info dict and the reward. Anything that grows with the game, a pipe sprite,
+# a list copy or a frame, exceeds these bounds by far:
+MEAN_BOUND = 512
+WORST_BOUND = 4096
+
+
+@pytest.mark.parametrize("backend", ["sprites", "headless"])
+@pytest.mark.parametrize("obs_kwargs", [
+    {"obs_type": "features"},
+    {"obs_type": "pixels"},
+    {"obs_type": "pixels", "grayscale": True},
+    {"obs_type": "pixels", "channel_first": True},
+], ids=["features", "pixels", "grayscale", "channel_first"])
+def test_steps_allocate_next_to_nothing(policy, backend, obs_kwargs):
+    env = FlappyBirdEnv(backend=backend, copy=False, **obs_kwargs)
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    for _ in range(WARMUP_STEPS):
+        _, _, terminated, truncated, _ = env.step(policy(env, rng))
+        if terminated or truncated:
+            env.reset()
+
+    allocations = []
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for _ in range(STEPS):
+            action = policy(env, rng)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            _, _, terminated, truncated, info = env.step(action)
+            del info
+            allocated = tracemalloc.get_traced_memory()[1] - before
+            # A step that ends the episode is followed by a reset, which
+            # builds a new game and isn't a steady-state step:
+            if terminated or truncated:
+                env.reset()
+            else:
+                allocations.append(allocated)
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+        env.close()
+
+    assert len(allocations) > STEPS // 2
+    assert np.mean(allocations) <= MEAN_BOUND, f"mean {np.mean(allocations):.0f} B, worst {max(allocations)} B"
+    assert max(allocations) <= WORST_BOUND
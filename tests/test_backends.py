@@ -0,0 +1,46 @@
+""" The headless backend must play exactly the same games as the sprite backend. """
+import numpy as np
+import pytest
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+STEPS = 2000
+
+
+@pytest.mark.parametrize("pipe_schedule", [False, True])
+@pytest.mark.parametrize("collision", ["rect", "pixel"])
+@pytest.mark.parametrize("obs_type", ["features", "pixels"])
+def test_headless_matches_sprites(policy, obs_type, collision, pipe_schedule):
+    kwargs = dict(render_mode="rgb_array", obs_type=obs_type, collision=collision, pipe_schedule=pipe_schedule)
+    sprites = FlappyBirdEnv(backend="sprites", **kwargs)
+    headless = FlappyBirdEnv(backend="headless", **kwargs)
+    # Both games are steered by the same policy, which only looks at the state
+    # of the sprite game, so the backends always get the same actions:
+    rng = np.random.default_rng(0)
+
+    expected, expected_info = sprites.reset(seed=1)
+    actual, actual_info = headless.reset(seed=1)
+    best_score, episodes = 0, 0
+    for step in range(STEPS):
+        assert np.array_equal(actual, expected), f"observation of step {step}"
+        assert actual_info == expected_info, f"info of step {step}"
+        assert np.array_equal(headless.render(), sprites.render()), f"frame of step {step}"
+
+        action = policy(sprites, rng)
+        expected, reward, terminated, truncated, expected_info = sprites.step(action)
+        actual, *transition, actual_info = headless.step(action)
+        assert transition == [reward, terminated, truncated], f"transition of step {step}"
+        best_score = max(best_score, expected_info["score"])
+
+        if terminated or truncated:
+            assert actual_info == expected_info, f"info of step {step}"
+            expected, expected_info = sprites.reset()
+            actual, actual_info = headless.reset()
+            episodes += 1
+
+    sprites.close()
+    headless.close()
+    # The episodes must go through pipes and end, or the comparison covers little:
+    assert best_score >= 2
+    assert episodes >= 1
@@ -0,0 +1,57 @@
+""" Timings of the environments, measured with pytest-benchmark.
+
+Timings only compare on one machine, so no baseline is stored in the repo.
+Record one with `pytest tests/test_benchmarks.py --benchmark-autosave` and
+check later changes against it with `--benchmark-compare
+--benchmark-compare-fail=mean:30%`. The results are stored in `.benchmarks/`.
+"""
+import numpy as np
+import pytest
+
+import flappy_bird_gym
+from flappy_bird_gym import benchmark as suite
+
+pytest.importorskip("pytest_benchmark")
+
+
+def _stepper(env, rng: np.random.Generator, render: bool = False):
+    def step():
+        _, _, terminated, truncated, _ = env.step(int(rng.random() < 0.06))
+        if render:
+            env.render()
+        if terminated or truncated:
+            env.reset()
+    return step
+
+
+@pytest.mark.parametrize("backend", ["sprites", "headless"])
+@pytest.mark.parametrize("env_id", suite.ENV_IDS)
+def test_step(benchmark, env_id, backend):
+    env = flappy_bird_gym.make(env_id, backend=backend)
+    env.reset(seed=0)
+    benchmark(_stepper(env, np.random.default_rng(0)))
+    env.close()
+
+
+@pytest.mark.parametrize("env_id", suite.ENV_IDS)
+def test_reset(benchmark, env_id):
+    env = flappy_bird_gym.make(env_id)
+    env.reset(seed=0)
+    benchmark(env.reset)
+    env.close()
+
+
+def test_rgb_array_step_and_render(benchmark):
+    env = flappy_bird_gym.make("FlappyBird-features-v1", render_mode="rgb_array")
+    env.reset(seed=0)
+    benchmark(_stepper(env, np.random.default_rng(0), render=True))
+    env.close()
+
+
+@pytest.mark.parametrize("num_envs", [1, 64, 1024])
+def test_vector_step(benchmark, num_envs):
+    env = flappy_bird_gym.FlappyBirdVectorEnv(num_envs, copy=False)
+    env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    benchmark(lambda: env.step((rng.random(num_envs) < 0.06).astype(np.int64)))
+    env.close()
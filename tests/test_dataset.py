@@ -0,0 +1,63 @@
+""" Generated datasets must hold the transitions the environments played, split across shards. """
+import json
+import os
+
+import numpy as np
+import pytest
+
+from flappy_bird_gym import dataset
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+STEPS, NUM_ENVS, SHARD_SIZE, SEED = 1500, 2, 512, 3
+SCRIPT = "100000000000"
+
+
+@pytest.fixture(scope="module")
+def generated(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("dataset"))
+    manifest = dataset.generate(path, steps=STEPS, num_envs=NUM_ENVS, policy="scripted", shard_size=SHARD_SIZE,
+                                seed=SEED, num_workers=2, script=SCRIPT, clock="unthrottled")
+    return path, manifest
+
+
+def test_manifest_counts(generated):
+    path, manifest = generated
+    with open(os.path.join(path, dataset.MANIFEST)) as file:
+        assert json.load(file) == manifest
+
+    assert [shard["steps"] for shard in manifest["shards"]] == [512, 512, 476]
+    assert manifest["transitions"] == STEPS * NUM_ENVS
+    data = dataset.Dataset(path)
+    assert len(data) == 3
+    dones = [shard["dones"] for shard in data.shards()]
+    assert [int(done.sum()) for done in dones] == [shard["episodes"] for shard in manifest["shards"]]
+    assert manifest["episodes"] == sum(int(done.sum()) for done in dones) > NUM_ENVS
+
+
+def test_shards_hold_the_played_transitions(generated):
+    path, manifest = generated
+    data = dataset.Dataset(path)
+    columns = {field: np.concatenate([shard[field] for shard in data.shards()]) for field in dataset.FIELDS}
+    for field, spec in manifest["fields"].items():
+        assert columns[field].dtype == np.dtype(spec["dtype"])
+        assert columns[field].shape == (STEPS, NUM_ENVS) + tuple(spec["shape"])
+
+    # Every column is a stream of whole episodes, which independent envs
+    # replay exactly from the seeds of the vector env:
+    script = np.array([int(action) for action in SCRIPT], dtype=np.uint8)
+    for i in range(NUM_ENVS):
+        env = FlappyBirdEnv(clock="unthrottled")
+        observation, _ = env.reset(seed=SEED + i)
+        episode_step = 0
+        for step in range(STEPS):
+            assert np.array_equal(columns["observations"][step, i], observation), f"env {i}, step {step}"
+            action = columns["actions"][step, i]
+            assert action == script[episode_step % len(script)]
+            observation, reward, terminated, truncated, _ = env.step(int(action))
+            assert columns["rewards"][step, i] == np.float32(reward)
+            assert columns["dones"][step, i] == (terminated or truncated)
+            episode_step += 1
+            if terminated or truncated:
+                observation, _ = env.reset()
+                episode_step = 0
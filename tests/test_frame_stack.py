@@ -0,0 +1,91 @@
+""" Stacked observations must hold the last frames, oldest first. """
+from collections import deque
+
+import numpy as np
+import pytest
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+K = 4
+ENV_KWARGS = {"clock": "unthrottled"}
+
+
+def _stacked(frames, channel_first: bool) -> np.ndarray:
+    stacked = np.stack(list(frames))
+    return stacked.reshape((-1,) + stacked.shape[2:]) if channel_first else stacked
+
+
+@pytest.mark.parametrize("obs_kwargs", [
+    {"obs_type": "features"},
+    {"obs_type": "pixels"},
+    {"obs_type": "pixels", "channel_first": True},
+    {"obs_type": "pixels", "grayscale": True},
+], ids=["features", "pixels", "channel_first", "grayscale"])
+def test_stack_holds_the_last_frames_oldest_first(policy, obs_kwargs):
+    stacked_env = FlappyBirdEnv(frame_stack=K, **obs_kwargs, **ENV_KWARGS)
+    env = FlappyBirdEnv(**obs_kwargs, **ENV_KWARGS)
+    channel_first = obs_kwargs.get("channel_first", False)
+    rng = np.random.default_rng(0)
+
+    for seed in (0, 1):
+        observation, _ = stacked_env.reset(seed=seed)
+        frame, _ = env.reset(seed=seed)
+        # A reset fills the whole stack with the first frame:
+        frames = deque([frame] * K, maxlen=K)
+        assert observation.shape == stacked_env.observation_space.shape
+        assert np.array_equal(observation, _stacked(frames, channel_first))
+        for _ in range(300):
+            action = policy(env, rng)
+            observation, reward, terminated, _, _ = stacked_env.step(action)
+            frame, expected_reward, _, _, _ = env.step(action)
+            frames.append(frame)
+            assert np.array_equal(observation, _stacked(frames, channel_first))
+            assert reward == expected_reward
+            if terminated:
+                break
+
+
+def test_set_state_fills_the_stack_with_the_restored_frame(policy):
+    env = FlappyBirdEnv(frame_stack=K, **ENV_KWARGS)
+    rng = np.random.default_rng(0)
+    env.reset(seed=2)
+    for _ in range(50):
+        env.step(policy(env, rng))
+    state = env.get_state()
+    restored_frame = env.step(0)[0][-1]
+    for _ in range(10):
+        env.step(policy(env, rng))
+
+    observation = env.set_state(state)
+    single = FlappyBirdEnv(**ENV_KWARGS)
+    single.reset(seed=99)
+    frame = single.set_state(state)
+    assert np.array_equal(observation, np.stack([frame] * K))
+
+    # The stack then fills up again from the restored frame:
+    observation = env.step(0)[0]
+    assert np.array_equal(observation, np.stack([frame] * (K - 1) + [restored_frame]))
+
+
+def test_copies_and_views():
+    copied = FlappyBirdEnv(frame_stack=K, **ENV_KWARGS)
+    uncopied = FlappyBirdEnv(frame_stack=K, copy=False, **ENV_KWARGS)
+    observations = [copied.reset(seed=0)[0]]
+    kept = [observations[0].copy()]
+    view, _ = uncopied.reset(seed=0)
+    assert np.array_equal(view, kept[0]) and np.shares_memory(view, uncopied._stack)
+
+    for step in range(2 * K + 1):
+        action = step % 3 == 0
+        observations.append(copied.step(action)[0])
+        kept.append(observations[-1].copy())
+        # Without copies, the stack is a view of the ring, only valid until
+        # the next step, but it holds the same frames:
+        view = uncopied.step(action)[0]
+        assert np.array_equal(view, kept[-1]) and np.shares_memory(view, uncopied._stack)
+
+    # Copies are never overwritten by the following steps:
+    for observation, expected in zip(observations, kept):
+        assert np.array_equal(observation, expected)
+    assert not any(np.shares_memory(observation, copied._stack) for observation in observations)
@@ -0,0 +1,81 @@
+""" A frameskip step must be the sum of the single-tick steps it repeats. """
+import gymnasium as gym
+import numpy as np
+import pytest
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+ENV_KWARGS = {"clock": "unthrottled"}
+
+
+def _skip(env: FlappyBirdEnv, action: int, ticks: int):
+    """ Repeats an action for `ticks` single-tick steps, stopping with the episode, like a frameskip step. """
+    reward, steps = 0.0, 0
+    for _ in range(ticks):
+        observation, tick_reward, terminated, truncated, info = env.step(action)
+        reward += tick_reward
+        steps += 1
+        if terminated or truncated:
+            break
+    return observation, reward, terminated, truncated, info, steps
+
+
+@pytest.mark.parametrize("obs_type", ["features", "pixels"])
+def test_fixed_frameskip_sums_the_ticks(obs_type):
+    skipped = FlappyBirdEnv(obs_type=obs_type, frameskip=4, **ENV_KWARGS)
+    single = FlappyBirdEnv(obs_type=obs_type, **ENV_KWARGS)
+    rng = np.random.default_rng(0)
+    skipped.reset(seed=8)
+    single.reset(seed=8)
+
+    episodes, early_endings = 0, 0
+    for _ in range(1500):
+        # Random flaps end the episodes quickly, on every kind of tick:
+        action = int(rng.random() < 0.15)
+        observation, reward, terminated, truncated, info = skipped.step(action)
+        expected, expected_reward, expected_terminated, expected_truncated, expected_info, ticks = \
+            _skip(single, action, 4)
+        assert np.array_equal(observation, expected)
+        assert reward == pytest.approx(expected_reward, abs=1e-12)
+        assert (terminated, truncated, info) == (expected_terminated, expected_truncated, expected_info)
+        if terminated or truncated:
+            episodes += 1
+            early_endings += ticks < 4
+            skipped.reset()
+            single.reset()
+    # Episodes end on any tick, so some must have stopped in the middle of a skip:
+    assert episodes > 5 and early_endings > 0
+
+
+def test_random_frameskip_is_seeded(policy):
+    seed, low, high = 5, 2, 6
+    skipped = FlappyBirdEnv(frameskip=(low, high), **ENV_KWARGS)
+    single = FlappyBirdEnv(**ENV_KWARGS)
+    skipped.reset(seed=seed)
+    single.reset(seed=seed)
+
+    # `reset` draws the seed of the game from `np_random`, and every step then
+    # draws its number of ticks from it:
+    np_random, _ = gym.utils.seeding.np_random(seed)
+    np_random.integers(1 << 63)
+
+    rng = np.random.default_rng(0)
+    ticks = []
+    for _ in range(300):
+        action = policy(skipped, rng)
+        observation, reward, terminated, truncated, info = skipped.step(action)
+        count = int(np_random.integers(low, high))
+        expected, expected_reward, expected_terminated, *_ = _skip(single, action, count)
+        assert np.array_equal(observation, expected)
+        assert reward == pytest.approx(expected_reward, abs=1e-12) and terminated == expected_terminated
+        ticks.append(count)
+        if terminated or truncated:
+            break
+    assert set(ticks) == set(range(low, high))
+
+
+@pytest.mark.parametrize("frameskip", [0, (0, 3), (3, 3)])
+def test_invalid_frameskips_are_rejected(frameskip):
+    with pytest.raises(ValueError):
+        FlappyBirdEnv(frameskip=frameskip)
@@ -0,0 +1,38 @@
+""" The shared sprites must only be handed out as copies when asked for. """
+import numpy as np
+import pytest
+
+from flappy_bird_gym import utils
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+def _surfaces(images):
+    for name, value in images.items():
+        for index, surface in enumerate(value if type(value) in (tuple, list) else (value,)):
+            yield (name, index), surface
+
+
+@pytest.mark.parametrize("normal", [True, False])
+def test_images_are_shared_unless_copied(normal):
+    shared = dict(_surfaces(utils.load_images(normal)))
+    again = dict(_surfaces(utils.load_images(normal)))
+    copied = dict(_surfaces(utils.load_images(normal, copy=True)))
+    assert shared.keys() == again.keys() == copied.keys()
+    for key, surface in shared.items():
+        assert again[key] is surface
+        assert copied[key] is not surface
+        assert copied[key].get_size() == surface.get_size()
+        assert copied[key].get_buffer().raw == surface.get_buffer().raw
+
+
+def test_drawing_on_copies_leaves_the_games_intact():
+    env = FlappyBirdEnv(obs_type="pixels", clock="unthrottled")
+    expected, _ = env.reset(seed=0)
+
+    copied = utils.load_images(False, copy=True)
+    copied["background"].fill((255, 0, 255))
+    for surface in copied["pipe"] + copied["bird"]:
+        surface.fill((255, 0, 255, 255))
+
+    observation, _ = FlappyBirdEnv(obs_type="pixels", clock="unthrottled").reset(seed=0)
+    assert np.array_equal(observation, expected)
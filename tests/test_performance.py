@@ -0,0 +1,49 @@
+""" Performance properties that hold on any machine.
+
+These catch regressions by orders of magnitude, e.g. a clock that sleeps, a
+full-size surface per environment or an eager pygame import, with bounds far
+from what any machine measures. The timings that only compare on one machine
+are in `test_benchmarks.py`.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from flappy_bird_gym import benchmark
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A `realtime` environment performs 60 steps per second, and an unthrottled
+# one tens of thousands:
+MIN_STEP_RATE = 1000
+
+# A reset environment takes ~10 KiB with features and ~100 KiB with pixels,
+# while a full-size surface alone takes 1.5 MiB:
+MEMORY_BOUNDS = {"FlappyBird-features-v1": 32, "FlappyBird-pixels-v1": 256}
+
+
+def test_import_does_not_load_pygame():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", "import sys, flappy_bird_gym; print('pygame' in sys.modules)"],
+                            env=env, check=True, capture_output=True, text=True).stdout
+    assert output.split()[-1] == "False"
+
+
+@pytest.mark.parametrize("backend", ["sprites", "headless"])
+@pytest.mark.parametrize("env_id", benchmark.ENV_IDS)
+def test_unthrottled_steps_do_not_wait(env_id, backend):
+    assert benchmark.step_rate(env_id, steps=500, backend=backend) > MIN_STEP_RATE
+
+
+@pytest.mark.parametrize("backend", ["sprites", "headless"])
+@pytest.mark.parametrize("env_id", benchmark.ENV_IDS)
+def test_memory_per_env(env_id, backend):
+    assert benchmark.memory_per_env(env_id, backend=backend) < MEMORY_BOUNDS[env_id]
+
+
+def test_vector_env_outpaces_single_env():
+    single = benchmark.step_rate("FlappyBird-features-v1", steps=2000)
+    assert benchmark.vector_step_rate(64, steps=100) > 2 * single
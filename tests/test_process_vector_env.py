@@ -0,0 +1,66 @@
+""" The worker pool must play the games of in-process environments, and report the errors of its workers. """
+import gymnasium as gym
+import numpy as np
+import pytest
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gym.env.process_vector_env import FlappyBirdAsyncVectorEnv
+
+
+NUM_ENVS = 4
+ENV_KWARGS = {"clock": "unthrottled"}
+
+
+@pytest.fixture(scope="module")
+def pool():
+    env = FlappyBirdAsyncVectorEnv(NUM_ENVS, num_workers=2, ring_size=2, copy=False, **ENV_KWARGS)
+    yield env
+    env.close()
+
+
+def test_matches_in_process_envs(policy, pool):
+    envs = [FlappyBirdEnv(**ENV_KWARGS) for _ in range(NUM_ENVS)]
+    rng = np.random.default_rng(0)
+    observations, infos = pool.reset(seed=30)
+    for i, env in enumerate(envs):
+        observation, info = env.reset(seed=30 + i)
+        assert np.array_equal(observations[i], observation) and infos["score"][i] == info["score"]
+
+    episodes = 0
+    for step in range(2000):
+        actions = [policy(env, rng) for env in envs]
+        observations, rewards, terminateds, truncateds, infos = pool.step(actions)
+        for i, env in enumerate(envs):
+            observation, reward, terminated, truncated, info = env.step(actions[i])
+            assert (rewards[i], terminateds[i], truncateds[i], infos["score"][i]) == \
+                (reward, terminated, truncated, info["score"]), f"step {step}"
+            if terminated or truncated:
+                episodes += 1
+                assert infos["_final_observation"][i] and infos["final_info"][i] == info
+                assert np.array_equal(infos["final_observation"][i], observation)
+                observation, _ = env.reset()
+            assert np.array_equal(observations[i], observation), f"step {step}"
+    assert episodes >= NUM_ENVS
+
+
+def test_views_stay_valid_for_the_ring(pool):
+    pool.reset(seed=0)
+    previous = pool.step([1] * NUM_ENVS)[0]
+    expected = previous.copy()
+    current = pool.step([0] * NUM_ENVS)[0]
+    # With two slots, a batch is only overwritten by the step after next:
+    assert np.array_equal(previous, expected)
+    assert not np.shares_memory(previous, current)
+    pool.step([0] * NUM_ENVS)
+    assert np.shares_memory(previous, pool._observations[pool._slot])
+
+
+def test_worker_errors_are_raised():
+    env = FlappyBirdAsyncVectorEnv(2, num_workers=2, **ENV_KWARGS)
+    env.reset(seed=0)
+    # A negative seed makes `reset` raise in the second worker only:
+    with pytest.raises(gym.error.Error, match="Seed must be") as raised:
+        env.reset(seed=[0, -1])
+    assert any("worker 1" in note for note in getattr(raised.value, "__notes__", ["worker 1"]))
+    assert env.closed
+    assert not any(process.is_alive() for process in env._processes)
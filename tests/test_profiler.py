@@ -0,0 +1,57 @@
+""" Profiled steps must report every section and count the events of the environment. """
+import numpy as np
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gym.env.profiler import StepProfiler
+
+
+ENV_KWARGS = {"clock": "unthrottled"}
+
+
+def test_profiled_steps_report_sections_and_counters(policy):
+    steps = []
+    env = FlappyBirdEnv(profile=steps.append, render_mode="rgb_array", frameskip=2, **ENV_KWARGS)
+    rng = np.random.default_rng(0)
+    env.reset(seed=1)
+
+    resets, summaries = 1, []
+    for step in range(1000):
+        env.render()
+        _, _, terminated, truncated, info = env.step(policy(env, rng))
+        assert set(info["profile"]) == set(StepProfiler.SECTIONS)
+        assert info["profile"] is steps[-1]
+        # Every section runs in every step, the render of the previous frame included:
+        assert all(seconds > 0 for seconds in info["profile"].values())
+        if terminated or truncated:
+            env.reset()
+            resets += 1
+        if step % 250 == 0:
+            summaries.append(env.profiler.summary())
+
+    summary = env.profiler.summary()
+    assert len(steps) == summary["steps"] == 1000
+    assert summary["resets"] == resets
+    assert 1000 < summary["ticks"] <= 2000
+    assert summary["pipes_spawned"] > 0
+    for section in StepProfiler.SECTIONS:
+        assert summary[f"{section}_s"] == sum(step[section] for step in steps) > 0
+        assert summary[f"{section}_us_per_step"] > 0
+    # The counters and totals only grow:
+    for earlier, later in zip(summaries + [summary], summaries[1:] + [summary]):
+        for key in ("steps", "ticks", "resets", "pipes_spawned") + tuple(f"{s}_s" for s in StepProfiler.SECTIONS):
+            assert later[key] >= earlier[key]
+    assert summaries[0]["steps"] < summary["steps"]
+
+    env.profiler.reset()
+    assert env.profiler.summary()["steps"] == 0
+
+
+def test_unprofiled_steps_add_nothing_to_info():
+    env = FlappyBirdEnv(**ENV_KWARGS)
+    _, info = env.reset(seed=0)
+    assert env.profiler is None and info == {"score": 0}
+    for _ in range(50):
+        _, _, terminated, _, info = env.step(0)
+        assert set(info) == {"score"}
+        if terminated:
+            break
@@ -0,0 +1,64 @@
+""" Recorded episodes must replay exactly, or fail loudly. """
+import numpy as np
+import pytest
+
+from flappy_bird_gym import recording
+
+
+@pytest.fixture(scope="module")
+def recorded(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("recordings") / "episodes.fbr")
+    return recording.record(path, episodes=5, seed=0, store_features=True)
+
+
+def test_episodes_replay_exactly(recorded):
+    assert recording.verify(recorded.path) == []
+    for index in range(len(recorded)):
+        transitions = list(recorded.replay(index, backend="headless"))
+        assert len(transitions) == recorded.episodes[index]["length"]
+        assert transitions[-1][2] or transitions[-1][3]
+        assert np.array_equal(np.array([t[0] for t in transitions]), recorded.episode_features(index))
+
+
+def test_overrides_that_change_the_game_are_rejected(recorded):
+    with pytest.raises(ValueError):
+        recorded.make_env(obs_type="pixels")
+    with pytest.raises(ValueError):
+        next(recorded.replay(0, collision="pixel"))
+    with pytest.raises(ValueError):
+        next(recorded.replay(0, recording.flappy_bird_gym.make("FlappyBird-pixels-v1")))
+
+
+def test_frames_show_the_recorded_game(recorded):
+    length = int(recorded.episodes[0]["length"])
+    frames = list(recorded.frames(0))
+    assert len(frames) == length
+    assert frames[0].shape == (720, 551, 3)
+
+    small = list(recorded.frames(0, size=(64, 64)))
+    assert len(small) == length
+    assert small[0].shape == (64, 64, 3) and small[0].dtype == np.uint8
+    # Later frames differ, so the scaled frames follow the game:
+    assert not np.array_equal(small[0], small[-1])
+
+
+def test_replay_raises_when_the_episode_ends_early(recorded, tmp_path):
+    # The actions of an episode followed by idle steps the game can't survive:
+    actions = [np.concatenate([recorded.actions(0), np.zeros(500, dtype=np.uint8)]).astype(np.uint8)]
+    path = str(tmp_path / "diverged.fbr")
+    recording.write_recording(path, recorded.env_id, recorded.env_kwargs,
+                              [int(recorded.episodes[0]["seed"])], actions)
+    diverged = recording.Recording(path)
+
+    with pytest.raises(recording.ReplayDiverged):
+        list(diverged.replay(0))
+    assert recording.verify(path) == [0]
+
+
+def test_features_are_copied_from_envs_without_copies(recorded, tmp_path):
+    uncopied = recording.record(str(tmp_path / "uncopied.fbr"), episodes=5, seed=0, store_features=True, copy=False)
+    assert recording.verify(uncopied.path) == []
+    for index in range(len(recorded)):
+        features = uncopied.episode_features(index)
+        assert np.array_equal(features, recorded.episode_features(index))
+        assert len(np.unique(features, axis=0)) > 1
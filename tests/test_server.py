@@ -0,0 +1,147 @@
+""" Remote environments must play the games of in-process ones, and survive malformed requests. """
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+
+from flappy_bird_gym import server
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+
+
+NUM_ENVS = 3
+ENV_KWARGS = {"obs_type": "features", "clock": "unthrottled"}
+
+
+@pytest.fixture(params=["unix", "tcp"])
+def address(request):
+    """ Runs a server on an event loop of its own thread and returns its address. """
+    with tempfile.TemporaryDirectory() as directory:
+        env_server = server.EnvServer(
+            NUM_ENVS, os.path.join(directory, "server.sock") if request.param == "unix" else ("127.0.0.1", 0),
+            **ENV_KWARGS)
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(env_server.start())
+        task = loop.create_task(env_server.serve_forever())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield env_server.address
+        finally:
+            loop.call_soon_threadsafe(task.cancel)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+            loop.close()
+
+
+def _local_envs():
+    return [FlappyBirdEnv(**ENV_KWARGS) for _ in range(NUM_ENVS)]
+
+
+def test_client_matches_in_process_envs(address):
+    envs = _local_envs()
+    rng = np.random.default_rng(0)
+    with server.EnvClient(address) as client:
+        assert client.num_envs == NUM_ENVS
+        assert client.observation_shape == envs[0].observation_space.shape
+        assert client.env_kwargs == ENV_KWARGS
+
+        observations, infos = client.reset(seed=10)
+        for i, env in enumerate(envs):
+            observation, info = env.reset(seed=10 + i)
+            assert np.array_equal(observations[i], observation) and infos["score"][i] == info["score"]
+
+        episodes = 0
+        for _ in range(500):
+            actions = (rng.random(NUM_ENVS) < 0.06).astype(np.uint8)
+            observations, rewards, terminateds, truncateds, infos = client.step(actions)
+            done = []
+            for i, env in enumerate(envs):
+                observation, reward, terminated, truncated, info = env.step(int(actions[i]))
+                assert np.array_equal(observations[i], observation)
+                assert (rewards[i], terminateds[i], truncateds[i], infos["score"][i]) == \
+                    (reward, terminated, truncated, info["score"])
+                if terminated or truncated:
+                    done.append(i)
+                    env.reset()
+            if done:
+                episodes += len(done)
+                client.reset(envs=done)
+        assert episodes > 0
+
+
+def test_remote_env_matches_in_process_env(address):
+    env = FlappyBirdEnv(**ENV_KWARGS)
+    with server.EnvClient(address) as client:
+        remote = client.env(1)
+        observation, info = remote.reset(seed=3)
+        expected, expected_info = env.reset(seed=3)
+        assert np.array_equal(observation, expected) and info == expected_info
+        for step in range(200):
+            transition = remote.step(step % 5 == 0)
+            expected = env.step(step % 5 == 0)
+            assert np.array_equal(transition[0], expected[0]) and transition[1:] == expected[1:]
+            if transition[2] or transition[3]:
+                break
+
+
+def test_async_client_matches_in_process_env(address):
+    env = FlappyBirdEnv(**ENV_KWARGS)
+
+    async def play():
+        async with await server.AsyncEnvClient.connect(address) as client:
+            remote = client.env(2)
+            observation, _ = await remote.reset(seed=4)
+            assert np.array_equal(observation, env.reset(seed=4)[0])
+            for step in range(200):
+                transition = await remote.step(step % 5 == 0)
+                expected = env.step(step % 5 == 0)
+                assert np.array_equal(transition[0], expected[0]) and transition[1:] == expected[1:]
+                if transition[2] or transition[3]:
+                    break
+
+    asyncio.run(play())
+
+
+def _raw_request(sock: socket.socket, opcode: int, payload: bytes = b"", count: int = 0):
+    """ Sends a request, maybe malformed, and returns the status and payload of the reply. """
+    sock.sendall(server._HEADER.pack(opcode, server.OK, count, len(payload)) + payload)
+    header = b""
+    while len(header) < server._HEADER.size:
+        header += sock.recv(server._HEADER.size - len(header))
+    reply_opcode, status, _, size = server._HEADER.unpack(header)
+    assert reply_opcode == opcode
+    payload = b""
+    while len(payload) < size:
+        payload += sock.recv(size - len(payload))
+    return status, payload
+
+
+@pytest.mark.parametrize("opcode, payload, count", [
+    (7, b"", 0),
+    (server.STEP, np.zeros(1, dtype=server.STEP_DTYPE).tobytes(), 5),
+    (server.STEP, np.array([(NUM_ENVS, 0)], dtype=server.STEP_DTYPE).tobytes(), 1),
+    (server.RESET, b"\x01\x02\x03", 1),
+], ids=["unknown_opcode", "short_payload", "unknown_env", "truncated_record"])
+def test_malformed_requests_get_error_replies(address, opcode, payload, count):
+    with server.EnvClient(address) as client:
+        client.reset(seed=0)
+        status, message = _raw_request(client._socket, opcode, payload, count)
+        assert status == server.ERROR and message
+
+        # The connection, and the server, still work:
+        observations, _, _, _, _ = client.step([0] * NUM_ENVS)
+        assert observations.shape == (NUM_ENVS,) + client.observation_shape
+    with server.EnvClient(address) as client:
+        client.reset(seed=0)
+
+
+def test_client_raises_error_replies(address):
+    with server.EnvClient(address) as client:
+        with pytest.raises(RuntimeError, match="IndexError"):
+            client.step([0], envs=[NUM_ENVS])
+        client.reset(seed=0)
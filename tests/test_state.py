@@ -0,0 +1,83 @@
+""" A snapshot restored into any environment must replay the original trajectory. """
+import pickle
+
+import numpy as np
+import pytest
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gym.env.game_logic import GameState
+
+
+BACKENDS = ["sprites", "headless"]
+
+
+def rollout(env, actions) -> list:
+    """ Steps the actions until the episode ends and returns the transitions. """
+    transitions = []
+    for action in actions:
+        observation, reward, terminated, truncated, info = env.step(action)
+        transitions.append((observation.copy(), reward, terminated, truncated, info["score"]))
+        if terminated or truncated:
+            break
+    return transitions
+
+
+def assert_same_transitions(actual, expected):
+    assert len(actual) == len(expected)
+    for step, (got, want) in enumerate(zip(actual, expected)):
+        assert np.array_equal(got[0], want[0]), f"observation of step {step}"
+        assert got[1:] == want[1:], f"transition of step {step}"
+
+
+def snapshot(policy, backend: str, warmup: int = 200, steps: int = 1500, **kwargs):
+    """ Plays into an episode, saves its state and records the rest of the episode.
+
+    Returns:
+        The environment, the pickled state, the observation it was taken at,
+        the actions that followed and their transitions.
+    """
+    env = FlappyBirdEnv(backend=backend, **kwargs)
+    rng = np.random.default_rng(0)
+    env.reset(seed=5)
+    for _ in range(warmup):
+        _, _, terminated, truncated, _ = env.step(policy(env, rng))
+        assert not (terminated or truncated)
+    observation = env.unwrapped._observation().copy()
+    state = pickle.dumps(env.get_state())
+
+    actions = []
+    transitions = []
+    for _ in range(steps):
+        actions.append(policy(env, rng))
+        transitions += rollout(env, actions[-1:])
+        if transitions[-1][2] or transitions[-1][3]:
+            break
+    return env, state, observation, actions, transitions
+
+
+def test_state_pickles(policy):
+    env, state, _, _, _ = snapshot(policy, "sprites", steps=0)
+    restored = pickle.loads(state)
+    assert isinstance(restored, GameState)
+    assert restored == pickle.loads(pickle.dumps(restored))
+    assert restored._replace(rng_state=None) == env.get_state()._replace(rng_state=None)
+
+
+@pytest.mark.parametrize("pipe_schedule", [False, True])
+@pytest.mark.parametrize("obs_type", ["features", "pixels"])
+@pytest.mark.parametrize("target", BACKENDS)
+@pytest.mark.parametrize("source", BACKENDS)
+def test_restored_env_replays_trajectory(policy, source, target, obs_type, pipe_schedule):
+    kwargs = dict(obs_type=obs_type, pipe_schedule=pipe_schedule)
+    original, state, observation, actions, expected = snapshot(policy, source, **kwargs)
+    # The episode must go on long enough to spawn and pass new pipes:
+    assert len(expected) > 200 and expected[-1][4] > pickle.loads(state).score
+
+    fresh = FlappyBirdEnv(backend=target, **kwargs)
+    fresh.reset(seed=1234)
+    assert np.array_equal(fresh.set_state(pickle.loads(state)), observation)
+    assert_same_transitions(rollout(fresh, actions), expected)
+
+    # Restoring the original environment rewinds it as well:
+    assert np.array_equal(original.set_state(pickle.loads(state)), observation)
+    assert_same_transitions(rollout(original, actions), expected)
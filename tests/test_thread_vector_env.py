@@ -0,0 +1,63 @@
+""" The thread pool must play the games of independent environments, and shut down cleanly. """
+import numpy as np
+import pytest
+
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gym.env.thread_vector_env import FlappyBirdThreadVectorEnv
+
+
+NUM_ENVS = 5
+ENV_KWARGS = {"clock": "unthrottled"}
+
+
+@pytest.mark.parametrize("obs_type", ["features", "pixels"])
+def test_matches_independent_envs(policy, obs_type):
+    vector_env = FlappyBirdThreadVectorEnv(NUM_ENVS, num_threads=3, obs_type=obs_type, **ENV_KWARGS)
+    envs = [FlappyBirdEnv(obs_type=obs_type, **ENV_KWARGS) for _ in range(NUM_ENVS)]
+    rng = np.random.default_rng(0)
+    observations, infos = vector_env.reset(seed=40)
+    for i, env in enumerate(envs):
+        observation, info = env.reset(seed=40 + i)
+        assert np.array_equal(observations[i], observation) and infos["score"][i] == info["score"]
+
+    episodes = 0
+    for step in range(1500):
+        actions = [policy(env, rng) for env in envs]
+        observations, rewards, terminateds, truncateds, infos = vector_env.step(actions)
+        for i, env in enumerate(envs):
+            observation, reward, terminated, truncated, info = env.step(actions[i])
+            assert (rewards[i], terminateds[i], truncateds[i], infos["score"][i]) == \
+                (reward, terminated, truncated, info["score"]), f"step {step}"
+            if terminated or truncated:
+                episodes += 1
+                assert infos["_final_observation"][i] and infos["final_info"][i] == info
+                assert np.array_equal(infos["final_observation"][i], observation)
+                observation, _ = env.reset()
+            assert np.array_equal(observations[i], observation), f"step {step}"
+    vector_env.close()
+    assert episodes >= NUM_ENVS
+
+
+def test_batches_are_copies_unless_asked():
+    copied = FlappyBirdThreadVectorEnv(2, **ENV_KWARGS)
+    first = copied.reset(seed=0)[0]
+    assert not np.shares_memory(first, copied.step([0, 0])[0])
+    copied.close()
+
+    uncopied = FlappyBirdThreadVectorEnv(2, copy=False, **ENV_KWARGS)
+    first = uncopied.reset(seed=0)[0]
+    assert first is uncopied.step([0, 0])[0]
+    uncopied.close()
+
+
+def test_close_stops_the_threads():
+    env = FlappyBirdThreadVectorEnv(4, num_threads=2, **ENV_KWARGS)
+    env.reset(seed=0)
+    env.step_async([1, 0, 1, 0])
+    # Closing with steps in flight waits for them instead of leaving threads behind:
+    env.close()
+    assert env.closed
+    assert all(not thread.is_alive() for thread in env._executor._threads)
+    with pytest.raises(RuntimeError):
+        env.reset(seed=0)
+    env.close()
@@ -0,0 +1,101 @@
+""" The batched engine must play exactly the games of independent `FlappyBirdEnv`s. """
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import flappy_bird_gym  # noqa: F401, registers the environments
+from flappy_bird_gym.env.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gym.env.flappy_bird_vector_env import FlappyBirdVectorEnv
+
+
+def _assert_lockstep(policy, vector_env, envs, seeds, steps):
+    """ Steps a vector env and independent envs with the same actions and compares every transition. """
+    rng = np.random.default_rng(0)
+    observations, infos = vector_env.reset(seed=seeds)
+    for i, env in enumerate(envs):
+        observation, info = env.reset(seed=seeds if seeds is None else seeds[i])
+        assert np.array_equal(observations[i], observation)
+        assert infos["score"][i] == info["score"]
+
+    episodes = 0
+    for step in range(steps):
+        actions = [policy(env, rng) for env in envs]
+        observations, rewards, terminateds, truncateds, infos = vector_env.step(actions)
+        for i, env in enumerate(envs):
+            observation, reward, terminated, truncated, info = env.step(actions[i])
+            assert (rewards[i], terminateds[i], truncateds[i]) == (reward, terminated, truncated), f"step {step}"
+            assert infos["score"][i] == info["score"]
+            if terminated or truncated:
+                episodes += 1
+                assert infos["_final_observation"][i] and infos["_final_info"][i]
+                assert np.array_equal(infos["final_observation"][i], observation)
+                assert infos["final_info"][i] == info
+                observation, _ = env.reset()
+            elif "final_observation" in infos:
+                assert not infos["_final_observation"][i]
+            assert np.array_equal(observations[i], observation), f"step {step}"
+    return episodes
+
+
+@pytest.mark.parametrize("screen_size", [(551, 720), (64, 64), (288, 512)])
+def test_matches_independent_envs(policy, screen_size):
+    num_envs = 4
+    vector_env = FlappyBirdVectorEnv(num_envs, screen_size=screen_size)
+    envs = [FlappyBirdEnv(screen_size=screen_size, clock="unthrottled") for _ in range(num_envs)]
+    seeds = [11, 7, 3, 5]
+    assert _assert_lockstep(policy, vector_env, envs, seeds, steps=3000) >= num_envs
+
+
+def test_int_seed_seeds_consecutive_games(policy):
+    vector_env = FlappyBirdVectorEnv(3)
+    envs = [FlappyBirdEnv(clock="unthrottled") for _ in range(3)]
+    vector_env.reset(seed=20)
+    for i, env in enumerate(envs):
+        env.reset(seed=20 + i)
+    # The games are seeded already, the lockstep run only resets them again:
+    _assert_lockstep(policy, vector_env, envs, [20, 21, 22], steps=500)
+
+
+def test_seed_list_must_have_one_seed_per_game():
+    with pytest.raises(ValueError):
+        FlappyBirdVectorEnv(3).reset(seed=[1, 2])
+
+
+@pytest.mark.parametrize("screen_size", [(64, 64), (160, 512), (288, 512), (551, 720), (1200, 720)])
+def test_pipe_ring_holds_every_live_pipe(screen_size):
+    env = FlappyBirdVectorEnv(2, screen_size=screen_size)
+    env.reset(seed=0)
+    # Immortal birds, out of reach of the pipes and the ground, and pipes
+    # spawned as often as the timers allow:
+    env._bird_start_left = -10 ** 6
+    env._ground_top = env._ground_bottom = 10 ** 9
+    env._pipe_high = (env._pipe_high[0], env._pipe_low[1] + 1)
+
+    spawns = []
+    lifetime = (screen_size[0] + 10 + env.constants.BACKGROUND_WIDTH) // env.constants.SCROLL_SPEED
+    for step in range(3 * lifetime):
+        before = env.pipe_timer <= 0
+        env.step(np.zeros(2, dtype=np.int64))
+        if before[0]:
+            spawns.append(step)
+        alive = sum(1 for spawn in spawns if step - spawn < lifetime)
+        assert env.pipe_active[0].sum() == alive <= env.max_pipes
+
+
+def test_max_episode_steps_truncates():
+    env = FlappyBirdVectorEnv(2, max_episode_steps=5)
+    env.reset(seed=0)
+    for _ in range(4):
+        _, _, _, truncateds, _ = env.step([0, 0])
+        assert not truncateds.any()
+    _, _, _, truncateds, infos = env.step([0, 0])
+    assert truncateds.all() and infos["_final_observation"].all()
+
+
+def test_make_vec_custom():
+    env = gym.make_vec("FlappyBird-features-v1", num_envs=3, vectorization_mode="custom")
+    observations, _ = env.reset(seed=0)
+    assert observations.shape == (3, 13)
+    observations, rewards, _, _, _ = env.step([0, 1, 0])
+    assert observations.shape == (3, 13) and rewards.shape == (3,)
+    env.close()